@@ -0,0 +1,123 @@
+"""
+Deal Page Parsing Benchmark
+
+Parse time per page for each deal_page_parser.py backend, over saved
+Southern Savers pages:
+
+- bs4: BeautifulSoup tree + one find_all per selector (the previous parser)
+- stream: one html.parser pass with the compiled selector plan, no tree
+- lxml: libxml2 tree + one pass over the plan's tags (skipped if lxml is
+  not installed)
+
+and checks every backend extracts the same deal texts as bs4 (exits 1 if
+not). Pages come from --fixtures (pages kept with
+`southern_savers_scraper.py --save-html DIR`, or debug_southern_savers_*.html
+files; the store is taken from the file name), or from store_pages.py
+written to a temporary directory.
+
+Usage:
+    python scripts/benchmarks/benchmark_deal_parsing.py
+    python scripts/benchmarks/benchmark_deal_parsing.py --fixtures pages/ --repeat 10
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from deal_page_parser import BACKENDS, extract_deal_texts  # noqa: E402
+from store_pages import STORES, build_store_pages  # noqa: E402
+
+
+def load_fixtures(directory):
+    """[(store, html)] for every *.html file in `directory`, by file name."""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        stem = os.path.splitext(os.path.basename(path))[0].lower()
+        store = next((name for name in STORES if name in stem), stem)
+        with open(path, encoding='utf-8', errors='replace') as f:
+            fixtures.append((store, f.read()))
+    return fixtures
+
+
+def available_backends():
+    """bs4 (the reference) first, then the others that can run here."""
+    backends = sorted(BACKENDS, key=lambda backend: backend != 'bs4')
+    try:
+        import lxml.html  # noqa: F401
+    except ImportError:
+        backends.remove('lxml')
+    return backends
+
+
+def time_parse(html, store, backend, repeat):
+    """(best seconds over `repeat` runs, texts)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        texts, _ = extract_deal_texts(html, store, backend)
+        best = min(best, time.perf_counter() - start)
+    return best, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark deal page parsing backends')
+    parser.add_argument('--fixtures', help='Directory of saved store pages (*.html)')
+    parser.add_argument('--deals', type=int, default=400, help='Deals per synthetic page')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per page (best is kept)')
+    args = parser.parse_args()
+
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+        if not fixtures:
+            sys.exit(f"No *.html files in {args.fixtures}")
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            for store, html in build_store_pages(args.deals).items():
+                with open(os.path.join(tmp, f'{store}.html'), 'w', encoding='utf-8') as f:
+                    f.write(html)
+            fixtures = load_fixtures(tmp)
+
+    backends = available_backends()
+    if 'lxml' not in backends:
+        print("lxml not installed; skipping the lxml backend\n")
+    page_kb = sum(len(html) for _, html in fixtures) / len(fixtures) / 1024
+    print(f"{len(fixtures)} pages, {page_kb:.0f} KB each on average | best of {args.repeat}\n")
+
+    header = f"{'Page':<12}{'Deals':>7}" + ''.join(f"{backend + ' ms':>12}" for backend in backends)
+    print(header)
+    print("-" * len(header))
+
+    totals = dict.fromkeys(backends, 0.0)
+    mismatches = []
+    for store, html in fixtures:
+        row = {}
+        reference = None
+        for backend in backends:
+            seconds, texts = time_parse(html, store, backend, args.repeat)
+            totals[backend] += seconds
+            row[backend] = seconds
+            if backend == 'bs4':
+                reference = texts
+            elif texts != reference:
+                mismatches.append((store, backend))
+        print(f"{store:<12}{len(reference):>7}" + ''.join(f"{row[b] * 1000:>12.1f}" for b in backends))
+
+    print("-" * len(header))
+    print(f"{'mean':<12}{'':>7}" + ''.join(f"{totals[b] / len(fixtures) * 1000:>12.1f}" for b in backends))
+    speedups = ', '.join(f"{b} {totals['bs4'] / totals[b]:.1f}x" for b in backends if b != 'bs4')
+    print(f"\nvs bs4: {speedups}")
+
+    if mismatches:
+        print("\nDifferent deal texts than bs4: "
+              + ', '.join(f"{backend} on {store}" for store, backend in mismatches))
+        sys.exit(1)
+    print("Every backend extracted the same deals as bs4")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Ingredient Matching Benchmark
+
+Matches a week of synthetic deal names (four stores' worth) against a
+1,111-name ingredient reference, the way southern_savers_scraper.py does:
+
+- fuzzywuzzy process.extractOne + token_sort_ratio per deal (the previous
+  matcher), timed on a sample and extrapolated
+- IngredientMatcher.match_many (scripts/ingredient_matcher.py) over
+  every deal: one thread on all-distinct names, then all cores on a
+  realistic week where stores and pages repeat the same products, then
+  the following week (20% new products) with a MatchMemo saved from the
+  first
+
+and checks that both pick the same ingredient with the same score on the
+sample. Skips the fuzzywuzzy side if it is not installed.
+
+Usage:
+    python scripts/benchmarks/benchmark_ingredient_matching.py
+    python scripts/benchmarks/benchmark_ingredient_matching.py --deals 8000 --distinct 2000 --sample 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ingredient_matcher import IngredientMatcher, MatchMemo  # noqa: E402
+
+_WORDS = ('chicken beef pork turkey salmon tuna shrimp breast thigh ground lean boneless skinless '
+          'fillet steak sausage bacon ham milk cheese cheddar mozzarella parmesan butter cream sour '
+          'yogurt egg large brown white rice pasta spaghetti penne flour sugar salt pepper black red '
+          'green yellow onion garlic tomato paste sauce canned diced potato sweet carrot celery '
+          'broccoli spinach lettuce kale apple banana orange lemon lime juice olive oil vegetable '
+          'canola vinegar balsamic honey maple syrup peanut almond walnut pecan bread crumbs tortilla '
+          'corn beans kidney pinto chickpeas lentils stock broth low sodium frozen peas mushrooms '
+          'bell jalapeño cilantro parsley basil oregano thyme cumin paprika chili powder cinnamon '
+          'vanilla extract baking soda chocolate chips oats cereal crackers salsa ketchup mustard').split()
+_BRANDS = ['Publix', 'Kraft', 'Tyson', 'Oscar Mayer', "Kellogg's", 'Dannon', 'Chobani', 'Barilla',
+           'Ragú', 'Hormel', 'Perdue', 'Great Value', 'Kroger', 'Market Pantry', 'GreenWise']
+
+
+def build_reference(count=1111, seed=5):
+    """Distinct 1-4 word ingredient names."""
+    rng = random.Random(seed)
+    names = {}
+    while len(names) < count:
+        name = ' '.join(rng.sample(_WORDS, rng.randint(1, 4))).title()
+        names.setdefault(name.lower(), name)
+    return list(names.values())
+
+
+def build_deals(count, ingredients, distinct=None, seed=9):
+    """
+    Deal names: branded reference items with sizes, plus free-form product names.
+
+    With `distinct`, the deals are drawn from that many products, so the
+    same names repeat the way they do across stores and weekly pages.
+    """
+    rng = random.Random(seed)
+    deals = []
+    for _ in range(distinct or count):
+        if rng.random() < 0.5:
+            deals.append(f"{rng.choice(_BRANDS)} {rng.choice(ingredients)}, {rng.randint(8, 32)} oz")
+        else:
+            words = ' '.join(rng.sample(_WORDS, rng.randint(2, 6))).title()
+            deals.append(f"{words} - {rng.randint(1, 5)} lb")
+    if distinct:
+        deals = [rng.choice(deals) for _ in range(count)]
+    return deals
+
+
+def next_week(deals, ingredients, new_share=0.2, seed=13):
+    """The same shoppers' week later: most products return, `new_share` of them are new."""
+    rng = random.Random(seed)
+    products = list(dict.fromkeys(deals))
+    new = build_deals(int(len(products) * new_share), ingredients, seed=seed)
+    products = rng.sample(products, len(products) - len(new)) + new
+    return [rng.choice(products) for _ in deals]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark deal-to-ingredient fuzzy matching')
+    parser.add_argument('--deals', type=int, default=4000, help='Deal names to match')
+    parser.add_argument('--distinct', type=int, default=1200,
+                        help='Distinct product names in the repeated-week run')
+    parser.add_argument('--ingredients', type=int, default=1111, help='Reference size')
+    parser.add_argument('--sample', type=int, default=300,
+                        help='Deals timed (and compared) for the fuzzywuzzy matcher')
+    args = parser.parse_args()
+
+    ingredients = build_reference(args.ingredients)
+    deals = build_deals(args.deals, ingredients)
+    print(f"{args.deals} deals x {len(ingredients)} ingredients\n")
+    print(f"{'Matcher':<44}{'Seconds':>10}{'Deals/s':>12}")
+    print("-" * 66)
+
+    start = time.perf_counter()
+    matches = IngredientMatcher(ingredients, workers=1).match_many(deals)
+    elapsed = time.perf_counter() - start
+    print(f"{'IngredientMatcher, 1 thread':<44}{elapsed:>10.3f}{args.deals / elapsed:>12.0f}")
+
+    repeated = build_deals(args.deals, ingredients, args.distinct)
+    start = time.perf_counter()
+    IngredientMatcher(ingredients).match_many(repeated)
+    elapsed = time.perf_counter() - start
+    label = f"  ... all cores, {args.distinct} distinct names"
+    print(f"{label:<44}{elapsed:>10.3f}{args.deals / elapsed:>12.0f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reference_path = os.path.join(tmp, 'ingredient_reference.csv')
+        memo_path = os.path.join(tmp, 'ingredient_match_memo.json')
+        with open(reference_path, 'w', encoding='utf-8') as f:
+            f.write('Name\n' + '\n'.join(ingredients) + '\n')
+
+        memo = MatchMemo(memo_path, reference_path)
+        IngredientMatcher(ingredients, memo=memo).match_many(repeated)
+        memo.save()
+
+        start = time.perf_counter()
+        memo = MatchMemo(memo_path, reference_path)
+        IngredientMatcher(ingredients, memo=memo).match_many(next_week(repeated, ingredients))
+        memo.save()
+        elapsed = time.perf_counter() - start
+        label = f"  ... next week, memo {memo.hits}/{memo.hits + memo.misses} hits"
+        print(f"{label:<44}{elapsed:>10.3f}{args.deals / elapsed:>12.0f}")
+
+    try:
+        from fuzzywuzzy import fuzz, process
+    except ImportError:
+        print("\nfuzzywuzzy not installed; skipping the per-deal comparison")
+        return
+
+    sample = deals[:args.sample]
+    start = time.perf_counter()
+    reference = [process.extractOne(deal, ingredients, scorer=fuzz.token_sort_ratio) for deal in sample]
+    per_deal = (time.perf_counter() - start) / len(sample)
+    print(f"{'fuzzywuzzy extractOne (est.)':<44}{per_deal * args.deals:>10.1f}{1 / per_deal:>12.0f}")
+
+    mismatches = sum(1 for expected, got in zip(reference, matches) if tuple(expected) != got)
+    print(f"\nSame match and score on {len(sample) - mismatches}/{len(sample)} sampled deals")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Multi-Store Scrape Benchmark
+
+Wall time for `southern_savers_scraper.py --all` against synthetic store
+pages (store_pages.py) served locally with a fixed delay per page:
+
+- serial: scrape_store() per store with the 2 s pause between stores
+  (the previous --all), and without the pause
+- scrape_stores_concurrently(): parallel fetches within the per-host
+  limits, parsing in a process pool, one matching pass for all stores
+
+Usage:
+    python scripts/benchmarks/benchmark_store_scrape.py
+    python scripts/benchmarks/benchmark_store_scrape.py --latency 2.0 --deals 800
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import southern_savers_scraper as scraper  # noqa: E402
+from benchmark_ingredient_matching import build_reference  # noqa: E402
+from ingredient_matcher import IngredientMatcher  # noqa: E402
+from store_pages import STORES, StorePageServer, build_store_pages  # noqa: E402
+
+
+def run_serial(matcher, pause):
+    csv_files = []
+    for store in STORES:
+        csv_file = scraper.scrape_store(store, matcher)
+        if csv_file:
+            csv_files.append(csv_file)
+        if pause:
+            time.sleep(2)
+    return csv_files
+
+
+def run_concurrent(matcher):
+    return scraper.scrape_stores_concurrently(list(STORES), matcher)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark serial vs concurrent store scraping')
+    parser.add_argument('--deals', type=int, default=400, help='Deals per store page')
+    parser.add_argument('--latency', type=float, default=1.0, help='Seconds to serve each page')
+    args = parser.parse_args()
+
+    matcher = IngredientMatcher(build_reference())
+    pages = build_store_pages(args.deals)
+    page_kb = sum(len(page) for page in pages.values()) / len(pages) / 1024
+    print(f"{len(STORES)} stores | {page_kb:.0f} KB pages, ~{args.deals} deals each | "
+          f"{args.latency:.1f} s per page | {os.cpu_count()} CPU(s)\n")
+    print(f"{'Mode':<34}{'Seconds':>10}{'Stores':>8}{'Coupons':>9}")
+    print("-" * 61)
+
+    runs = (('serial, 2 s between stores', lambda: run_serial(matcher, pause=True)),
+            ('serial, no pause', lambda: run_serial(matcher, pause=False)),
+            ('concurrent', lambda: run_concurrent(matcher)))
+    with StorePageServer(pages, latency=args.latency) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        scraper.STORE_URLS.update({store: server.url(store) for store in STORES})
+        scraper.OUTPUT_DIR = tmp
+        for label, run in runs:
+            start = time.perf_counter()
+            # The scraper narrates every step; only the table matters here
+            with contextlib.redirect_stdout(io.StringIO()):
+                csv_files = run()
+            elapsed = time.perf_counter() - start
+            coupons = sum(len(pd.read_csv(path)) for path in csv_files)
+            print(f"{label:<34}{elapsed:>10.2f}{len(csv_files):>8}{coupons:>9}")
+
+
+if __name__ == "__main__":
+    main()
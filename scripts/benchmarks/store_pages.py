@@ -0,0 +1,155 @@
+"""
+Synthetic Southern Savers Store Pages
+
+Builds coupon-matchup pages shaped like the ones
+southern_savers_scraper.py parses (site chrome, navigation menus,
+sidebar, scripts, then a few hundred deals), and serves them from
+localhost with a per-page delay. Each store lays its deals out
+differently, so every branch of the scraper's selector list gets used:
+
+- publix:  <div class="weekly-deal ...">
+- walmart: <div class="coupon-matchup ...">
+- kroger:  <article> per deal
+- target:  plain <li>/<p> under headings (the fallback)
+
+Usage:
+    pages = build_store_pages(deals_per_store=400)
+    with StorePageServer(pages, latency=0.8) as server:
+        url = server.url('publix')
+"""
+
+import random
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STORES = ('publix', 'walmart', 'kroger', 'target')
+
+_BRANDS = ['Publix', 'Kraft', 'Tyson', 'Oscar Mayer', "Kellogg's", 'Dannon', 'Chobani', 'Barilla',
+           'Ragú', 'Hormel', 'Perdue', 'Great Value', 'Simple Truth', "Ben & Jerry's", 'Doritos']
+_PRODUCTS = ['Boneless Chicken Breast', 'Ground Beef 80/20', 'Atlantic Salmon Fillets',
+             'Macaroni & Cheese', 'Greek Yogurt', 'Shredded Cheddar Cheese', 'Spaghetti',
+             'Marinara Sauce', 'Frozen Broccoli Florets', 'Baby Spinach', 'Large Eggs',
+             'Whole Milk', 'Sourdough Bread', 'Ice Cream', 'Tortilla Chips', 'Black Beans',
+             'Cereal', 'Peanut Butter', 'Olive Oil', 'Bacon', 'Chicken Thighs', 'Orange Juice']
+_STORE_CLASSES = {'publix': 'weekly-deal', 'walmart': 'coupon-matchup'}
+
+
+def _deal_text(rng):
+    product = f"{rng.choice(_BRANDS)} {rng.choice(_PRODUCTS)}"
+    kind = rng.random()
+    if kind < 0.3:
+        return f"BOGO Free: {product}"
+    if kind < 0.45:
+        return f"{rng.randint(2, 5)} for ${rng.randint(4, 12)}: {product}"
+    if kind < 0.55:
+        return f"${rng.choice(['0.50', '1', '1.50', '2'])} off: {product}"
+    if kind < 0.65:
+        return f"{rng.choice([25, 30, 50])}% off: {product}"
+    return f"{product} - ${rng.randint(1, 12)}.{rng.randint(0, 99):02d}"
+
+
+def _deal_markup(store, text, rng):
+    """One deal in the store's layout, with the coupon fine print sites add."""
+    fine_print = (f'<span class="fine-print">Final price ${rng.randint(0, 9)}.{rng.randint(0, 99):02d} '
+                  f'<a href="/coupons/{rng.randint(1000, 9999)}">use coupon</a></span>')
+    if store in _STORE_CLASSES:
+        return (f'<div class="{_STORE_CLASSES[store]} item-{rng.randint(1, 9)}">'
+                f'<h4>{escape(text)}</h4>{fine_print}</div>')
+    if store == 'kroger':
+        return f'<article class="post-item"><p>{escape(text)}</p>{fine_print}</article>'
+    return f'<li>{escape(text)} {fine_print}</li>'
+
+
+def build_store_page(store, deals=400, seed=0):
+    """
+    One store's matchup page.
+
+    Returns:
+        str: HTML
+    """
+    rng = random.Random(f"{store}-{seed}")
+    nav = ''.join(f'<li class="menu-item"><a href="/category/{i}">Category {i}</a>'
+                  f'<ul class="sub-menu">{"".join(f"<li><a href=/c/{i}/{j}>Sub {j}</a></li>" for j in range(6))}</ul></li>'
+                  for i in range(40))
+    sidebar = ''.join(f'<div class="widget"><h3>Popular post {i}</h3><p>{"Lorem ipsum dolor sit amet. " * 6}</p></div>'
+                      for i in range(15))
+    body = []
+    for section in range(max(1, deals // 40)):
+        body.append(f'<h2>Section {section}: {rng.choice(_PRODUCTS)}</h2>')
+        items = [_deal_markup(store, _deal_text(rng), rng) for _ in range(40)]
+        body.append(f'<ul>{"".join(items)}</ul>' if store == 'target' else ''.join(items))
+        body.append(f'<p class="note">Prices valid {rng.randint(1, 28)}/11 - {rng.randint(1, 28)}/12. '
+                    f'Click here for more deals.</p>')
+    return (f'<!DOCTYPE html><html><head><title>{store.title()} Coupon Matchups</title>'
+            f'<script>{"var x = 1; " * 400}</script><style>{".a {{color: red}} " * 300}</style></head>'
+            f'<body><header><nav><ul class="menu">{nav}</ul></nav></header>'
+            f'<main><div class="entry-content">{"".join(body)}</div></main>'
+            f'<aside class="sidebar">{sidebar}</aside>'
+            f'<footer><p>Copyright 2025</p><p>Privacy Policy</p><p>Follow us</p></footer>'
+            f'</body></html>')
+
+
+def build_store_pages(deals_per_store=400, seed=0):
+    """{store: html} for every store."""
+    return {store: build_store_page(store, deals_per_store, seed) for store in STORES}
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+        with server.lock:
+            server.request_count += 1
+        page = server.pages.get(self.path.strip('/'))
+        if page is None:
+            self.send_error(404)
+            return
+        body = page.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StorePageServer:
+    """Serves {store: html} at /<store> on localhost, `latency` seconds per request."""
+
+    def __init__(self, pages, latency=0.5):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+        self._server.daemon_threads = True
+        self._server.pages = pages
+        self._server.latency = latency
+        self._server.lock = threading.Lock()
+        self._server.request_count = 0
+        self._thread = None
+
+    def url(self, store):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}/{store}'
+
+    @property
+    def request_count(self):
+        return self._server.request_count
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,275 @@
+"""
+Deal Page Parser
+
+Finds the candidate deal elements on a Southern Savers matchup page and
+returns their text, for southern_savers_scraper.py.
+
+A selector plan is an ordered list of rules (tag + optional class
+substring); the first rule that matches anything on the page wins, and
+<li>/<p> is the fallback when none do. Each store's plan is compiled once
+into a tag -> rules lookup, and every rule is checked during a single walk
+of the document (a rule stops collecting as soon as a higher-priority one
+has matched), instead of one find_all() tree walk per rule.
+
+Backends:
+- 'lxml':   libxml2 parses the page in C, then one pass over the elements
+            with the plan's tags (pip install lxml)
+- 'stream': stdlib html.parser events, no tree built; text is kept only
+            for the candidate elements currently open
+- 'bs4':    BeautifulSoup + find_all per rule, the original implementation,
+            kept as the reference
+
+On well-formed pages all three return the same texts. On broken markup
+lxml repairs the tree the way browsers do (e.g. an unclosed <li> ends at
+the next <li>), where html.parser/bs4 nest it instead.
+
+Prerequisites:
+- Python libraries: pip install lxml   (optional; 'stream' needs nothing,
+  'bs4' needs beautifulsoup4)
+
+Usage:
+    texts, rule = extract_deal_texts(html, 'publix')             # best available backend
+    texts, rule = extract_deal_texts(html, 'publix', backend='stream')
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from html.parser import HTMLParser
+
+
+# ==================== CONFIGURATION ====================
+
+Rule = namedtuple('Rule', ['tags', 'class_contains'])
+
+# Tried in order; class_contains matches any class containing it (any case)
+DEFAULT_PLAN = (
+    Rule(('div',), 'deal'),
+    Rule(('div',), 'coupon'),
+    Rule(('div',), 'matchup'),
+    Rule(('article',), None),
+    Rule(('li',), 'product'),
+)
+FALLBACK_RULE = Rule(('li', 'p'), None)
+
+# Store -> plan, for stores whose page layout is known; others use DEFAULT_PLAN
+SELECTOR_PLANS = {}
+
+BACKENDS = ('lxml', 'stream', 'bs4')
+
+# Elements whose content is never deal text (same as BeautifulSoup.get_text)
+_NO_TEXT = frozenset({'script', 'style', 'template'})
+
+# Elements html.parser/BeautifulSoup never leave open
+_VOID = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link',
+                   'menuitem', 'meta', 'param', 'source', 'track', 'wbr', 'basefont', 'bgsound',
+                   'command', 'frame', 'image', 'isindex', 'nextid', 'spacer'})
+
+
+# ==================== SELECTOR PLANS ====================
+
+class CompiledPlan:
+    """A plan's rules (fallback last) indexed by tag."""
+
+    def __init__(self, rules):
+        self.rules = tuple(rules) + (FALLBACK_RULE,)
+        self.by_tag = {}
+        for index, rule in enumerate(self.rules):
+            for tag in rule.tags:
+                self.by_tag.setdefault(tag, []).append(
+                    (index, rule.class_contains.lower() if rule.class_contains else None))
+        self.tags = tuple(self.by_tag)
+
+    def matching_rules(self, tag, class_value, best):
+        """Indexes of rules (no lower priority than `best`) that an element satisfies."""
+        matched = []
+        lowered = None
+        for index, substring in self.by_tag.get(tag, ()):
+            if best is not None and index > best:
+                break
+            if substring is None:
+                matched.append(index)
+            elif class_value:
+                if lowered is None:
+                    lowered = class_value.lower()
+                if substring in lowered:
+                    matched.append(index)
+        return matched
+
+
+@lru_cache(maxsize=None)
+def compiled_plan(store_name):
+    """The store's selector plan, compiled once per process."""
+    return CompiledPlan(SELECTOR_PLANS.get(store_name.lower(), DEFAULT_PLAN))
+
+
+def default_backend():
+    """'lxml' when installed, otherwise the stdlib 'stream' backend."""
+    try:
+        import lxml.html  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'stream'
+
+
+def extract_deal_texts(html_content, store_name, backend=None):
+    """
+    Text of every candidate deal element on a page.
+
+    Args:
+        html_content (str): Page HTML
+        store_name (str): Store whose selector plan to use
+        backend (str): 'lxml', 'stream' or 'bs4' (default: default_backend())
+
+    Returns:
+        tuple: (list of element texts in document order, winning Rule)
+    """
+    plan = compiled_plan(store_name)
+    backend = backend or default_backend()
+    if backend == 'lxml':
+        texts, rule_index = _lxml_texts(html_content, plan)
+    elif backend == 'stream':
+        texts, rule_index = _stream_texts(html_content, plan)
+    elif backend == 'bs4':
+        texts, rule_index = _bs4_texts(html_content, plan)
+    else:
+        raise ValueError(f"Unknown parser backend {backend!r} (choose from {', '.join(BACKENDS)})")
+    return texts, plan.rules[rule_index]
+
+
+# ==================== BACKENDS ====================
+
+def _lxml_texts(html_content, plan):
+    try:
+        from lxml import html as lxml_html
+    except ImportError:
+        raise ImportError("The 'lxml' parser backend needs lxml: pip install lxml") from None
+
+    # Parse bytes: lxml refuses str input that carries an XML encoding declaration
+    parser = lxml_html.HTMLParser(encoding='utf-8')
+    root = lxml_html.document_fromstring(html_content.encode('utf-8'), parser=parser)
+
+    best = None
+    matches = {}
+    for element in root.iter(*plan.tags):
+        for index in plan.matching_rules(element.tag, element.get('class'), best):
+            matches.setdefault(index, []).append(element)
+            if best is None or index < best:
+                best = index
+
+    if best is None:
+        return [], len(plan.rules) - 1
+    return [_lxml_element_text(element) for element in matches[best]], best
+
+
+def _lxml_element_text(element):
+    parts = []
+    _collect_lxml_text(element, parts)
+    return ' '.join(parts)
+
+
+def _collect_lxml_text(element, parts):
+    # Comments / processing instructions have a non-string tag: skip their text, keep their tail
+    if not isinstance(element.tag, str) or element.tag in _NO_TEXT:
+        return
+    if element.text:
+        text = element.text.strip()
+        if text:
+            parts.append(text)
+    for child in element:
+        _collect_lxml_text(child, parts)
+        if child.tail:
+            tail = child.tail.strip()
+            if tail:
+                parts.append(tail)
+
+
+class _DealStream(HTMLParser):
+    """html.parser callbacks -> candidate texts, building the open-element stack only."""
+
+    def __init__(self, plan):
+        super().__init__(convert_charrefs=True)
+        self.plan = plan
+        self.best = None
+        self.found = []        # (rule index, text parts) in document order
+        self.stack = []        # (tag, parts list or None, suppresses text)
+        self.collecting = []   # parts lists of the open candidate elements
+        self.suppressed = 0    # open <script>/<style>/<template> elements
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID:
+            return
+        parts = None
+        if tag in self.plan.by_tag:
+            class_value = None
+            for name, value in attrs:
+                if name == 'class':
+                    class_value = value
+                    break
+            rules = self.plan.matching_rules(tag, class_value, self.best)
+            if rules:
+                parts = []
+                for index in rules:
+                    self.found.append((index, parts))
+                if self.best is None or rules[0] < self.best:
+                    self.best = rules[0]
+                self.collecting.append(parts)
+        no_text = tag in _NO_TEXT
+        if no_text:
+            self.suppressed += 1
+        self.stack.append((tag, parts, no_text))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        # Close the most recent open element with this name (and anything
+        # left open inside it); an end tag with no open element is ignored
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > depth:
+            _, parts, no_text = self.stack.pop()
+            if parts is not None:
+                self.collecting.pop()
+            if no_text:
+                self.suppressed -= 1
+
+    def handle_data(self, data):
+        if self.collecting and not self.suppressed:
+            text = data.strip()
+            if text:
+                for parts in self.collecting:
+                    parts.append(text)
+
+    def unknown_decl(self, data):
+        # <![CDATA[...]]> is text to BeautifulSoup as well
+        if data.startswith('CDATA['):
+            self.handle_data(data[6:])
+
+
+def _stream_texts(html_content, plan):
+    stream = _DealStream(plan)
+    stream.feed(html_content)
+    stream.close()
+    if stream.best is None:
+        return [], len(plan.rules) - 1
+    return [' '.join(parts) for index, parts in stream.found if index == stream.best], stream.best
+
+
+def _bs4_texts(html_content, plan):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, 'html.parser')
+    for index, rule in enumerate(plan.rules):
+        attrs = {}
+        if rule.class_contains:
+            substring = rule.class_contains.lower()
+            attrs['class'] = lambda x, substring=substring: bool(x) and substring in x.lower()
+        elements = soup.find_all(list(rule.tags), attrs)
+        if elements:
+            return [element.get_text(separator=' ', strip=True) for element in elements], index
+    return [], len(plan.rules) - 1
@@ -0,0 +1,223 @@
+"""
+Ingredient Matcher
+
+Fuzzy matches grocery deal names to the ingredient reference
+(data/ingredient_reference.csv) for southern_savers_scraper.py.
+
+Returns the same best match and score as
+    fuzzywuzzy.process.extractOne(name, ingredients, scorer=fuzz.token_sort_ratio)
+but cleans and token-sorts the ~1,111 reference names once, then scores a
+whole batch of deal names in one rapidfuzz cdist call (C++) instead of
+re-cleaning every ingredient and running a Python scorer for each deal.
+Weekly ads repeat the same products across stores and pages, so each
+distinct cleaned name is scored once, on all cores. A MatchMemo carries
+those results across runs: names already matched against the same
+ingredient reference file are a dictionary lookup.
+
+Prerequisites:
+- Python libraries: pip install rapidfuzz numpy
+
+Usage:
+    matcher = IngredientMatcher(ingredient_list)
+    matcher.match_many(['Publix Chicken Breast', 'Kraft Mac & Cheese'])
+    # -> [('Chicken Breast', 80), ('Mac and Cheese', 67)]
+
+    memo = MatchMemo('data/ingredient_match_memo.json', 'data/ingredient_reference.csv')
+    matcher = IngredientMatcher(ingredient_list, memo=memo)
+    ...
+    memo.save()
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+
+# ==================== CONFIGURATION ====================
+
+# Deal names scored per cdist call (bounds the score matrix to ~9 MB)
+CHUNK_SIZE = 1024
+
+# Memo entries not looked up for this long are dropped on save
+MEMO_MAX_AGE_DAYS = 90
+
+# fuzzywuzzy's full_process(force_ascii=True): drop Latin-1 characters,
+# turn everything but letters/digits into spaces, lowercase, strip
+_LATIN1 = {code: None for code in range(128, 256)}
+_NON_WORD = re.compile(r"(?ui)\W")
+
+
+# ==================== HELPER FUNCTIONS ====================
+
+def token_sort_key(text):
+    """
+    Clean a name the way fuzz.token_sort_ratio does, then sort its words.
+
+    Returns:
+        str: e.g. "Chicken Breast, Boneless" -> "boneless breast chicken"
+    """
+    cleaned = _NON_WORD.sub(" ", str(text).translate(_LATIN1)).lower().strip()
+    return " ".join(sorted(cleaned.split()))
+
+
+def file_hash(path):
+    """SHA-1 of a file's bytes (first 16 hex digits)."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+class MatchMemo:
+    """
+    On-disk memo of cleaned deal name -> (best ingredient, score).
+
+    The file records the hash of the ingredient reference it was built
+    against; if the reference has changed since, the memo starts empty.
+    """
+
+    def __init__(self, path, reference_path, max_age_days=MEMO_MAX_AGE_DAYS):
+        """
+        Args:
+            path (str): Memo JSON file (created on save)
+            reference_path (str): Ingredient reference CSV the matches come from
+            max_age_days (int): Drop entries not used for this many days on save
+        """
+        self.path = path
+        self.reference_hash = file_hash(reference_path)
+        self.max_age_days = max_age_days
+        self.today = date.today().isoformat()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = False
+        self._lock = threading.Lock()
+
+        # name -> [ingredient, score, last used (YYYY-MM-DD)]
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('reference_hash') == self.reference_hash:
+                self.entries = saved.get('matches', {})
+            else:
+                self.invalidated = True
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, keys):
+        """
+        Memoized matches for cleaned names; counts a hit or miss per name.
+
+        Returns:
+            dict: key -> (ingredient, score) for the keys found
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self.entries.get(key)
+                if entry is None:
+                    self.misses += 1
+                    continue
+                entry[2] = self.today
+                found[key] = (entry[0], entry[1])
+                self.hits += 1
+        return found
+
+    def store(self, matches):
+        """Add {key: (ingredient, score)} results."""
+        with self._lock:
+            for key, (ingredient, score) in matches.items():
+                self.entries[key] = [ingredient, score, self.today]
+
+    def save(self):
+        """Drop stale entries and write the memo atomically."""
+        cutoff = (date.today() - timedelta(days=self.max_age_days)).isoformat()
+        with self._lock:
+            self.entries = {key: entry for key, entry in self.entries.items() if entry[2] >= cutoff}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'reference_hash': self.reference_hash, 'matches': self.entries}, f)
+            os.replace(tmp, self.path)
+
+    def summary(self):
+        """One-line hit/miss report."""
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        note = " (reference changed, memo rebuilt)" if self.invalidated else ""
+        return (f"Match memo: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), "
+                f"{len(self.entries)} names stored{note}")
+
+
+class IngredientMatcher:
+    """Ingredient names prepared once for repeated fuzzy matching."""
+
+    def __init__(self, ingredients, workers=-1, memo=None):
+        """
+        Args:
+            ingredients (list): Ingredient names (blank CSV cells / NaN are skipped)
+            workers (int): Threads for scoring (-1 = all cores)
+            memo (MatchMemo): Results from earlier runs against the same reference (None = off)
+        """
+        self.ingredients = [name for name in ingredients if isinstance(name, str)]
+        self.keys = [token_sort_key(name) for name in self.ingredients]
+        self.workers = workers
+        self.memo = memo
+
+    def __len__(self):
+        return len(self.ingredients)
+
+    def match_many(self, names):
+        """
+        Best ingredient for each name.
+
+        Scores are fuzz.token_sort_ratio values (0-100, rounded like
+        fuzzywuzzy); ties go to the earliest ingredient in the list.
+
+        Args:
+            names (list): Deal item names
+
+        Returns:
+            list: (ingredient, score) per name; (None, 0) if there are no ingredients
+        """
+        if not self.ingredients:
+            return [(None, 0)] * len(names)
+
+        # Repeated names are cleaned once; names that clean to the same
+        # words share one score row
+        query_by_name = {name: token_sort_key(name) for name in dict.fromkeys(names)}
+        unique = list(dict.fromkeys(query_by_name.values()))
+
+        best_by_query = self.memo.lookup(unique) if self.memo is not None else {}
+        unique = [query for query in unique if query not in best_by_query]
+
+        scored = {}
+        for start in range(0, len(unique), CHUNK_SIZE):
+            chunk = unique[start:start + CHUNK_SIZE]
+            scores = process.cdist(chunk, self.keys, scorer=fuzz.ratio,
+                                   dtype=np.float64, workers=self.workers)
+            # np.round rounds half to even, like fuzzywuzzy's int(round(x))
+            scores = np.round(scores).astype(np.int16)
+            best = scores.argmax(axis=1)
+            for query, index, row in zip(chunk, best, scores):
+                scored[query] = (self.ingredients[index], int(row[index]))
+
+        if self.memo is not None and scored:
+            self.memo.store(scored)
+        best_by_query.update(scored)
+
+        return [best_by_query[query_by_name[name]] for name in names]
+
+    def match(self, name):
+        """Best (ingredient, score) for a single name."""
+        return self.match_many([name])[0]
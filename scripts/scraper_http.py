@@ -0,0 +1,154 @@
+"""
+Scraper HTTP Helpers
+
+Keep-alive sessions and per-host politeness limits for the scripts in
+this directory (southern_savers_scraper.py).
+
+- create_session(): a requests.Session that keeps connections open per
+  host (with optional per-host pool sizes), sends the given headers,
+  negotiates gzip/brotli and applies a default (connect, read) timeout,
+  so repeated pages reuse one TCP+TLS connection
+- HostLimits: caps in-flight requests per host and spaces them out to a
+  steady request rate, however many threads are fetching
+
+create_session() mirrors tools/recipe-aggregator/scripts/http_session.py.
+The two trees are run and deployed separately and neither imports from
+the other, so a change to one should be made in both.
+
+Prerequisites:
+- Python libraries: pip install requests
+- Optional: pip install brotli   (adds 'br' to Accept-Encoding)
+
+Usage:
+    session = create_session(pool_size=4, headers={'User-Agent': '...'})
+    session = create_session(pool_sizes={'www.southernsavers.com': 8})
+    limits = HostLimits(max_concurrent=4, requests_per_second=1.0)
+    with limits.slot(url):
+        response = session.get(url)
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# ==================== SESSIONS ====================
+
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+try:  # urllib3 decodes brotli transparently when either package is installed
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'gzip, deflate, br'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that fills in a default timeout for requests without one."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def create_session(pool_size=4, headers=None, timeout=DEFAULT_TIMEOUT, pool_sizes=None):
+    """
+    Build a keep-alive session.
+
+    Args:
+        pool_size (int): Connections kept open per host (at least the number
+            of threads sharing the session)
+        headers (dict): Headers sent with every request
+        timeout (float | tuple): Default (connect, read) timeout in seconds
+        pool_sizes (dict): Host -> pool size overrides, e.g. {'www.southernsavers.com': 8}
+
+    Returns:
+        requests.Session: Session with pooled adapters mounted
+    """
+    session = requests.Session()
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    if headers:
+        session.headers.update(headers)
+
+    adapter = TimeoutHTTPAdapter(timeout=timeout, pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    # Longer prefixes win, so a per-host adapter overrides the defaults above
+    for host, size in (pool_sizes or {}).items():
+        host_adapter = TimeoutHTTPAdapter(timeout=timeout, pool_connections=1, pool_maxsize=size)
+        session.mount(f'https://{host}/', host_adapter)
+        session.mount(f'http://{host}/', host_adapter)
+
+    return session
+
+
+# ==================== PER-HOST LIMITS ====================
+
+class _Host:
+    """One host's in-flight semaphore and token bucket."""
+
+    def __init__(self, max_concurrent):
+        self.in_flight = threading.Semaphore(max_concurrent)
+        self.tokens = float(max_concurrent)
+        self.refilled_at = time.monotonic()
+        self.lock = threading.Lock()
+
+
+class HostLimits:
+    """Per-host cap on concurrent requests plus a sustained request rate."""
+
+    def __init__(self, max_concurrent=4, requests_per_second=1.0):
+        """
+        Args:
+            max_concurrent (int): Requests in flight at once per host (also
+                the burst allowed before the rate limit applies)
+            requests_per_second (float): Sustained request rate per host
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.max_concurrent = max_concurrent
+        self.rate = float(requests_per_second)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _Host(self.max_concurrent)
+            return self._hosts[host]
+
+    def _take_token(self, host):
+        while True:
+            with host.lock:
+                now = time.monotonic()
+                host.tokens = min(float(self.max_concurrent),
+                                  host.tokens + (now - host.refilled_at) * self.rate)
+                host.refilled_at = now
+                if host.tokens >= 1:
+                    host.tokens -= 1
+                    return
+                wait = (1 - host.tokens) / self.rate
+            time.sleep(wait)
+
+    @contextmanager
+    def slot(self, url):
+        """Hold one of `url`'s host slots, after waiting for its rate limit."""
+        host = self._host(url)
+        with host.in_flight:
+            self._take_token(host)
+            yield
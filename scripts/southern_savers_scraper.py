@@ -5,12 +5,15 @@ Scrapes weekly grocery deals from SouthernSavers.com for Publix, Walmart, and ot
 Extracts item names, prices, discount types, and expiration dates for import to Salesforce.
 
 Prerequisites:
-- Python libraries: pip install requests beautifulsoup4 pandas fuzzywuzzy python-Levenshtein
+- Python libraries: pip install requests pandas rapidfuzz lxml
+  (lxml is optional: pages are parsed with the stdlib without it; see deal_page_parser.py)
 
 Usage:
 python scripts/southern_savers_scraper.py --store publix
 python scripts/southern_savers_scraper.py --store walmart
 python scripts/southern_savers_scraper.py --all
+python scripts/southern_savers_scraper.py --all --serial   # one store at a time
+python scripts/southern_savers_scraper.py --all --save-html pages/   # keep pages as parser fixtures
 
 Output:
 - CSV file: data/southern_savers_deals_STORE_YYYY-MM-DD.csv
@@ -18,14 +21,17 @@ Output:
 """
 
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 from datetime import datetime, timedelta
 import re
 import argparse
 import os
-from fuzzywuzzy import fuzz, process
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from deal_page_parser import BACKENDS, FALLBACK_RULE, extract_deal_texts
+from ingredient_matcher import IngredientMatcher, MatchMemo
+from scraper_http import HostLimits, create_session
 
 
 # ==================== CONFIGURATION ====================
@@ -51,6 +57,16 @@ HEADERS = {
     'Upgrade-Insecure-Requests': '1'
 }
 
+# One pooled session for every page, so each store reuses the same TLS connection
+SESSION = create_session(pool_size=4, headers=HEADERS, timeout=(5, 30))
+
+# Politeness per host when stores are fetched concurrently (every store
+# page lives on southernsavers.com): requests in flight, and request starts
+# per second after an initial burst of HOST_MAX_CONCURRENT
+HOST_MAX_CONCURRENT = 4
+HOST_REQUESTS_PER_SECOND = 1.0
+HOST_LIMITS = HostLimits(HOST_MAX_CONCURRENT, HOST_REQUESTS_PER_SECOND)
+
 # Date configuration
 VALID_FROM = datetime.now().strftime('%Y-%m-%d')
 VALID_TO = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
@@ -62,6 +78,11 @@ OUTPUT_FILE_PREFIX = "southern_savers_deals"
 # Ingredient matching configuration
 INGREDIENT_LIST_FILE = "data/ingredient_reference.csv"  # Your 1,111 ingredients
 MIN_MATCH_SCORE = 80  # Fuzzy matching threshold (0-100)
+MATCH_MEMO_FILE = "data/ingredient_match_memo.json"  # Last weeks' matches, reset when the reference changes
+
+# HTML parsing (selector plans live in deal_page_parser.py)
+PARSER_BACKEND = None  # 'lxml', 'stream' or 'bs4'; None = lxml if installed, else 'stream'
+SAVE_HTML_DIR = None   # Set by --save-html: keep each fetched page
 
 # ==================== HELPER FUNCTIONS ====================
 
@@ -93,19 +114,49 @@ def match_to_ingredient(item_name, ingredient_list, threshold=MIN_MATCH_SCORE):
     """
     Fuzzy match deal item name to your ingredient database.
 
+    Args:
+        item_name (str): Deal item name
+        ingredient_list: IngredientMatcher (or a plain list of names, prepared on every call)
+        threshold (int): Minimum score to count as a match
+
     Returns:
         tuple: (matched_ingredient, confidence_score)
     """
     if not ingredient_list:
         return None, 0
 
-    # Use fuzzywuzzy to find best match
-    match = process.extractOne(item_name, ingredient_list, scorer=fuzz.token_sort_ratio)
+    if not isinstance(ingredient_list, IngredientMatcher):
+        ingredient_list = IngredientMatcher(ingredient_list)
+
+    # Same best match and score as fuzzywuzzy's extractOne with token_sort_ratio
+    match, score = ingredient_list.match(item_name)
 
-    if match and match[1] >= threshold:
-        return match[0], match[1]
+    if score >= threshold:
+        return match, score
     else:
-        return None, match[1] if match else 0
+        return None, score
+
+
+def match_to_ingredients(item_names, ingredient_list, threshold=MIN_MATCH_SCORE):
+    """
+    Batch version of match_to_ingredient: one scoring pass for every deal.
+
+    Args:
+        item_names (list): Deal item names
+        ingredient_list: IngredientMatcher (or a plain list of names)
+        threshold (int): Minimum score to count as a match
+
+    Returns:
+        list: (matched_ingredient, confidence_score) per item name
+    """
+    if not ingredient_list:
+        return [(None, 0)] * len(item_names)
+
+    if not isinstance(ingredient_list, IngredientMatcher):
+        ingredient_list = IngredientMatcher(ingredient_list)
+
+    return [(match if score >= threshold else None, score)
+            for match, score in ingredient_list.match_many(item_names)]
 
 
 def fetch_page(url, store_name):
@@ -113,10 +164,15 @@ def fetch_page(url, store_name):
     print(f"\nFetching {store_name} deals from: {url}")
 
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
+        response = SESSION.get(url, timeout=30)
         response.raise_for_status()
 
         print(f"Successfully fetched page (Status: {response.status_code})")
+        if SAVE_HTML_DIR:
+            os.makedirs(SAVE_HTML_DIR, exist_ok=True)
+            filepath = os.path.join(SAVE_HTML_DIR, f"{store_name.lower()}_{VALID_FROM}.html")
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(response.text)
         return response.text
 
     except requests.exceptions.Timeout:
@@ -130,48 +186,36 @@ def fetch_page(url, store_name):
         return None
 
 
-def parse_southern_savers_page(html_content, store_name):
+def polite_fetch_page(url, store_name):
+    """fetch_page, within the per-host concurrency and request-rate limits."""
+    with HOST_LIMITS.slot(url):
+        return fetch_page(url, store_name)
+
+
+def parse_southern_savers_page(html_content, store_name, backend=None):
     """
     Parse Southern Savers HTML to extract deal information.
 
-    Note: HTML structure may vary. This is a template that may need adjustment
-    based on actual page structure.
+    Note: HTML structure may vary. The selectors tried are the store's plan
+    in deal_page_parser.SELECTOR_PLANS and may need adjustment based on
+    actual page structure.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-
     deals = []
 
     # ========== APPROACH 1: Find deal cards/items ==========
 
-    # Try common selectors for deal listings
-    selectors_to_try = [
-        ('div', {'class': lambda x: x and 'deal' in x.lower() if x else False}),
-        ('div', {'class': lambda x: x and 'coupon' in x.lower() if x else False}),
-        ('div', {'class': lambda x: x and 'matchup' in x.lower() if x else False}),
-        ('article', {}),
-        ('li', {'class': lambda x: x and 'product' in x.lower() if x else False}),
-    ]
-
-    deal_elements = []
-    for tag, attrs in selectors_to_try:
-        elements = soup.find_all(tag, attrs)
-        if elements:
-            deal_elements = elements
-            print(f"Found {len(elements)} potential deals using <{tag}> selector")
-            break
-
-    if not deal_elements:
+    # One pass over the page tries every selector; the first that matches wins
+    deal_texts, rule = extract_deal_texts(html_content, store_name, backend or PARSER_BACKEND)
+
+    if rule == FALLBACK_RULE:
         print("No deal elements found with standard selectors")
         print("   Trying fallback: all list items and paragraphs")
-
-        # Fallback: get all list items
-        deal_elements = soup.find_all(['li', 'p'])
+    else:
+        print(f"Found {len(deal_texts)} potential deals using <{rule.tags[0]}> selector")
 
     # ========== APPROACH 2: Parse each deal element ==========
 
-    for element in deal_elements:
-        deal_text = element.get_text(separator=' ', strip=True)
-
+    for deal_text in deal_texts:
         # Skip empty or very short text
         if len(deal_text) < 5:
             continue
@@ -183,7 +227,7 @@ def parse_southern_savers_page(html_content, store_name):
             continue
 
         # Extract deal information
-        deal = parse_deal_text(deal_text, element)
+        deal = parse_deal_text(deal_text)
 
         if deal:
             deal['Store__c'] = store_name.title()
@@ -282,17 +326,11 @@ def create_salesforce_coupon_records(deals, ingredient_list=None):
 
     coupons = []
 
-    for deal in deals:
-        # Attempt fuzzy matching to ingredient database
-        matched_ingredient = None
-        match_confidence = 0
-
-        if ingredient_list:
-            matched_ingredient, match_confidence = match_to_ingredient(
-                deal['Item_Name__c'],
-                ingredient_list
-            )
+    # Fuzzy match every deal to the ingredient database in one batch
+    # (repeated item names are scored once)
+    matches = match_to_ingredients([deal['Item_Name__c'] for deal in deals], ingredient_list)
 
+    for deal, (matched_ingredient, match_confidence) in zip(deals, matches):
         # Truncate item name to 120 characters max
         item_name = deal['Item_Name__c']
         if len(item_name) > 120:
@@ -364,6 +402,15 @@ def save_to_csv(coupons, store_name, filename=None):
     return filepath
 
 
+def save_debug_html(html_content, store_name):
+    """Keep a page that yielded no deals, for fixing the selectors."""
+    print(f"No deals found for {store_name}")
+    print("\nDEBUG: Saving HTML to debug_southern_savers.html for inspection...")
+    with open(f'debug_southern_savers_{store_name.lower()}.html', 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    print(f"Please inspect debug file and update the selectors in deal_page_parser.py")
+
+
 def scrape_store(store_name, ingredient_list=None):
     """Scrape deals for a specific store."""
 
@@ -383,11 +430,7 @@ def scrape_store(store_name, ingredient_list=None):
     deals = parse_southern_savers_page(html_content, store_name)
 
     if not deals:
-        print(f"No deals found for {store_name}")
-        print("\nDEBUG: Saving HTML to debug_southern_savers.html for inspection...")
-        with open(f'debug_southern_savers_{store_name.lower()}.html', 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        print(f"Please inspect debug file and update parse_southern_savers_page() selectors")
+        save_debug_html(html_content, store_name)
         return None
 
     # Create Salesforce records
@@ -399,6 +442,76 @@ def scrape_store(store_name, ingredient_list=None):
     return csv_file
 
 
+def scrape_stores_concurrently(store_names, ingredient_list=None, parse_workers=None):
+    """
+    Scrape several stores at once.
+
+    Pages are fetched in parallel threads (within the per-host limits) and
+    each is handed to a process pool for parsing as soon as it arrives.
+    Every store's deals are then matched in one batch by the single shared
+    matcher, so products repeated across stores are scored once.
+
+    Args:
+        store_names (list): Stores to scrape (keys of STORE_URLS)
+        ingredient_list: IngredientMatcher (or a plain list of names)
+        parse_workers (int): Parser processes (default: one per store, up
+            to the CPU count; 1 parses in this process)
+
+    Returns:
+        list: CSV files written, in store order
+    """
+    stores = []
+    for store_name in store_names:
+        if store_name.lower() in STORE_URLS:
+            stores.append(store_name.lower())
+        else:
+            print(f"Unknown store: {store_name}")
+            print(f"   Available stores: {', '.join(STORE_URLS.keys())}")
+
+    if parse_workers is None:
+        parse_workers = min(len(stores), os.cpu_count() or 1)
+    parse_pool = ProcessPoolExecutor(parse_workers) if parse_workers > 1 else None
+
+    def fetch_and_parse(store_name):
+        html_content = polite_fetch_page(STORE_URLS[store_name], store_name)
+        if not html_content:
+            return None, []
+        if parse_pool is not None:
+            # Pass the backend along: spawned workers don't see main()'s settings
+            deals = parse_pool.submit(parse_southern_savers_page, html_content, store_name,
+                                      PARSER_BACKEND).result()
+        else:
+            deals = parse_southern_savers_page(html_content, store_name)
+        return html_content, deals
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(len(stores), 1)) as fetchers:
+            pages = dict(zip(stores, fetchers.map(fetch_and_parse, stores)))
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
+
+    # One matching pass over every store's deals, then split back per store
+    all_deals = []
+    for store_name in stores:
+        html_content, deals = pages[store_name]
+        if html_content and not deals:
+            save_debug_html(html_content, store_name)
+        all_deals.extend(deals)
+    coupons = create_salesforce_coupon_records(all_deals, ingredient_list)
+
+    csv_files = []
+    start = 0
+    for store_name in stores:
+        count = len(pages[store_name][1])
+        if count:
+            csv_file = save_to_csv(coupons[start:start + count], store_name)
+            if csv_file:
+                csv_files.append(csv_file)
+        start += count
+    return csv_files
+
+
 # ==================== MAIN FUNCTION ====================
 
 def main():
@@ -408,14 +521,31 @@ def main():
     parser = argparse.ArgumentParser(description='Scrape Southern Savers coupon matchups')
     parser.add_argument('--store', type=str, help='Store to scrape (publix, walmart, kroger, target)')
     parser.add_argument('--all', action='store_true', help='Scrape all stores')
+    parser.add_argument('--serial', action='store_true',
+                        help='Scrape stores one at a time instead of concurrently')
+    parser.add_argument('--no-memo', action='store_true',
+                        help=f'Re-match every deal instead of reusing {MATCH_MEMO_FILE}')
+    parser.add_argument('--parser', choices=BACKENDS,
+                        help='HTML parser backend (default: lxml if installed, else stream)')
+    parser.add_argument('--save-html', metavar='DIR',
+                        help='Keep every fetched page in DIR (fixtures for the parser benchmark)')
     args = parser.parse_args()
 
+    global PARSER_BACKEND, SAVE_HTML_DIR
+    PARSER_BACKEND = args.parser
+    SAVE_HTML_DIR = args.save_html
+
     print("=" * 60)
     print("Southern Savers Coupon Matchup Scraper")
     print("=" * 60)
 
-    # Load ingredient reference for fuzzy matching
+    # Load ingredient reference for fuzzy matching (prepared once for every store)
     ingredient_list = load_ingredient_reference()
+    memo = None
+    if ingredient_list:
+        if not args.no_memo:
+            memo = MatchMemo(MATCH_MEMO_FILE, INGREDIENT_LIST_FILE)
+        ingredient_list = IngredientMatcher(ingredient_list, memo=memo)
 
     # Determine which stores to scrape
     stores_to_scrape = []
@@ -433,18 +563,22 @@ def main():
     # Scrape each store
     csv_files = []
 
-    for store in stores_to_scrape:
-        print(f"\n{'=' * 60}")
-        print(f"Scraping: {store.upper()}")
-        print(f"{'=' * 60}")
+    if len(stores_to_scrape) > 1 and not args.serial:
+        print(f"\nScraping {', '.join(store.upper() for store in stores_to_scrape)} concurrently")
+        csv_files = scrape_stores_concurrently(stores_to_scrape, ingredient_list)
+    else:
+        for store in stores_to_scrape:
+            print(f"\n{'=' * 60}")
+            print(f"Scraping: {store.upper()}")
+            print(f"{'=' * 60}")
 
-        csv_file = scrape_store(store, ingredient_list)
-        if csv_file:
-            csv_files.append(csv_file)
+            csv_file = scrape_store(store, ingredient_list)
+            if csv_file:
+                csv_files.append(csv_file)
 
-        # Be polite - wait between requests
-        if len(stores_to_scrape) > 1:
-            time.sleep(2)
+            # Be polite - wait between requests
+            if len(stores_to_scrape) > 1:
+                time.sleep(2)
 
     # Summary
     print(f"\n{'=' * 60}")
@@ -452,6 +586,10 @@ def main():
     print(f"{'=' * 60}")
     print(f"Stores scraped: {len(csv_files)}/{len(stores_to_scrape)}")
 
+    if memo is not None:
+        memo.save()
+        print(memo.summary())
+
     if csv_files:
         print(f"\nGenerated files:")
         for file in csv_files:
@@ -473,7 +611,7 @@ def main():
         print("\nTroubleshooting:")
         print("1. Check your internet connection")
         print("2. Inspect debug HTML files")
-        print("3. Update CSS selectors in parse_southern_savers_page()")
+        print("3. Update the selector plans in deal_page_parser.py")
         print("4. Verify Southern Savers URLs are still valid")
 
 
@@ -0,0 +1,102 @@
+"""
+HTTP Session Benchmark
+
+Per-request latency of module-level `requests.get` (new TCP+TLS connection
+every call) against the shared keep-alive session from http_session.py,
+both hitting the local stub server over HTTPS with a throwaway
+self-signed certificate.
+
+Usage:
+    python benchmarks/benchmark_http_session.py
+    python benchmarks/benchmark_http_session.py --requests 500 --latency 0.01
+
+Requires the `openssl` command line tool to create the certificate.
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from http_session import create_session  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def make_certificate(directory):
+    """Write a self-signed cert+key for 127.0.0.1 and return its path."""
+    key_path = os.path.join(directory, 'key.pem')
+    cert_path = os.path.join(directory, 'cert.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+         '-keyout', key_path, '-out', cert_path, '-days', '1',
+         '-subj', '/CN=127.0.0.1', '-addext', 'subjectAltName=IP:127.0.0.1'],
+        check=True, capture_output=True
+    )
+    bundle_path = os.path.join(directory, 'bundle.pem')
+    with open(bundle_path, 'w') as bundle:
+        for path in (cert_path, key_path):
+            with open(path) as f:
+                bundle.write(f.read())
+    return cert_path, bundle_path
+
+
+def time_requests(get, url, count):
+    """Issue `count` GETs and return per-request latencies in milliseconds."""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = get(url)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pooled vs unpooled HTTPS requests')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per mode')
+    parser.add_argument('--latency', type=float, default=0.0, help='Stub latency per request (s)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert_path, bundle_path = make_certificate(tmp)
+
+        with StubServer(latency=args.latency, certfile=bundle_path) as server:
+            url = f"{server.mealdb_url}/lookup.php?i=50000"
+
+            # verify= per call: REQUESTS_CA_BUNDLE would override session.verify
+            session = create_session()
+
+            modes = [
+                ('requests.get (new connection)', lambda u: requests.get(u, verify=cert_path, timeout=10)),
+                ('shared keep-alive session', lambda u: session.get(u, verify=cert_path)),
+            ]
+
+            print(f"HTTPS stub, {args.requests} sequential requests per mode\n")
+            print(f"{'Mode':<32}{'Mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'Req/s':>10}")
+            print("-" * 72)
+
+            means = []
+            for label, get in modes:
+                get(url)  # Warm-up (imports, first handshake for the session)
+                latencies = time_requests(get, url, args.requests)
+                mean = statistics.mean(latencies)
+                p95 = statistics.quantiles(latencies, n=20)[-1]
+                means.append(mean)
+                print(f"{label:<32}{mean:>10.2f}{statistics.median(latencies):>10.2f}"
+                      f"{p95:>10.2f}{1000 / mean:>10.0f}")
+
+    print(f"\nPer-request latency reduced {means[0] / means[1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Ingredient Index Benchmark
+
+Builds the inverted IngredientIndex over a synthetic corpus with realistic
+ingredient lines and times ingredient queries against the current approach:
+substring checks over every recipe's ' | '-joined ingredient string.
+
+Usage:
+    python benchmarks/benchmark_ingredient_index.py
+    python benchmarks/benchmark_ingredient_index.py --recipes 200000
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from ingredient_index import IngredientIndex, parse_query  # noqa: E402
+
+INGREDIENTS = [
+    'chickpeas', 'baby spinach', 'feta cheese', 'olive oil', 'garlic', 'yellow onion',
+    'chicken breasts', 'chicken thighs', 'ground beef', 'black beans', 'cherry tomatoes',
+    'tomatoes', 'basil', 'heavy cream', 'parmesan cheese', 'spaghetti', 'rice', 'carrots',
+    'celery', 'potatoes', 'sweet potatoes', 'lemon juice', 'lime', 'cilantro', 'cumin',
+    'paprika', 'chili powder', 'butter', 'eggs', 'milk', 'flour', 'sugar', 'honey',
+    'soy sauce', 'ginger', 'broccoli', 'bell peppers', 'zucchini', 'mushrooms', 'salmon',
+    'shrimp', 'pork chops', 'bacon', 'cheddar cheese', 'tortillas', 'avocados', 'corn',
+    'green beans', 'quinoa', 'lentils', 'coconut milk', 'curry paste', 'peanut butter',
+    'oats', 'blueberries', 'strawberries', 'bananas', 'yogurt', 'cabbage', 'kale',
+]
+MEASURES = ['1 cup', '2 cups', '1/2 cup', '1 tbsp', '2 tsp', '1 (15 oz) can', '3 cloves',
+            '1 lb', '8 oz', '2 large', '1 bunch', '']
+NOTES = ['', ', chopped', ', drained and rinsed', ', diced', ', to taste', ', divided']
+
+QUERIES = [
+    ('chickpeas AND spinach', lambda s: s.str.contains('chickpea') & s.str.contains('spinach')),
+    ('chicken breast AND NOT cream',
+     lambda s: s.str.contains('chicken breast') & ~s.str.contains('cream')),
+    ('salmon OR shrimp, lemon',
+     lambda s: (s.str.contains('salmon') | s.str.contains('shrimp')) & s.str.contains('lemon')),
+    ('tomato, basil, garlic, -feta',
+     lambda s: s.str.contains('tomato') & s.str.contains('basil') & s.str.contains('garlic')
+     & ~s.str.contains('feta')),
+]
+
+ON_SALE = ['Boneless Chicken Breasts, Family Pack', 'Baby Spinach 5 oz', 'Publix Feta Cheese',
+           'Barilla Spaghetti', 'Roma Tomatoes', 'Fresh Basil', 'Yellow Onions 3 lb bag']
+
+
+def build_recipes(count, seed=7):
+    """Synthetic recipes with 6-14 realistic ingredient lines each."""
+    rng = np.random.default_rng(seed)
+    lines_per_recipe = rng.integers(6, 15, count)
+    recipes = []
+    for i, n in enumerate(lines_per_recipe.tolist()):
+        picks = rng.choice(len(INGREDIENTS), n, replace=False)
+        lines = [f"{MEASURES[rng.integers(len(MEASURES))]} {INGREDIENTS[p]}"
+                 f"{NOTES[rng.integers(len(NOTES))]}".strip() for p in picks.tolist()]
+        recipes.append({'name': f'Recipe {i}', 'source': 'Synthetic',
+                        'source_url': f'https://example.com/recipes/{i}',
+                        'ingredients': ' | '.join(lines)})
+    return recipes
+
+
+def time_ms(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the ingredient inverted index')
+    parser.add_argument('--recipes', type=int, default=100000, help='Corpus size')
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per query (median reported)')
+    args = parser.parse_args()
+
+    recipes = build_recipes(args.recipes)
+    ingredients = pd.Series([r['ingredients'] for r in recipes]).str.lower()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ingredient_index.sqlite')
+        index = IngredientIndex(path)
+        start = time.perf_counter()
+        index.add_many(recipes)
+        build_s = time.perf_counter() - start
+        start = time.perf_counter()
+        index.save()
+        index.compact()
+        save_s = time.perf_counter() - start
+        start = time.perf_counter()
+        index = IngredientIndex(path)
+        load_s = time.perf_counter() - start
+
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"{args.recipes} recipes: built in {build_s:.1f}s, saved in {save_s:.1f}s "
+              f"({size_mb:.1f} MB, {index.vocabulary_size} terms), loaded in {load_s:.2f}s\n")
+
+        print(f"{'Query':<32}{'Matches':>9}{'Scan ms':>10}{'Index ms':>10}{'Speedup':>9}")
+        print("-" * 70)
+        for query, scan in QUERIES:
+            expected = int(scan(ingredients).sum())
+            matches = len(index.search(query))
+            scan_ms = time_ms(lambda: scan(ingredients), max(1, args.repeat // 5))
+            all_of, none_of = parse_query(query)
+            index_ms = time_ms(lambda: index.match_ids(all_of=all_of, none_of=none_of),
+                               args.repeat)
+            flag = '' if matches == expected else f'  (scan: {expected})'
+            print(f"{query:<32}{matches:>9}{scan_ms:>10.1f}{index_ms:>10.2f}"
+                  f"{scan_ms / index_ms:>8.0f}x{flag}")
+
+        rank_ms = time_ms(lambda: index.rank_by_sale(ON_SALE), args.repeat)
+        top = index.rank_by_sale(ON_SALE, limit=1)[0]
+        print(f"\nrank_by_sale ({len(ON_SALE)} sale items): {rank_ms:.1f} ms; top match "
+              f"{top['name']} uses {', '.join(top['on_sale'])} ({top['coverage']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+TheMealDB Fetch Benchmark
+
+Compares recipes/second for the serial crawl against the concurrent
+thread-pool crawl, both pointed at a local stub server and paced by the
+same TheMealDB token bucket rate. A final run repeats the concurrent crawl
+on a new aggregator sharing the previous one's lookups (as sync cycles do),
+so meal details come from the RequestCoalescer memo.
+
+Usage:
+    python benchmarks/benchmark_mealdb_fetch.py
+    python benchmarks/benchmark_mealdb_fetch.py --recipes 200 --latency 0.08 --workers 16
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from rate_limiter import RequestScheduler, SourcePolicy  # noqa: E402
+from recipe_aggregator import RecipeAggregator  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def run_once(server, num_recipes, rps, lookups=None, **fetch_kwargs):
+    """Fetch `num_recipes` from the stub and return (recipes, seconds, requests, lookups)."""
+    scheduler = RequestScheduler({'TheMealDB': SourcePolicy(requests_per_minute=rps * 60, burst=1)})
+    aggregator = RecipeAggregator(mealdb_base_url=server.mealdb_url, scheduler=scheduler,
+                                  lookups=lookups)
+    requests_before = server.request_count
+
+    start = time.perf_counter()
+    aggregator.fetch_from_mealdb(num_recipes=num_recipes, **fetch_kwargs)
+    elapsed = time.perf_counter() - start
+
+    return len(aggregator.recipes), elapsed, server.request_count - requests_before, aggregator.lookups
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark TheMealDB fetch modes')
+    parser.add_argument('--recipes', type=int, default=100, help='Recipes to fetch per run')
+    parser.add_argument('--latency', type=float, default=0.05, help='Stub latency per request (s)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent mode worker count')
+    parser.add_argument('--rps', type=float, default=100, help='TheMealDB requests/second budget')
+    parser.add_argument('--shared-meals', type=int, default=0,
+                        help='Meals cross-listed into each next category (exercises ID dedup)')
+    args = parser.parse_args()
+
+    # The aggregator logs every run; only the table matters here
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"Stub latency: {args.latency * 1000:.0f} ms | target: {args.recipes} recipes\n")
+    print(f"{'Mode':<34}{'Recipes':>8}{'Requests':>10}{'Seconds':>10}{'Recipes/s':>12}")
+    print("-" * 74)
+
+    with StubServer(latency=args.latency, shared_meals=args.shared_meals) as server:
+        modes = [
+            (f"serial ({args.rps:g} rps)", {}),
+            (f"concurrent ({args.workers} workers, {args.rps:g} rps)",
+             {'concurrent': True, 'max_workers': args.workers}),
+        ]
+        results = {}
+        lookups = None
+        for label, kwargs in modes:
+            count, elapsed, requests_made, lookups = run_once(server, args.recipes, args.rps, **kwargs)
+            results[label] = count / elapsed if elapsed else 0
+            print(f"{label:<34}{count:>8}{requests_made:>10}{elapsed:>10.2f}{results[label]:>12.1f}")
+
+        count, elapsed, requests_made, _ = run_once(server, args.recipes, args.rps, lookups=lookups,
+                                                    concurrent=True, max_workers=args.workers)
+        rate = count / elapsed if elapsed else 0
+        print(f"{'repeat, shared lookups':<34}{count:>8}{requests_made:>10}{elapsed:>10.2f}{rate:>12.1f}")
+
+    serial, concurrent = results.values()
+    if serial:
+        print(f"\nSpeedup: {concurrent / serial:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Full Pipeline Benchmark (offline)
+
+Runs the whole aggregation pipeline (all three sources concurrently,
+dedup, computed fields, CSV sink) against replay_server.py under a set of
+fault scenarios, and reports throughput and tail latency from the
+pipeline profiler:
+
+    clean       fixtures served as fast as possible
+    slow-tail   20 ms latency plus an exponential tail (mean 30 ms)
+    errors      5% of requests answered 503
+    429-bursts  5 requests answered 429 after every 40
+
+Rate limits are the production policies scaled by --rate-scale, so the
+rate limiter still shapes the run without making it take minutes.
+
+Save a baseline and compare later runs against it to catch regressions
+before deploying; the script exits non-zero when a scenario's throughput
+drops or its p99 page latency grows by more than --tolerance.
+
+Usage:
+    python benchmarks/benchmark_pipeline.py --save-baseline benchmarks/pipeline_baseline.json
+    python benchmarks/benchmark_pipeline.py --baseline benchmarks/pipeline_baseline.json
+    python benchmarks/benchmark_pipeline.py --fixtures fixtures/   # recorded with --record-fixtures
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from api_fixtures import FixtureSet  # noqa: E402
+from pipeline_profiler import PipelineProfiler  # noqa: E402
+from rate_limiter import DEFAULT_POLICIES, RequestScheduler, SourcePolicy  # noqa: E402
+from recipe_aggregator import RecipeAggregator  # noqa: E402
+from recipe_sink import open_sink  # noqa: E402
+from replay_server import ReplayServer, synthesize_fixtures  # noqa: E402
+from spoonacular_planner import SpoonacularPlanner  # noqa: E402
+
+SCENARIOS = {
+    'clean': {},
+    'slow-tail': {'latency': 0.02, 'jitter': 0.03},
+    'errors': {'error_rate': 0.05},
+    '429-bursts': {'burst_every': 40, 'burst_length': 5},
+}
+
+
+def run_pipeline(fixtures, faults, rate_scale, output_dir):
+    """One full aggregation against a fresh replay server; returns the profiler report."""
+    policies = {name: SourcePolicy(policy.requests_per_minute * rate_scale,
+                                   daily_quota=policy.daily_quota, burst=policy.burst)
+                for name, policy in DEFAULT_POLICIES.items()}
+    profiler = PipelineProfiler()
+
+    with ReplayServer(fixtures, **faults) as server:
+        scheduler = RequestScheduler(policies, backoff_base=0.05, max_backoff=1.0)
+        aggregator = RecipeAggregator(mealdb_base_url=server.mealdb_url, scheduler=scheduler,
+                                      sink=open_sink(os.path.join(output_dir, 'recipes.csv')),
+                                      profiler=profiler)
+        mealdb = aggregator.create_source('TheMealDB')
+        mealdb.max_workers = 8
+        sources = [
+            mealdb,
+            aggregator.create_source('Edamam', app_id='replay', app_key='replay',
+                                     base_url=server.edamam_url),
+            aggregator.create_source('Spoonacular', api_key='replay', base_url=server.base_url,
+                                     planner=SpoonacularPlanner(None)),
+        ]
+        aggregator.run_all_sources(sources=sources)
+        aggregator.close()
+        report = profiler.report()
+        report['server'] = dict(server.stats)
+    return report
+
+
+def summarize(reports):
+    """Median throughput and tail latency over the rounds of one scenario."""
+    def median(path):
+        values = []
+        for report in reports:
+            value = report
+            for key in path:
+                value = value[key]
+            values.append(value)
+        return statistics.median(values)
+
+    return {
+        'recipes': median(('totals', 'records')),
+        'recipes_per_second': median(('totals', 'records_per_second')),
+        'request_p50_ms': median(('totals', 'request_latency_ms', 'p50')),
+        'request_p99_ms': median(('totals', 'request_latency_ms', 'p99')),
+        'page_p50_ms': median(('totals', 'page_latency_ms', 'p50')),
+        'page_p99_ms': median(('totals', 'page_latency_ms', 'p99')),
+        'faults': sum(report['server']['503'] + report['server']['429'] for report in reports)
+                  // len(reports),
+    }
+
+
+def regressions(results, baseline, tolerance):
+    """Scenarios whose throughput or p99 page latency moved past `tolerance`."""
+    found = []
+    for scenario, result in results.items():
+        before = baseline.get(scenario)
+        if not before:
+            continue
+        if result['recipes_per_second'] < before['recipes_per_second'] * (1 - tolerance):
+            found.append(f"{scenario}: {result['recipes_per_second']:.1f} recipes/s "
+                         f"(baseline {before['recipes_per_second']:.1f})")
+        if result['page_p99_ms'] > before['page_p99_ms'] * (1 + tolerance):
+            found.append(f"{scenario}: p99 page latency {result['page_p99_ms']:.0f} ms "
+                         f"(baseline {before['page_p99_ms']:.0f})")
+        if result['recipes'] < before['recipes']:
+            found.append(f"{scenario}: {result['recipes']} recipes (baseline {before['recipes']})")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the full aggregation pipeline offline')
+    parser.add_argument('--fixtures', default=None,
+                        help='Recorded fixture directory (default: synthesized fixtures)')
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--rounds', type=int, default=3, help='Runs per scenario (median reported)')
+    parser.add_argument('--rate-scale', type=float, default=60,
+                        help='Multiplier on the production per-minute rate limits')
+    parser.add_argument('--baseline', default=None, help='Compare against a saved baseline')
+    parser.add_argument('--save-baseline', default=None, help='Write these results as a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed throughput drop / p99 growth vs the baseline')
+    args = parser.parse_args()
+
+    # The aggregator logs every run; only the table matters here
+    logging.getLogger().setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture_dir = args.fixtures
+        if fixture_dir is None:
+            fixture_dir = os.path.join(tmp, 'fixtures')
+            synthesize_fixtures(fixture_dir)
+        fixtures = FixtureSet(fixture_dir)
+        print(f"{len(fixtures)} fixtures ({', '.join(f'{s}: {n}' for s, n in fixtures.by_source.items())})"
+              f" | rate limits x{args.rate_scale:g} | {args.rounds} rounds per scenario\n")
+        print(f"{'Scenario':<12}{'Recipes':>8}{'Recipes/s':>11}{'Req p50':>9}{'Req p99':>9}"
+              f"{'Page p50':>10}{'Page p99':>10}{'Faults':>8}")
+        print("-" * 77)
+
+        results = {}
+        for scenario in args.scenarios:
+            reports = [run_pipeline(fixtures, SCENARIOS[scenario], args.rate_scale, tmp)
+                       for _ in range(args.rounds)]
+            result = results[scenario] = summarize(reports)
+            print(f"{scenario:<12}{result['recipes']:>8}{result['recipes_per_second']:>11.1f}"
+                  f"{result['request_p50_ms']:>9.1f}{result['request_p99_ms']:>9.1f}"
+                  f"{result['page_p50_ms']:>10.1f}{result['page_p99_ms']:>10.1f}"
+                  f"{result['faults']:>8}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        if found:
+            print(f"\nRegressions (tolerance {args.tolerance:.0%}):")
+            for line in found:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Recipe API Load Test
+
+Starts recipe_api.py in its own process, pinned to one CPU core, over a
+synthetic RecipeStore. Then opens hundreds of concurrent keep-alive
+connections that replay a browser-like mix of requests:
+
+- hot filter combinations (most users keep the default sliders)
+- a long tail of rarer ones (the "mixed" workload only)
+- next-page requests that follow `next_cursor`
+- ETag revalidations (If-None-Match)
+
+Each workload runs with the response LRU disabled and enabled, and
+reports saturated throughput and latency percentiles. Clients run closed
+loop, so latency under saturation is mostly queueing. Before the load test
+it follows `next_cursor` through every sort over recipes with missing sort
+values, and exits 1 if a page skips or repeats a recipe.
+
+Usage:
+    python benchmarks/benchmark_recipe_api.py
+    python benchmarks/benchmark_recipe_api.py --connections 500 --requests 20000
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from benchmark_recipe_load import build_corpus  # noqa: E402
+from recipe_store import RecipeStore  # noqa: E402
+
+HOT_QUERIES = [
+    {'maxCalories': 1000, 'maxSodium': 600, 'maxCookTime': 60},
+    {'maxCalories': 1000, 'maxSodium': 600, 'maxCookTime': 60, 'heartHealthy': 'true'},
+    {'maxCalories': 1000, 'maxSodium': 600, 'maxCookTime': 60, 'sort': 'calories'},
+    {'maxCalories': 800, 'maxSodium': 600, 'maxCookTime': 30, 'weeknightFriendly': 'true'},
+]
+WORDS = ['chicken', 'curry', 'soup', 'salad', 'skewers', 'pasta', 'tacos', 'stew']
+
+
+# Workload -> share of requests drawn from HOT_QUERIES
+WORKLOADS = {'hot': 1.0, 'mixed': 0.7}
+
+
+def random_query(rng, hot_share=0.7):
+    """A browser-like request: `hot_share` hot combinations, the rest long tail."""
+    if rng.random() < hot_share:
+        return dict(rng.choice(HOT_QUERIES))
+    query = {
+        'maxCalories': rng.randrange(300, 1300, 50),
+        'maxSodium': rng.randrange(200, 2500, 100),
+        'maxCookTime': rng.choice([15, 30, 45, 60, 90, 120]),
+        'sort': rng.choice(['name', 'calories', 'cookTime', 'protein']),
+        'source': rng.choice(['all', 'TheMealDB', 'Edamam', 'Spoonacular']),
+    }
+    if rng.random() < 0.3:
+        query['q'] = rng.choice(WORDS)
+    if rng.random() < 0.3:
+        query['diabeticFriendly'] = 'true'
+    return query
+
+
+def check_null_cursors(directory, page_size=3):
+    """Follow next_cursor through every sort where some recipes lack the sort value."""
+    from recipe_api import RecipeAPI
+
+    store = RecipeStore(os.path.join(directory, 'null_sorts.sqlite'))
+    store.upsert_many([{'name': f'Recipe {i}', 'source': 'Edamam', 'source_url': f'https://example.com/{i}',
+                        'calories': None if i % 2 else 100 + i % 3,
+                        'protein_g': None if i % 3 == 0 else float(i % 4),
+                        'total_time_minutes': None if i % 4 == 0 else i % 5}
+                       for i in range(10)])
+    api = RecipeAPI(store, cache_size=0, query_threads=1)
+
+    async def walk(sort):
+        seen, cursor = [], None
+        while True:
+            target = f'/api/recipes?sort={sort}&limit={page_size}'
+            if cursor:
+                target += f'&cursor={cursor}'
+            page = json.loads((await api.respond('GET', target)).body)
+            seen.extend(recipe['id'] for recipe in page['recipes'])
+            cursor = page['next_cursor']
+            if not cursor:
+                return seen
+
+    failed = [sort for sort in ('name', 'calories', 'cookTime', 'protein')
+              if sorted(asyncio.run(walk(sort))) != list(range(1, len(store) + 1))]
+    store.close()
+    return failed
+
+
+def serve(db_path, cache_size, query_threads, port_queue):
+    """Server process: one core, one event loop."""
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+    from recipe_api import run_server
+    run_server(db_path, port=0, cache_size=cache_size, query_threads=query_threads,
+               ready=port_queue.put)
+
+
+async def request(reader, writer, target, etag=None):
+    """One keep-alive GET; returns (status, headers, body)."""
+    lines = [f'GET {target} HTTP/1.1', 'Host: localhost', 'Accept-Encoding: gzip']
+    if etag:
+        lines.append(f'If-None-Match: {etag}')
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers, body
+
+
+async def client(port, count, seed, hot_share, latencies, statuses):
+    """One connection issuing `count` requests back to back."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    etags = {}
+    cursor_target = None
+    try:
+        for _ in range(count):
+            # Decide up front so only pages that will be followed are decoded
+            follow = rng.random() < 0.2
+            if cursor_target:
+                target, cursor_target = cursor_target, None
+            else:
+                target = '/api/recipes?' + urlencode(random_query(rng, hot_share))
+            etag = etags.get(target) if rng.random() < 0.5 else None
+
+            start = time.perf_counter()
+            status, headers, body = await request(reader, writer, target, etag)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+            if status == 200:
+                etags[target] = headers.get('etag')
+            if status == 200 and follow:
+                if headers.get('content-encoding') == 'gzip':
+                    body = gzip.decompress(body)
+                cursor = json.loads(body).get('next_cursor')
+                if cursor:
+                    cursor_target = f'{target}&cursor={cursor}'
+    finally:
+        writer.close()
+
+
+async def load(port, hot_share, connections, total):
+    latencies, statuses = [], {}
+    per_connection = max(1, total // connections)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, per_connection, seed, hot_share, latencies, statuses)
+                           for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    _, _, body = await request(reader, writer, '/api/health')
+    writer.close()
+    return latencies, statuses, elapsed, json.loads(body)['cache']
+
+
+def run(db_path, cache_size, query_threads, hot_share, connections, total):
+    context = multiprocessing.get_context('spawn')
+    port_queue = context.Queue()
+    server = context.Process(target=serve, args=(db_path, cache_size, query_threads, port_queue), daemon=True)
+    server.start()
+    try:
+        port = port_queue.get(timeout=30)
+        return asyncio.run(load(port, hot_share, connections, total))
+    finally:
+        server.terminate()
+        server.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the recipe query API')
+    parser.add_argument('--recipes', type=int, default=50000, help='Corpus size')
+    parser.add_argument('--connections', type=int, default=200, help='Concurrent keep-alive clients')
+    parser.add_argument('--requests', type=int, default=10000, help='Total requests per run')
+    parser.add_argument('--query-threads', type=int, default=4, help='Server SQLite threads')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        failed = check_null_cursors(tmp)
+        if failed:
+            print(f"next_cursor skipped or repeated recipes with NULL sort values: {', '.join(failed)}")
+            sys.exit(1)
+        print("next_cursor visits every recipe once in every sort, NULL sort values included\n")
+
+        db_path = os.path.join(tmp, 'recipes.sqlite')
+        store = RecipeStore(db_path)
+        store.upsert_many(build_corpus(args.recipes).to_dict('records'))
+        store.analyze()
+        store.close()
+
+        print(f"{args.recipes} recipes | {args.connections} connections | "
+              f"{args.requests} requests | server pinned to 1 core\n")
+        print(f"{'Workload':<10}{'LRU':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+              f"{'hit rate':>10}  statuses")
+        print("-" * 80)
+        for workload, hot_share in WORKLOADS.items():
+            for cache_size in (0, 512):
+                latencies, statuses, elapsed, cache = run(db_path, cache_size, args.query_threads,
+                                                          hot_share, args.connections, args.requests)
+                q = statistics.quantiles(latencies, n=100)
+                codes = ', '.join(f"{code}: {n}" for code, n in sorted(statuses.items()))
+                print(f"{workload:<10}{cache_size or 'off':>6}{len(latencies) / elapsed:>9.0f}"
+                      f"{q[49]:>9.1f}{q[94]:>9.1f}{q[98]:>9.1f}{cache['hit_rate']:>10.0%}  {codes}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Recipe Load Benchmark
+
+Time and memory to answer "heart-healthy recipes: name, calories, sodium"
+from a synthetic corpus stored as:
+
+- recipe_database.csv     (pd.read_csv, then filter in pandas)
+- recipe_database.parquet (read_recipes with column selection + filter pushdown)
+
+and checks that an older CSV layout (no cuisine column, blank meal_type)
+still exports to Parquet with those columns as nulls (exits 1 if not).
+
+Usage:
+    python benchmarks/benchmark_recipe_load.py
+    python benchmarks/benchmark_recipe_load.py --recipes 200000
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from recipe_parquet import read_recipes, write_parquet  # noqa: E402
+from recipe_sink import RECIPE_COLUMNS  # noqa: E402
+from stub_server import meal_name  # noqa: E402
+
+COLUMNS = ['name', 'calories', 'sodium_mg']
+FILTER = 'sodium_mg < 600'
+
+
+def build_corpus(count, seed=7):
+    """Synthetic recipes with realistic text lengths and value ranges."""
+    rng = np.random.default_rng(seed)
+    sodium = rng.integers(50, 2500, count)
+    sugar = rng.uniform(0, 40, count).round(1)
+    prep = rng.integers(0, 45, count)
+    cook = rng.integers(0, 120, count)
+
+    df = pd.DataFrame({
+        'name': [meal_name(i) for i in range(count)],
+        'ingredients': ' | '.join(f"1 cup ingredient {i}" for i in range(12)),
+        'instructions': 'Preheat the oven, then mix everything together and bake. ' * 14,
+        'meal_type': rng.choice(['Dinner', 'Lunch', 'Breakfast'], count),
+        'cuisine': rng.choice(['American', 'Italian', 'Mexican', 'Indian', 'Various'], count),
+        'source': rng.choice(['TheMealDB', 'Edamam', 'Spoonacular'], count),
+        'source_url': [f"https://example.com/recipes/{i}" for i in range(count)],
+        'image_url': [f"https://example.com/images/{i}.jpg" for i in range(count)],
+        'servings': rng.integers(1, 8, count),
+        'prep_time_minutes': prep,
+        'cook_time_minutes': cook,
+        'calories': rng.integers(100, 1200, count),
+        'protein_g': rng.uniform(0, 60, count).round(1),
+        'carbs_g': rng.uniform(0, 120, count).round(1),
+        'fat_g': rng.uniform(0, 60, count).round(1),
+        'fiber_g': rng.uniform(0, 15, count).round(1),
+        'sugar_g': sugar,
+        'sodium_mg': sodium,
+        'total_time_minutes': prep + cook,
+        'is_heart_healthy': sodium < 600,
+        'is_diabetic_friendly': sugar < 10,
+        'is_weeknight_friendly': (prep + cook) <= 30,
+    })
+    return df[RECIPE_COLUMNS]
+
+
+def load_csv(path):
+    df = pd.read_csv(path)
+    return df.loc[df['sodium_mg'] < 600, COLUMNS]
+
+
+def load_parquet(path):
+    return read_recipes(path, columns=COLUMNS, filters=[FILTER])
+
+
+LOADERS = {'CSV': load_csv, 'Parquet': load_parquet}
+
+
+def check_missing_columns(corpus, directory):
+    """write_parquet on a frame without cuisine and with an all-blank meal_type."""
+    older = corpus.head(100).drop(columns=['cuisine']).assign(meal_type=np.nan)
+    path = os.path.join(directory, 'older_recipes.parquet')
+    try:
+        write_parquet(older, path)
+    except Exception as e:
+        print(f"Missing/blank columns: export failed ({e})")
+        return False
+    back = read_recipes(path, columns=['name', 'cuisine', 'meal_type'])
+    ok = (len(back) == len(older) and back['cuisine'].isna().all()
+          and back['meal_type'].isna().all())
+    print(f"Missing/blank columns: {'written as nulls' if ok else 'NOT written as nulls'}")
+    return ok
+
+
+def measure(label, path):
+    """Return (rows, seconds, peak MB) for one load; run in a fresh process."""
+    load = LOADERS[label]
+    pool = pa.default_memory_pool()
+    arrow_before = pool.bytes_allocated()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load(path)
+    elapsed = time.perf_counter() - start
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Arrow buffers live outside tracemalloc; count its pool high-water mark too
+    arrow_peak = max(0, pool.max_memory() - arrow_before)
+    return len(result), elapsed, (python_peak + arrow_peak) / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CSV vs Parquet recipe loading')
+    parser.add_argument('--recipes', type=int, default=100000, help='Corpus size')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.recipes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'recipe_database.csv')
+        parquet_path = os.path.join(tmp, 'recipe_database.parquet')
+        corpus.to_csv(csv_path, index=False)
+        write_parquet(corpus, parquet_path)
+        columns_ok = check_missing_columns(corpus, tmp)
+        del corpus
+
+        print(f"{args.recipes} recipes | query: {', '.join(COLUMNS)} where {FILTER}\n")
+        print(f"{'Format':<10}{'File MB':>10}{'Rows':>10}{'Seconds':>10}{'Peak MB':>10}")
+        print("-" * 50)
+
+        results = []
+        # A fresh process per load, so neither sees the other's (or the
+        # corpus build's) allocations in its peak
+        context = multiprocessing.get_context('spawn')
+        for label, path in (('CSV', csv_path), ('Parquet', parquet_path)):
+            with context.Pool(1) as pool:
+                rows, elapsed, peak = pool.apply(measure, (label, path))
+            size = os.path.getsize(path) / 1024 / 1024
+            results.append((elapsed, peak))
+            print(f"{label:<10}{size:>10.1f}{rows:>10}{elapsed:>10.3f}{peak:>10.1f}")
+
+    (csv_time, csv_peak), (pq_time, pq_peak) = results
+    print(f"\nParquet: {pq_time / csv_time:.1%} of CSV time, {pq_peak / csv_peak:.1%} of CSV memory")
+    if not columns_ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Recipe Memory Benchmark
+
+Resident memory per recipe when the aggregator keeps recipes in memory
+(no streaming sink), for:
+
+- list of dicts (the previous self.recipes)
+- RecipeTable   (recipe_table.py: packed text, category codes, float32 numbers)
+
+Each layout is filled one record at a time, the way _add_recipe does it,
+in its own fresh process under tracemalloc (numpy reports its buffers to
+tracemalloc, so the table's arrays are counted too). Records mix the three
+sources' shapes: long MealDB/Spoonacular instructions, Edamam URLs in
+their place, float nutrition from Edamam, zeros from MealDB. Text is
+generated from templates, so it compresses better than real recipe
+prose; the table's text columns are the part that shifts with real data.
+
+Also checks that missing text (None) and empty text ('') both come back
+unchanged from the table, across compressed blocks (exits 1 if not).
+
+Usage:
+    python benchmarks/benchmark_recipe_memory.py
+    python benchmarks/benchmark_recipe_memory.py --recipes 250000
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from recipe_sink import add_computed_fields  # noqa: E402
+from recipe_table import TEXT_COLUMNS, RecipeTable  # noqa: E402
+from stub_server import meal_name  # noqa: E402
+
+_INGREDIENTS = ['chicken thighs', 'ground beef', 'salmon fillets', 'chickpeas', 'black beans',
+                'baby spinach', 'cherry tomatoes', 'yellow onion', 'garlic cloves', 'olive oil',
+                'fresh basil', 'feta cheese', 'basmati rice', 'spaghetti', 'lemon juice',
+                'ground cumin', 'smoked paprika', 'chicken stock', 'double cream', 'butter']
+# Step templates filled with per-recipe ingredients and numbers, so the
+# instructions don't compress better than real recipe text would
+_STEPS = ['Heat {n} tbsp of the {a} in a {pan} over a {heat} heat.',
+          'Add the {a} and cook for {m} minutes, stirring now and then, until {done}.',
+          'Stir in the {a} and {b} and cook for another {m} minutes.',
+          'Pour in {n}00ml of {b}, bring to the boil, then simmer for {m} minutes.',
+          'Season with salt and pepper, then scatter over the {a} before serving.',
+          'Meanwhile, cook the {a} in a large pan of salted water for {m} minutes and drain.',
+          'Preheat the oven to {t}C / {f}F / gas {g} and line a {tray} with baking paper.',
+          'Roast the {a} for {m} minutes, turning halfway through, until {done}.',
+          'Whisk the {a} with the {b} in a small bowl until smooth.',
+          'Transfer to a {dish} and leave to rest for {m} minutes before slicing.',
+          'Blitz the {a}, {b} and a splash of water in a food processor until {done}.',
+          'Fold the {a} through the {b}, taking care not to overmix.',
+          'Cover and chill for at least {n} hours, or overnight if you have time.',
+          'Divide between {n} bowls and top with the {a} and a squeeze of {b}.']
+_STEP_WORDS = {'pan': ['frying pan', 'large saucepan', 'wok', 'casserole dish', 'skillet'],
+               'heat': ['low', 'medium', 'medium-high', 'high'],
+               'done': ['softened', 'golden brown', 'tender', 'thickened', 'cooked through',
+                        'fragrant', 'smooth', 'crisp at the edges'],
+               'tray': ['baking tray', 'roasting tin', '20cm square tin', 'loaf tin'],
+               'dish': ['chopping board', 'serving platter', 'wire rack', 'warm plate']}
+_CUISINES = ['American', 'British', 'Italian', 'Mexican', 'Indian', 'Chinese', 'French', 'Thai']
+_MEAL_TYPES = ['Dinner', 'Lunch', 'Breakfast', 'Lunch/Dinner', 'Dessert']
+
+
+def make_recipe(i, rng):
+    """One normalized recipe shaped like the given source's normalize_page output."""
+    source = ('TheMealDB', 'Edamam', 'Spoonacular')[i % 3]
+    ingredients = ' | '.join(f"{rng.randint(1, 4)} {rng.choice(['cup', 'tbsp', 'tsp', 'g'])} {name}"
+                             for name in rng.sample(_INGREDIENTS, rng.randint(6, 14)))
+    if source == 'Edamam':
+        slug = meal_name(i).lower().replace(' ', '-')
+        instructions = f"https://www.example-food-blog.com/recipes/{i}-{slug}"
+    else:
+        instructions = ' '.join(
+            f"{n}. " + rng.choice(_STEPS).format(
+                a=rng.choice(_INGREDIENTS), b=rng.choice(_INGREDIENTS), n=rng.randint(1, 6),
+                m=rng.randint(2, 45), t=(t := rng.randrange(160, 240, 10)), f=t * 9 // 5 + 32,
+                g=(t - 100) // 20, **{key: rng.choice(words) for key, words in _STEP_WORDS.items()})
+            for n in range(1, rng.randint(6, 14)))
+    prep, cook = rng.randint(5, 30), rng.randint(10, 90)
+
+    if source == 'TheMealDB':
+        nutrition = dict.fromkeys(('calories', 'protein_g', 'carbs_g', 'fat_g', 'fiber_g',
+                                   'sugar_g', 'sodium_mg'), 0)
+        prep = cook = None
+    else:
+        nutrition = {'calories': rng.randint(150, 1100), 'protein_g': round(rng.uniform(3, 60), 1),
+                     'carbs_g': round(rng.uniform(5, 120), 1), 'fat_g': round(rng.uniform(2, 60), 1),
+                     'fiber_g': round(rng.uniform(0, 15), 1), 'sugar_g': round(rng.uniform(0, 40), 1),
+                     'sodium_mg': rng.randint(50, 2500)}
+
+    recipe = {
+        'name': f"{meal_name(i)} #{i}",
+        'ingredients': ingredients,
+        'instructions': instructions,
+        'meal_type': rng.choice(_MEAL_TYPES),
+        'cuisine': rng.choice(_CUISINES),
+        'source': source,
+        'source_url': f"https://www.{source.lower()}.com/recipe/{i}",
+        'image_url': f"https://img.{source.lower()}.com/images/{i}.jpg",
+        'servings': rng.randint(1, 8),
+        'prep_time_minutes': prep,
+        'cook_time_minutes': cook,
+        **nutrition,
+    }
+    add_computed_fields(recipe)
+    return recipe
+
+
+def measure(layout, count, seed):
+    """
+    Fill one layout in a fresh process.
+
+    Returns:
+        tuple: (retained bytes, build seconds, UTF-8 bytes of text held)
+    """
+    rng = random.Random(seed)
+    text_bytes = 0
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    recipes = [] if layout == 'list of dicts' else RecipeTable()
+    for i in range(count):
+        recipe = make_recipe(i, rng)
+        text_bytes += sum(len(recipe[column]) for column in TEXT_COLUMNS)
+        recipes.append(recipe)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Reads must still work: walk every record once
+    assert sum(1 for recipe in recipes if recipe['name']) == count
+    return retained, elapsed, text_bytes
+
+
+def check_text_round_trip(count=300, seed=5):
+    """Text columns with None and '' mixed in read back exactly, per record and per column."""
+    rng = random.Random(seed)
+    recipes = []
+    for i in range(count):
+        recipe = make_recipe(i, rng)
+        if i % 3 == 0:
+            recipe['instructions'] = None
+        if i % 5 == 0:
+            recipe['image_url'] = ''
+        if i % 7 == 0:
+            recipe.pop('source_url')
+        recipes.append(recipe)
+    table = RecipeTable()
+    table.extend(recipes)
+    frame = table.to_dataframe(TEXT_COLUMNS)
+    return all(table.column(column) == [recipe.get(column) for recipe in recipes]
+               and all(table[i][column] == recipe.get(column) for i, recipe in enumerate(recipes))
+               # pandas spells missing strings its own way (None or NaN by version)
+               and frame[column].isna().tolist() == [recipe.get(column) is None for recipe in recipes]
+               for column in TEXT_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark in-memory recipe representations')
+    parser.add_argument('--recipes', type=int, default=100000, help='Corpus size')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    print(f"{args.recipes} recipes held in memory\n")
+    print(f"{'Layout':<16}{'Retained MB':>13}{'Bytes/recipe':>14}{'Build s':>10}")
+    print("-" * 53)
+
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for layout in ('list of dicts', 'RecipeTable'):
+        with context.Pool(1) as pool:
+            retained, elapsed, text_bytes = pool.apply(measure, (layout, args.recipes, args.seed))
+        results[layout] = retained
+        print(f"{layout:<16}{retained / 1024 / 1024:>13.1f}{retained / args.recipes:>14.0f}"
+              f"{elapsed:>10.2f}")
+
+    ratio = results['list of dicts'] / results['RecipeTable']
+    print(f"\nRecipeTable holds the same recipes in 1/{ratio:.1f} of the memory")
+    print(f"(text is {text_bytes / args.recipes:.0f} bytes/recipe of that raw; synthetic steps "
+          f"compress better than real recipe prose, which zlib gets to roughly 3x)")
+
+    if not check_text_round_trip():
+        print("Missing/empty text did NOT round-trip through RecipeTable")
+        sys.exit(1)
+    print("Missing text reads back as None, empty text as ''")
+
+
+if __name__ == "__main__":
+    main()
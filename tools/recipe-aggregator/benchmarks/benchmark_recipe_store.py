@@ -0,0 +1,125 @@
+"""
+Recipe Store Query Benchmark
+
+Loads a synthetic corpus into the SQLite RecipeStore and times the filter
+combinations the React browser issues, against the current approach of
+reading recipe_database.csv into pandas and filtering it. Also checks that
+keyset pagination visits every recipe once in every sort order, including
+recipes whose sort value is NULL (exits 1 if not).
+
+Usage:
+    python benchmarks/benchmark_recipe_store.py
+    python benchmarks/benchmark_recipe_store.py --recipes 200000 --repeat 50
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from benchmark_recipe_load import build_corpus  # noqa: E402
+from recipe_store import SORTS, RecipeStore  # noqa: E402
+
+QUERIES = [
+    ('default sliders, by name', {'max_calories': 1000, 'max_sodium': 600, 'max_time': 60}, 'name'),
+    ('heart + weeknight, by calories', {'heart_healthy': True, 'weeknight_friendly': True}, 'calories'),
+    ('Edamam, by protein', {'source': 'Edamam', 'max_calories': 800}, 'protein'),
+    ('diabetic, <=45 min, by cook time', {'diabetic_friendly': True, 'max_time': 45}, 'cookTime'),
+    ("text 'skewers' + heart healthy", {'text': 'skewers', 'heart_healthy': True}, 'name'),
+]
+
+
+def time_ms(function, repeat):
+    """Median wall time of `function()` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def check_null_pagination(page_size=3):
+    """Page through every sort where half the recipes lack the sort value."""
+    store = RecipeStore(':memory:')
+    store.upsert_many([{'name': f'Recipe {i}', 'source': 'Edamam', 'source_url': f'https://example.com/{i}',
+                        'calories': None if i % 2 else 100 + i % 3,
+                        'protein_g': None if i % 3 == 0 else float(i % 4),
+                        'total_time_minutes': None if i % 4 == 0 else i % 5}
+                       for i in range(10)])
+    failed = []
+    for sort, (column, _) in SORTS.items():
+        seen, after = [], None
+        while True:
+            page = store.query(sort=sort, limit=page_size, after=after, columns=[column])
+            seen.extend(row['id'] for row in page)
+            if len(page) < page_size:
+                break
+            after = (page[-1][column], page[-1]['id'])
+        if sorted(seen) != list(range(1, len(store) + 1)):
+            failed.append(sort)
+    store.close()
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark RecipeStore filter queries')
+    parser.add_argument('--recipes', type=int, default=100000, help='Corpus size')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per query (median reported)')
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.recipes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'recipe_database.csv')
+        corpus.to_csv(csv_path, index=False)
+
+        store = RecipeStore(os.path.join(tmp, 'recipes.sqlite'))
+        start = time.perf_counter()
+        store.upsert_many(corpus.to_dict('records'))
+        store.analyze()
+        print(f"Loaded {len(store)} recipes in {time.perf_counter() - start:.1f}s\n")
+
+        def pandas_filter():
+            df = pd.read_csv(csv_path)
+            return df[(df['calories'] <= 1000) & (df['sodium_mg'] <= 600)
+                      & (df['total_time_minutes'] <= 60)].sort_values('name').head(50)
+
+        print(f"{'Query':<36}{'Matches':>9}{'Page ms':>10}{'Count ms':>10}")
+        print("-" * 65)
+        for label, filters, sort in QUERIES:
+            page_ms = time_ms(lambda: store.query(sort=sort, limit=50, **filters), args.repeat)
+            count_ms = time_ms(lambda: store.count(**filters), args.repeat)
+            print(f"{label:<36}{store.count(**filters):>9}{page_ms:>10.2f}{count_ms:>10.2f}")
+
+        # Keyset pagination: page 20 costs the same as page 1
+        after = None
+        for _ in range(20):
+            page = store.query(sort='calories', limit=50, after=after, heart_healthy=True)
+            after = (page[-1]['calories'], page[-1]['id'])
+        deep_ms = time_ms(lambda: store.query(sort='calories', limit=50, after=after,
+                                              heart_healthy=True), args.repeat)
+        print(f"{'page 21 (keyset), heart healthy':<36}{'':>9}{deep_ms:>10.2f}")
+
+        csv_ms = time_ms(pandas_filter, max(1, args.repeat // 10))
+        print(f"\npandas read_csv + filter (default sliders): {csv_ms:.0f} ms")
+        store.close()
+
+    failed = check_null_pagination()
+    if failed:
+        print(f"Keyset pagination skipped or repeated recipes with NULL sort values: {', '.join(failed)}")
+        sys.exit(1)
+    print("Keyset pagination visits every recipe once in every sort, NULL sort values included")
+
+
+if __name__ == "__main__":
+    main()
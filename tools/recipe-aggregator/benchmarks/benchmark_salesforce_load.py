@@ -0,0 +1,125 @@
+"""
+Salesforce Load Benchmark
+
+Loads synthetic recipes into the local mock org (mock_bulk_api.py) two
+ways, with the same simulated network round trip per request:
+
+- one REST upsert per record (what a simple-salesforce loop does), timed
+  on a sample and extrapolated to the full set
+- SalesforceBulkSink: parallel Bulk API 2.0 jobs, clean and with 2% lock
+  errors plus one job failing outright (only the failed rows are retried)
+
+Usage:
+    python benchmarks/benchmark_salesforce_load.py
+    python benchmarks/benchmark_salesforce_load.py --recipes 50000 --latency 0.03
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from http_session import create_session  # noqa: E402
+from mock_bulk_api import MockBulkApiServer  # noqa: E402
+from salesforce_loader import (EXTERNAL_ID_FIELD, MEAL_OBJECT, SF_API_VERSION,  # noqa: E402
+                               BulkApiClient, SalesforceBulkSink, meal_record)
+from stub_server import meal_name  # noqa: E402
+
+_INGREDIENTS = ['chicken thighs', 'ground beef', 'salmon fillets', 'chickpeas', 'black beans',
+                'baby spinach', 'cherry tomatoes', 'yellow onion', 'garlic', 'olive oil',
+                'basil', 'feta cheese', 'rice', 'spaghetti', 'lemon juice', 'cumin']
+
+
+def build_recipes(count, seed=3):
+    """Synthetic normalized recipes with distinct keys."""
+    rng = random.Random(seed)
+    recipes = []
+    for i in range(count):
+        prep, cook = rng.randint(5, 30), rng.randint(10, 90)
+        recipes.append({
+            'name': f"{meal_name(i)} #{i}",
+            'ingredients': ', '.join(rng.sample(_INGREDIENTS, 8)),
+            'instructions': ' '.join(f"Step {n}: cook." for n in range(1, 7)),
+            'meal_type': rng.choice(['Dinner', 'Lunch', 'Breakfast', 'Lunch/Dinner', 'Dessert']),
+            'source': 'Spoonacular',
+            'source_url': f'https://example.com/recipes/{i}',
+            'servings': 4, 'prep_time_minutes': prep, 'cook_time_minutes': cook,
+            'calories': rng.uniform(200, 900), 'protein_g': rng.uniform(5, 60),
+            'carbs_g': rng.uniform(10, 90), 'fat_g': rng.uniform(5, 50),
+            'fiber_g': rng.uniform(1, 15), 'sugar_g': rng.uniform(1, 30),
+            'sodium_mg': rng.uniform(100, 1500), 'total_time_minutes': prep + cook,
+            'is_heart_healthy': rng.random() < 0.4, 'is_diabetic_friendly': rng.random() < 0.3,
+            'is_weeknight_friendly': prep + cook <= 30,
+        })
+    return recipes
+
+
+def run_single(recipes, latency):
+    """One PATCH per record; returns (seconds, calls)."""
+    with MockBulkApiServer(request_latency=latency) as org:
+        session = create_session(headers={'Authorization': f'Bearer {org.access_token}'})
+        url = f"{org.instance_url}/services/data/v{SF_API_VERSION}/sobjects/{MEAL_OBJECT}/{EXTERNAL_ID_FIELD}"
+        start = time.perf_counter()
+        for recipe in recipes:
+            record = meal_record(recipe)
+            key = record.pop(EXTERNAL_ID_FIELD)
+            session.patch(f'{url}/{key}', data=json.dumps(record),
+                          headers={'Content-Type': 'application/json'}).raise_for_status()
+        return time.perf_counter() - start, len(recipes)
+
+
+def run_bulk(recipes, latency, parallel_jobs, **faults):
+    """SalesforceBulkSink into a fresh mock org; returns a result dict."""
+    with MockBulkApiServer(request_latency=latency, **faults) as org:
+        client = BulkApiClient(org.instance_url, org.access_token, poll_interval=0.05,
+                               max_poll_interval=0.5)
+        start = time.perf_counter()
+        with SalesforceBulkSink(client, parallel_jobs=parallel_jobs) as sink:
+            for recipe in recipes:
+                sink.write(recipe)
+        return {'seconds': time.perf_counter() - start, 'calls': client.calls, 'jobs': sink.jobs,
+                'retried': sink.retried, 'failed': len(sink.failures), 'in_org': len(org.records)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark loading recipes into Meal__c')
+    parser.add_argument('--recipes', type=int, default=50000)
+    parser.add_argument('--single-sample', type=int, default=500,
+                        help='Records timed for the one-call-per-record loader')
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds per HTTP round trip')
+    parser.add_argument('--parallel-jobs', type=int, default=4)
+    args = parser.parse_args()
+
+    # The loader logs every job; only the table matters here
+    logging.getLogger().setLevel(logging.ERROR)
+
+    recipes = build_recipes(args.recipes)
+    print(f"{args.recipes} recipes | {args.latency * 1000:.0f} ms per request | "
+          f"{args.parallel_jobs} parallel jobs\n")
+    print(f"{'Loader':<34}{'Seconds':>9}{'API calls':>11}{'Jobs':>6}{'Retried':>9}{'In org':>8}")
+    print("-" * 77)
+
+    sample = recipes[:args.single_sample]
+    seconds, calls = run_single(sample, args.latency)
+    scale = args.recipes / len(sample)
+    print(f"{'REST upsert per record (est.)':<34}{seconds * scale:>9.1f}{int(calls * scale):>11}"
+          f"{'-':>6}{'-':>9}{'-':>8}")
+
+    for label, faults in (('Bulk API 2.0', {}),
+                          ('  ... 2% lock errors, 1 job fails', {'lock_error_rate': 0.02,
+                                                                 'fail_jobs': 1})):
+        result = run_bulk(recipes, args.latency, args.parallel_jobs, **faults)
+        print(f"{label:<34}{result['seconds']:>9.1f}{result['calls']:>11}{result['jobs']:>6}"
+              f"{result['retried']:>9}{result['in_org']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Spoonacular Quota Benchmark
+
+Spends the same daily point budget against the local stub server (which
+bills points like the real API and answers 402 when they run out) in two
+ways:
+
+- the previous fetch: complexSearch pages of 10 with addRecipeNutrition
+  and fillIngredients, no instructions, stopping at the first error
+- SpoonacularSource with the planner: ID-only searches plus
+  informationBulk, over several simulated days, with and without
+  injected 500s on the bulk endpoint
+
+Reports recipes and complete recipes (with instructions) per point, and
+checks that the points the planner charged each day match what the stub
+billed (failed calls refunded, exits 1 if not).
+
+Usage:
+    python benchmarks/benchmark_spoonacular_plan.py
+    python benchmarks/benchmark_spoonacular_plan.py --days 5 --points 150
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import datetime
+import logging
+import os
+import sys
+import tempfile
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from rate_limiter import RequestScheduler, SourcePolicy  # noqa: E402
+from recipe_aggregator import RecipeAggregator  # noqa: E402
+from spoonacular_planner import SpoonacularPlanner  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def scheduler():
+    # No retries: failures reach the fetch code, which is what is being compared
+    return RequestScheduler({'Spoonacular': SourcePolicy(requests_per_minute=60000, burst=10)},
+                            max_retries=0)
+
+
+def run_legacy(server, days):
+    """The old fetch: 10 recipes per complexSearch page until 150 or the first error."""
+    seen = set()
+    points = 0.0
+    for _ in range(days):
+        server.reset_spoonacular_day()
+        pacer = scheduler()
+        # Every run restarted at offset 0, as fetch_from_spoonacular did
+        for offset in range(0, 150, 10):
+            params = {'apiKey': 'stub', 'number': 10, 'offset': offset, 'type': 'main course',
+                      'addRecipeNutrition': 'true', 'fillIngredients': 'true'}
+            try:
+                data = pacer.get('Spoonacular', f'{server.base_url}/recipes/complexSearch',
+                                 params=params).json()
+            except requests.RequestException:
+                break
+            seen.update(result['id'] for result in data.get('results', []))
+        points += server.spoonacular_points
+    # complexSearch results carry no instructions, so none are complete
+    return len(seen), 0, points
+
+
+def run_planned(server, days, daily_points, plan_path):
+    """SpoonacularSource + planner, one aggregator run per simulated day."""
+    recipes = complete = 0
+    points = charged = 0.0
+    day = [datetime.date(2025, 12, 1)]
+    for d in range(days):
+        day[0] = datetime.date(2025, 12, 1) + datetime.timedelta(days=d)
+        server.reset_spoonacular_day()
+        planner = SpoonacularPlanner(plan_path, daily_points=daily_points, today=lambda: day[0])
+        aggregator = RecipeAggregator(scheduler=scheduler())
+        source = aggregator.create_source('Spoonacular', api_key='stub',
+                                          base_url=server.base_url, planner=planner)
+        aggregator.run_source(source)
+        recipes += len(aggregator.recipes)
+        complete += sum(1 for r in aggregator.recipes if r['instructions'])
+        points += server.spoonacular_points
+        charged += planner.points_used
+    return recipes, complete, points, planner, charged
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Spoonacular point usage')
+    parser.add_argument('--days', type=int, default=3, help='Simulated days')
+    parser.add_argument('--points', type=float, default=150, help='Daily point budget')
+    parser.add_argument('--fail-every', type=int, default=3,
+                        help='Fail every Nth informationBulk call in the error scenario')
+    args = parser.parse_args()
+
+    # The aggregator logs every run; only the table matters here
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print(f"{args.points:.0f} points/day | {args.days} days\n")
+    print(f"{'Strategy':<36}{'Recipes':>9}{'Complete':>10}{'Points':>9}{'Complete/pt':>13}")
+    print("-" * 77)
+
+    def row(label, recipes, complete, points):
+        print(f"{label:<36}{recipes:>9}{complete:>10}{points:>9.1f}"
+              f"{complete / points if points else 0:>13.2f}")
+
+    with StubServer(latency=0, spoonacular_daily_points=args.points) as server:
+        row('complexSearch x10 (previous)', *run_legacy(server, args.days))
+
+    mismatched = False
+    for label, fail_every in (('planner + informationBulk', 0),
+                              (f'  ... with 1 in {args.fail_every} bulk calls failing',
+                               args.fail_every)):
+        with tempfile.TemporaryDirectory() as tmp, \
+                StubServer(latency=0, spoonacular_daily_points=args.points,
+                           spoonacular_fail_every=fail_every) as server:
+            recipes, complete, points, planner, charged = run_planned(
+                server, args.days, args.points, os.path.join(tmp, 'plan.json'))
+            row(label, recipes, complete, points)
+            print(f"{'':<4}plan after the last day: {planner.summary()}")
+            print(f"{'':<4}planner charged {charged:.1f} of {points:.1f} points billed")
+            mismatched |= abs(charged - points) > 0.01
+
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+Local Mock Salesforce Org (Bulk API 2.0)
+
+In-memory Meal__c table behind the Bulk API 2.0 ingest endpoints the
+loader uses, plus the single-record REST upsert for comparison:
+
+    POST  /services/data/vXX.X/jobs/ingest/                   create job
+    PUT   /services/data/vXX.X/jobs/ingest/<id>/batches/      upload CSV
+    PATCH /services/data/vXX.X/jobs/ingest/<id>/              UploadComplete / Aborted
+    GET   /services/data/vXX.X/jobs/ingest/<id>/              job info
+    GET   .../failedResults/  .../successfulResults/  .../unprocessedrecords/
+    PATCH /services/data/vXX.X/sobjects/Meal__c/Recipe_Key__c/<key>
+
+Jobs are processed in a background thread at `records_per_second`.
+Validation mirrors the org's field definitions (Name length, the
+restricted Meal_Type__c picklist), and `lock_error_rate` makes that share
+of rows fail with UNABLE_TO_LOCK_ROW on their first attempt only, the
+way contention errors clear up on retry.
+
+Usage:
+    with MockBulkApiServer(lock_error_rate=0.02) as org:
+        client = BulkApiClient(org.instance_url, org.access_token, poll_interval=0.05)
+
+    python benchmarks/mock_bulk_api.py --port 8090
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MAX_UPLOAD_BYTES = 150 * 1024 * 1024
+MEAL_TYPES = {'Breakfast', 'Lunch', 'Dinner', 'Snack'}
+
+_JOB_PATH = re.compile(r'^/services/data/v[\d.]+/jobs/ingest/?(?:([\w]+)/?)?'
+                       r'(batches|failedResults|successfulResults|unprocessedrecords)?/?$')
+_SOBJECT_PATH = re.compile(r'^/services/data/v[\d.]+/sobjects/(\w+)/(\w+)/([^/]+)$')
+
+
+class _Job:
+    def __init__(self, job_id, spec):
+        self.id = job_id
+        self.object = spec.get('object')
+        self.external_id = spec.get('externalIdFieldName')
+        self.operation = spec.get('operation')
+        self.state = 'Open'
+        self.data = b''
+        self.processed = 0
+        self.failed = []        # (row, error)
+        self.succeeded = []     # (row, created)
+        self.unprocessed = []
+        self.error_message = None
+
+    def info(self):
+        return {'id': self.id, 'object': self.object, 'operation': self.operation,
+                'externalIdFieldName': self.external_id, 'state': self.state,
+                'numberRecordsProcessed': self.processed,
+                'numberRecordsFailed': len(self.failed), 'errorMessage': self.error_message,
+                'contentType': 'CSV', 'lineEnding': 'LF'}
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _authorized(self):
+        if self.headers.get('Authorization') == f'Bearer {self.server.org.access_token}':
+            return True
+        self._json(401, [{'errorCode': 'INVALID_SESSION_ID',
+                          'message': 'Session expired or invalid'}])
+        return False
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def do_POST(self):
+        org = self.server.org
+        org.count('requests')
+        if not self._authorized():
+            return
+        match = _JOB_PATH.match(self.path)
+        if not match or match.group(1):
+            return self._json(404, [{'errorCode': 'NOT_FOUND', 'message': self.path}])
+        spec = json.loads(self._body())
+        if spec.get('operation') == 'upsert' and not spec.get('externalIdFieldName'):
+            return self._json(400, [{'errorCode': 'INVALIDJOB',
+                                     'message': 'externalIdFieldName is required for upsert'}])
+        self._json(200, org.create_job(spec).info())
+
+    def do_PUT(self):
+        org = self.server.org
+        org.count('requests')
+        if not self._authorized():
+            return
+        match = _JOB_PATH.match(self.path)
+        job = org.jobs.get(match.group(1)) if match and match.group(2) == 'batches' else None
+        body = self._body()
+        if job is None:
+            return self._json(404, [{'errorCode': 'NOT_FOUND', 'message': self.path}])
+        if job.state != 'Open':
+            return self._json(409, [{'errorCode': 'INVALIDJOBSTATE',
+                                     'message': f'Job is {job.state}'}])
+        if len(job.data) + len(body) > MAX_UPLOAD_BYTES:
+            return self._json(400, [{'errorCode': 'INVALIDJOB',
+                                     'message': 'Upload exceeds 150 MB'}])
+        job.data += body
+        self._json(201, None)
+
+    def do_PATCH(self):
+        org = self.server.org
+        org.count('requests')
+        if not self._authorized():
+            return
+        body = json.loads(self._body() or b'{}')
+
+        sobject = _SOBJECT_PATH.match(self.path)
+        if sobject:
+            object_name, field, key = sobject.groups()
+            created, error = org.upsert(dict(body, **{field: key}), field)
+            if error:
+                return self._json(400, [{'errorCode': error.split(':')[0], 'message': error}])
+            return self._json(201 if created else 200, {'id': org.ids[key], 'created': created})
+
+        match = _JOB_PATH.match(self.path)
+        job = org.jobs.get(match.group(1)) if match and not match.group(2) else None
+        if job is None:
+            return self._json(404, [{'errorCode': 'NOT_FOUND', 'message': self.path}])
+        state = body.get('state')
+        if state == 'UploadComplete' and job.state == 'Open':
+            job.state = 'UploadComplete'
+            org.enqueue(job)
+        elif state == 'Aborted' and job.state in ('Open', 'UploadComplete'):
+            job.state = 'Aborted'
+        else:
+            return self._json(400, [{'errorCode': 'INVALIDJOBSTATE',
+                                     'message': f'Cannot move {job.state} job to {state}'}])
+        self._json(200, job.info())
+
+    def do_GET(self):
+        org = self.server.org
+        org.count('requests')
+        if not self._authorized():
+            return
+        match = _JOB_PATH.match(self.path)
+        job = org.jobs.get(match.group(1)) if match else None
+        if job is None:
+            return self._json(404, [{'errorCode': 'NOT_FOUND', 'message': self.path}])
+        resource = match.group(2)
+        if resource is None:
+            return self._json(200, job.info())
+        if resource == 'failedResults':
+            rows = [dict({'sf__Id': '', 'sf__Error': error}, **row) for row, error in job.failed]
+        elif resource == 'successfulResults':
+            rows = [dict({'sf__Id': org.ids.get(row.get(job.external_id), ''),
+                          'sf__Created': 'true' if created else 'false'}, **row)
+                    for row, created in job.succeeded]
+        else:
+            rows = job.unprocessed
+        self._csv(rows)
+
+    def _json(self, status, payload):
+        body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _csv(self, rows):
+        buffer = io.StringIO()
+        if rows:
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0]), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(rows)
+        body = buffer.getvalue().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+
+class MockBulkApiServer:
+    """
+    Threaded localhost mock of a Salesforce org's Meal__c ingest APIs.
+
+    Args:
+        records_per_second (float): Bulk processing speed per job
+        lock_error_rate (float): Share of rows failing UNABLE_TO_LOCK_ROW on their first attempt
+        request_latency (float): Seconds added to every HTTP request (network round trip)
+        fail_jobs (int): The first N jobs fail outright (nothing processed)
+        seed (int): Seed for lock error sampling
+        port (int): Port to listen on (0 = ephemeral)
+    """
+
+    access_token = 'mock-session-token'
+
+    def __init__(self, records_per_second=20000, lock_error_rate=0.0, request_latency=0.0,
+                 fail_jobs=0, seed=0, port=0):
+        self.records_per_second = records_per_second
+        self.lock_error_rate = lock_error_rate
+        self.request_latency = request_latency
+        self.fail_jobs = fail_jobs
+        self.records = {}   # Recipe_Key__c -> fields
+        self.ids = {}       # Recipe_Key__c -> record Id
+        self.jobs = {}
+        self.stats = {'requests': 0, 'jobs': 0, 'lock_errors': 0}
+        self._rng = random.Random(seed)
+        self._attempted = set()
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+        self._record_ids = itertools.count(1)
+
+        latency = request_latency
+
+        class Handler(_MockHandler):
+            def handle_one_request(self):
+                if latency:
+                    time.sleep(latency)
+                super().handle_one_request()
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.org = self
+        self._thread = None
+
+    @property
+    def instance_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    # ===== ORG =====
+    def create_job(self, spec):
+        with self._lock:
+            job = _Job(f'750MOCK{next(self._job_ids):011d}', spec)
+            self.jobs[job.id] = job
+            self.stats['jobs'] += 1
+        return job
+
+    def enqueue(self, job):
+        threading.Thread(target=self._process, args=(job,), daemon=True).start()
+
+    def _process(self, job):
+        job.state = 'InProgress'
+        rows = list(csv.DictReader(io.StringIO(job.data.decode('utf-8'))))
+        with self._lock:
+            fail = self.fail_jobs > 0
+            if fail:
+                self.fail_jobs -= 1
+        if fail:
+            job.unprocessed = rows
+            job.error_message = 'InternalServerError: processing failed'
+            job.state = 'Failed'
+            return
+
+        start = time.perf_counter()
+        for n, row in enumerate(rows, start=1):
+            if job.state == 'Aborted':
+                job.unprocessed = rows[n - 1:]
+                return
+            record = {field: value for field, value in row.items() if value != ''}
+            created, error = self.upsert(record, job.external_id)
+            if error:
+                job.failed.append((row, error))
+            else:
+                job.succeeded.append((row, created))
+            job.processed = n
+            # Pace to the configured processing speed
+            ahead = n / self.records_per_second - (time.perf_counter() - start)
+            if ahead > 0.005:
+                time.sleep(ahead)
+        job.state = 'JobComplete'
+
+    def upsert(self, record, external_id_field):
+        """
+        Insert or update one record keyed on `external_id_field`.
+
+        Returns:
+            tuple: (created, error message or None)
+        """
+        key = record.get(external_id_field)
+        if not key:
+            return False, f'MISSING_ARGUMENT:{external_id_field} not specified:--'
+        name = record.get('Name') or ''
+        if len(name) > 80:
+            return False, 'STRING_TOO_LONG:Meal Name: data value too large:Name --'
+        meal_type = record.get('Meal_Type__c')
+        if meal_type and meal_type not in MEAL_TYPES:
+            return False, (f'INVALID_OR_NULL_FOR_RESTRICTED_PICKLIST:Meal Type: bad value '
+                           f'for restricted picklist field: {meal_type}:Meal_Type__c --')
+
+        with self._lock:
+            first_attempt = key not in self._attempted
+            self._attempted.add(key)
+            if first_attempt and self.lock_error_rate and self._rng.random() < self.lock_error_rate:
+                self.stats['lock_errors'] += 1
+                return False, ('UNABLE_TO_LOCK_ROW:unable to obtain exclusive access to '
+                               'this record or 1 records:--')
+            created = key not in self.records
+            if created:
+                self.ids[key] = f'a0XMOCK{next(self._record_ids):011d}'
+                self.records[key] = {}
+            self.records[key].update(record)
+        return created, None
+
+    # ===== LIFECYCLE =====
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a mock Salesforce Bulk API 2.0 org')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--records-per-second', type=float, default=20000)
+    parser.add_argument('--lock-error-rate', type=float, default=0.0)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds per request')
+    args = parser.parse_args()
+
+    org = MockBulkApiServer(records_per_second=args.records_per_second,
+                            lock_error_rate=args.lock_error_rate,
+                            request_latency=args.latency, port=args.port).start()
+    print(f"Mock org on {org.instance_url} (Authorization: Bearer {org.access_token}); "
+          f"Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        org.stop()
+
+
+if __name__ == "__main__":
+    main()
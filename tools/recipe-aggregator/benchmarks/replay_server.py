@@ -0,0 +1,294 @@
+"""
+Fixture Replay Server
+
+Replays recorded API fixtures (see scripts/api_fixtures.py) for all three
+sources from one localhost port, with injectable faults:
+
+- latency + jitter: fixed delay plus an exponential tail per request
+- error_rate: share of requests answered 503
+- 429 bursts: every `burst_every` requests, the next `burst_length` get
+  429 with a Retry-After header
+
+Point the sources at it with `mealdb_url`, `edamam_url` and `base_url`
+(Spoonacular). Without recorded fixtures, `synthesize` writes a
+deterministic synthetic set in the same format.
+
+Usage:
+    python benchmarks/replay_server.py synthesize fixtures/
+    python benchmarks/replay_server.py serve fixtures/ --port 8080 --latency 0.05 --error-rate 0.02
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from api_fixtures import FixtureSet, recipe_information_path, write_fixtures  # noqa: E402
+from recipe_sources import EdamamSource  # noqa: E402
+from spoonacular_planner import SEARCH_TYPES  # noqa: E402
+from stub_server import build_mealdb_dataset, build_spoonacular_dataset, meal_name  # noqa: E402
+
+MEALDB_PATH = '/api/json/v1/1'
+EDAMAM_PATH = '/api/recipes/v2'
+
+_INGREDIENTS = ['chicken thighs', 'ground beef', 'salmon fillets', 'chickpeas', 'black beans',
+                'baby spinach', 'cherry tomatoes', 'yellow onion', 'garlic', 'olive oil',
+                'basil', 'feta cheese', 'parmesan', 'rice', 'spaghetti', 'lemon juice',
+                'cumin', 'paprika', 'soy sauce', 'ginger', 'broccoli', 'bell peppers',
+                'coconut milk', 'curry paste', 'potatoes', 'carrots', 'celery', 'butter']
+_MEASURES = ['1 cup', '2 tbsp', '1 tsp', '1 lb', '3 cloves', '1 (15 oz) can', '1/2 cup']
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        fault = server.next_fault()
+        if server.latency or server.jitter:
+            time.sleep(server.latency + (server.rng_expovariate() if server.jitter else 0.0))
+
+        if fault == 429:
+            self._send(429, b'{"message": "Too many requests"}', 'application/json',
+                       {'Retry-After': f'{server.retry_after:g}'})
+            return
+        if fault == 503:
+            self._send(503, b'{"message": "Service unavailable"}', 'application/json')
+            return
+
+        url = urlparse(self.path)
+        entry = server.fixtures.lookup(url.path, parse_qsl(url.query, keep_blank_values=True))
+        if entry is None:
+            server.count('missing')
+            self._send(404, b'{"message": "No fixture recorded"}', 'application/json')
+            return
+        server.count('served')
+        self._send(entry['status'], entry['body'], entry['content_type'])
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+
+class ReplayServer:
+    """
+    Threaded HTTP server replaying a FixtureSet on an ephemeral localhost port.
+
+    Args:
+        fixtures (FixtureSet | str): Fixtures, or a fixture directory
+        latency (float): Seconds added to every response
+        jitter (float): Mean of an extra exponential delay (long tail), seconds
+        error_rate (float): Share of requests answered 503
+        burst_every (int): Start a 429 burst every N requests (0 = never)
+        burst_length (int): Requests answered 429 per burst
+        retry_after (float): Retry-After seconds sent with each 429
+        seed (int): Seed for jitter and error sampling
+        port (int): Port to listen on (0 = ephemeral)
+    """
+
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, error_rate=0.0, burst_every=0,
+                 burst_length=5, retry_after=0.2, seed=0, port=0):
+        if isinstance(fixtures, str):
+            fixtures = FixtureSet(fixtures)
+        httpd = ThreadingHTTPServer(('127.0.0.1', port), _ReplayHandler)
+        httpd.daemon_threads = True
+        httpd.fixtures = fixtures
+        httpd.latency = latency
+        httpd.jitter = jitter
+        httpd.retry_after = retry_after
+        self.stats = {'requests': 0, 'served': 0, 'missing': 0, '503': 0, '429': 0}
+        self._lock = threading.Lock()
+        rng = random.Random(seed)
+
+        def next_fault():
+            with self._lock:
+                self.stats['requests'] += 1
+                n = self.stats['requests']
+                if burst_every and n >= burst_every and n % burst_every < burst_length:
+                    fault = 429
+                elif error_rate and rng.random() < error_rate:
+                    fault = 503
+                else:
+                    return None
+                self.stats[str(fault)] += 1
+                return fault
+
+        def count(outcome):
+            with self._lock:
+                self.stats[outcome] += 1
+
+        def expovariate():
+            with self._lock:
+                return rng.expovariate(1 / jitter)
+
+        httpd.next_fault = next_fault
+        httpd.count = count
+        httpd.rng_expovariate = expovariate
+        self._httpd = httpd
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def mealdb_url(self):
+        return self.base_url + MEALDB_PATH
+
+    @property
+    def edamam_url(self):
+        return self.base_url + EDAMAM_PATH
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ===== SYNTHETIC FIXTURES =====
+def _ingredient_lines(rng, count):
+    return [f"{rng.choice(_MEASURES)} {name}" for name in rng.sample(_INGREDIENTS, count)]
+
+
+def synthesize_fixtures(directory, num_categories=14, meals_per_category=25,
+                        spoonacular_per_type=150, seed=7):
+    """
+    Write a deterministic synthetic fixture set for all three sources, shaped
+    like real responses and covering every request a default run makes.
+
+    Returns:
+        dict: Entries written per source
+    """
+    rng = random.Random(seed)
+    written = {}
+
+    # TheMealDB: categories, listings, lookups
+    categories, listings, details = build_mealdb_dataset(num_categories, meals_per_category)
+    entries = [(f'{MEALDB_PATH}/categories.php', [], 200, {'categories': categories})]
+    for category, meals in listings.items():
+        entries.append((f'{MEALDB_PATH}/filter.php', [('c', category)], 200, {'meals': meals}))
+    for meal_id, detail in details.items():
+        detail = dict(detail, strInstructions=' '.join(
+            f"Step {n}: cook the {rng.choice(_INGREDIENTS)}." for n in range(1, 7)))
+        for i, name in enumerate(rng.sample(_INGREDIENTS, 8), start=1):
+            detail[f'strIngredient{i}'], detail[f'strMeasure{i}'] = name, rng.choice(_MEASURES)
+        entries.append((f'{MEALDB_PATH}/lookup.php', [('i', meal_id)], 200, {'meals': [detail]}))
+    written['TheMealDB'] = write_fixtures(directory, 'TheMealDB', entries)
+
+    # Edamam: one page of 10 hits per default search term
+    entries = []
+    name_index = 3000
+    for term in EdamamSource.SEARCH_TERMS:
+        hits = []
+        for _ in range(10):
+            calories = rng.uniform(900, 3200)
+            hits.append({'recipe': {
+                'label': meal_name(name_index),
+                'ingredientLines': _ingredient_lines(rng, rng.randint(6, 12)),
+                'yield': 4,
+                'mealType': ['lunch/dinner'],
+                'cuisineType': [rng.choice(['italian', 'mexican', 'asian', 'american'])],
+                'url': f'https://example.com/edamam/{name_index}',
+                'image': f'https://example.com/edamam/{name_index}.jpg',
+                'totalNutrients': {
+                    'ENERC_KCAL': {'quantity': calories, 'unit': 'kcal'},
+                    'PROCNT': {'quantity': rng.uniform(40, 160), 'unit': 'g'},
+                    'CHOCDF': {'quantity': rng.uniform(60, 300), 'unit': 'g'},
+                    'FAT': {'quantity': rng.uniform(20, 140), 'unit': 'g'},
+                    'FIBTG': {'quantity': rng.uniform(4, 40), 'unit': 'g'},
+                    'SUGAR': {'quantity': rng.uniform(5, 80), 'unit': 'g'},
+                    'NA': {'quantity': rng.uniform(800, 6000), 'unit': 'mg'},
+                },
+            }})
+            name_index += 1
+        entries.append((EDAMAM_PATH, [('q', term), ('to', '10'), ('type', 'public')], 200,
+                        {'hits': hits}))
+    written['Edamam'] = write_fixtures(directory, 'Edamam', entries)
+
+    # Spoonacular: ID-only searches per dish type + per-recipe information
+    listings, details = build_spoonacular_dataset(SEARCH_TYPES, spoonacular_per_type,
+                                                  name_offset=1000)
+    entries = []
+    for dish_type, ids in listings.items():
+        for offset in range(0, len(ids) + 1, 100):
+            page = ids[offset:offset + 100]
+            results = [{'id': i, 'title': details[i]['title']} for i in page]
+            entries.append(('/recipes/complexSearch',
+                            [('number', '100'), ('offset', str(offset)), ('type', dish_type)],
+                            200, {'results': results, 'offset': offset, 'number': len(results),
+                                  'totalResults': len(ids)}))
+    for recipe_id, recipe in details.items():
+        recipe = dict(recipe, extendedIngredients=[
+            {'original': line} for line in _ingredient_lines(rng, rng.randint(6, 12))])
+        entries.append((recipe_information_path(recipe_id), [], 200, recipe))
+    written['Spoonacular'] = write_fixtures(directory, 'Spoonacular', entries)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay recorded API fixtures')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    synthesize = commands.add_parser('synthesize', help='Write a synthetic fixture set')
+    synthesize.add_argument('directory')
+
+    serve = commands.add_parser('serve', help='Serve fixtures until interrupted')
+    serve.add_argument('directory')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--latency', type=float, default=0.0, help='Seconds per response')
+    serve.add_argument('--jitter', type=float, default=0.0, help='Mean extra exponential delay (s)')
+    serve.add_argument('--error-rate', type=float, default=0.0, help='Share answered 503')
+    serve.add_argument('--burst-every', type=int, default=0, help='Start a 429 burst every N requests')
+    serve.add_argument('--burst-length', type=int, default=5, help='Requests per 429 burst')
+    args = parser.parse_args()
+
+    if args.command == 'synthesize':
+        written = synthesize_fixtures(args.directory)
+        print(json.dumps(written))
+        return
+
+    fixtures = FixtureSet(args.directory)
+    server = ReplayServer(fixtures, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate, burst_every=args.burst_every,
+                          burst_length=args.burst_length, port=args.port).start()
+    print(f"Replaying {len(fixtures)} fixtures on {server.base_url} "
+          f"(TheMealDB {server.mealdb_url}, Edamam {server.edamam_url}); Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Local Stub API Server
+
+Serves TheMealDB- and Spoonacular-shaped JSON from memory on localhost so
+fetch performance can be measured without touching the real APIs. The
+Spoonacular endpoints meter points the way the real API bills them and
+answer 402 once the daily budget is spent.
+
+Usage:
+    with StubServer(latency=0.05) as server:    # certfile=... for HTTPS
+        aggregator = RecipeAggregator(mealdb_base_url=server.mealdb_url)
+        source = aggregator.create_source('Spoonacular', base_url=server.base_url)
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import json
+import ssl
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+_ADJECTIVES = ['Smoky', 'Spicy', 'Lemon', 'Garlic', 'Honey', 'Herbed', 'Creamy', 'Grilled',
+               'Roasted', 'Braised', 'Crispy', 'Tangy', 'Sesame', 'Maple', 'Chipotle', 'Pesto']
+_PROTEINS = ['Chicken', 'Beef', 'Salmon', 'Pork', 'Shrimp', 'Tofu', 'Turkey', 'Lamb',
+             'Cod', 'Chickpea', 'Lentil', 'Mushroom', 'Duck', 'Tuna', 'Bean', 'Egg']
+_DISHES = ['Tacos', 'Curry', 'Stew', 'Salad', 'Pasta', 'Stir Fry', 'Soup', 'Skewers',
+           'Bowl', 'Casserole', 'Wraps', 'Burgers', 'Risotto', 'Noodles', 'Pie', 'Chili']
+
+
+def meal_name(index):
+    """Distinct, realistic-looking recipe name for the `index`-th synthetic meal."""
+    adjective = _ADJECTIVES[index % len(_ADJECTIVES)]
+    protein = _PROTEINS[(index // len(_ADJECTIVES)) % len(_PROTEINS)]
+    dish = _DISHES[(index // (len(_ADJECTIVES) * len(_PROTEINS))) % len(_DISHES)]
+    return f"{adjective} {protein} {dish}"
+
+
+def build_mealdb_dataset(num_categories=14, meals_per_category=25, shared_meals=0):
+    """
+    Generate a synthetic TheMealDB catalogue.
+
+    Args:
+        shared_meals (int): Meals from the previous category also listed at
+            the top of each category (cross-listed meals, as with the real API's
+            category/area/ingredient listings)
+
+    Returns:
+        tuple: (categories list, {category: [meal stubs]}, {meal_id: detail})
+    """
+    categories = []
+    listings = {}
+    details = {}
+
+    for c in range(num_categories):
+        cat_name = f"Category{c}"
+        categories.append({'idCategory': str(c), 'strCategory': cat_name})
+        listings[cat_name] = []
+
+        for m in range(meals_per_category):
+            meal_id = str(50000 + c * 1000 + m)
+            name = meal_name(c * meals_per_category + m)
+            listings[cat_name].append({'idMeal': meal_id, 'strMeal': name})
+
+            detail = {
+                'idMeal': meal_id,
+                'strMeal': name,
+                'strCategory': cat_name,
+                'strArea': 'Unknown',
+                'strInstructions': 'Mix everything. ' * 20,
+                'strMealThumb': f"https://example.com/{meal_id}.jpg",
+                'strSource': '',
+            }
+            for i in range(1, 21):
+                detail[f'strIngredient{i}'] = f"ingredient {i}" if i <= 8 else ''
+                detail[f'strMeasure{i}'] = '1 cup' if i <= 8 else ''
+            details[meal_id] = detail
+
+    for c in range(1, num_categories):
+        previous = listings[f"Category{c - 1}"][-shared_meals:] if shared_meals else []
+        listings[f"Category{c}"][:0] = previous
+
+    return categories, listings, details
+
+
+def build_spoonacular_dataset(dish_types, recipes_per_type=300, name_offset=0):
+    """
+    Generate a synthetic Spoonacular catalogue.
+
+    Args:
+        name_offset (int): First meal_name() index, to keep titles distinct
+            from other synthetic sources
+
+    Returns:
+        tuple: ({dish type: [recipe IDs]}, {recipe ID: informationBulk record})
+    """
+    listings = {}
+    details = {}
+    for t, dish_type in enumerate(dish_types):
+        listings[dish_type] = []
+        for r in range(recipes_per_type):
+            recipe_id = 700000 + t * 10000 + r
+            listings[dish_type].append(recipe_id)
+            details[recipe_id] = {
+                'id': recipe_id,
+                'title': meal_name(name_offset + t * recipes_per_type + r),
+                'servings': 4,
+                'preparationMinutes': 10,
+                'cookingMinutes': 25,
+                'sourceUrl': f"https://example.com/recipes/{recipe_id}",
+                'image': f"https://example.com/{recipe_id}.jpg",
+                'cuisines': ['italian'],
+                'dishTypes': [dish_type],
+                'extendedIngredients': [{'original': f"1 cup ingredient {i}"} for i in range(8)],
+                'analyzedInstructions': [{'name': '', 'steps': [
+                    {'number': n, 'step': f"Step {n} of the method."} for n in range(1, 6)]}],
+                'nutrition': {'nutrients': [
+                    {'name': 'Calories', 'amount': 480.0, 'unit': 'kcal'},
+                    {'name': 'Protein', 'amount': 32.0, 'unit': 'g'},
+                    {'name': 'Carbohydrates', 'amount': 41.0, 'unit': 'g'},
+                    {'name': 'Fat', 'amount': 18.0, 'unit': 'g'},
+                    {'name': 'Fiber', 'amount': 6.0, 'unit': 'g'},
+                    {'name': 'Sugar', 'amount': 7.0, 'unit': 'g'},
+                    {'name': 'Sodium', 'amount': 540.0, 'unit': 'mg'},
+                ]},
+            }
+    return listings, details
+
+
+def _spoonacular_points(endpoint, query, results):
+    """Points the real API would bill for this call."""
+    if endpoint == 'informationBulk':
+        return 1 + 0.5 * (results - 1) if results else 1
+    points = 1 + 0.01 * results
+    for flag in ('addRecipeInformation', 'addRecipeNutrition', 'fillIngredients'):
+        if query.get(flag, ['false'])[0].lower() == 'true':
+            points += 0.025 * results
+    return points
+
+
+class _MealDBHandler(BaseHTTPRequestHandler):
+    """Routes the TheMealDB and Spoonacular endpoints the aggregator uses."""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real APIs
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        endpoint = parsed.path.rsplit('/', 1)[-1]
+
+        if endpoint == 'categories.php':
+            body = {'categories': server.categories}
+        elif endpoint == 'filter.php':
+            body = {'meals': server.listings.get(query.get('c', [''])[0])}
+        elif endpoint == 'lookup.php':
+            detail = server.details.get(query.get('i', [''])[0])
+            body = {'meals': [detail] if detail else None}
+        elif endpoint in ('complexSearch', 'informationBulk'):
+            body = self._spoonacular(endpoint, query)
+            if body is None:
+                return
+        else:
+            self.send_error(404)
+            return
+
+        with server.counter_lock:
+            server.request_count += 1
+
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _spoonacular(self, endpoint, query):
+        """Spoonacular response body, or None after sending an error status."""
+        server = self.server
+        if endpoint == 'complexSearch':
+            ids = server.spoonacular_listings.get(query.get('type', [''])[0], [])
+            offset = int(query.get('offset', ['0'])[0])
+            page = ids[offset:offset + int(query.get('number', ['10'])[0])]
+            detail = any(query.get(flag, ['false'])[0].lower() == 'true'
+                         for flag in ('addRecipeNutrition', 'fillIngredients'))
+            results = [server.spoonacular_details[i] if detail
+                       else {'id': i, 'title': server.spoonacular_details[i]['title']}
+                       for i in page]
+            body = {'results': results, 'offset': offset, 'number': len(results),
+                    'totalResults': len(ids)}
+        else:
+            with server.counter_lock:
+                server.spoonacular_bulk_calls += 1
+                failing = (server.spoonacular_fail_every
+                           and server.spoonacular_bulk_calls % server.spoonacular_fail_every == 0)
+            if failing:
+                self.send_error(500)
+                return None
+            ids = [int(i) for i in query.get('ids', [''])[0].split(',') if i]
+            results = [server.spoonacular_details[i] for i in ids
+                       if i in server.spoonacular_details]
+            body = results
+
+        with server.counter_lock:
+            points = _spoonacular_points(endpoint, query, len(results))
+            if server.spoonacular_points + points > server.spoonacular_daily_points:
+                self.send_error(402, 'Your daily points limit has been reached')
+                return None
+            server.spoonacular_points += points
+        return body
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+
+class StubServer:
+    """
+    Threaded HTTP server on an ephemeral localhost port.
+
+    Args:
+        latency (float): Seconds to sleep before answering each request,
+            approximating a real network round trip
+        certfile (str): PEM certificate (with key) to serve HTTPS instead of HTTP
+        shared_meals (int): Meals cross-listed into the next category
+        spoonacular_types (list): Dish types in the Spoonacular catalogue
+        spoonacular_daily_points (float): Points billed before answering 402
+        spoonacular_fail_every (int): Answer every Nth informationBulk call
+            with a 500 (0 = never)
+    """
+
+    def __init__(self, latency=0.05, num_categories=14, meals_per_category=25, certfile=None,
+                 shared_meals=0, spoonacular_types=('main course', 'side dish', 'salad', 'soup'),
+                 spoonacular_daily_points=150, spoonacular_fail_every=0):
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _MealDBHandler)
+        self._tls = certfile is not None
+        if self._tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile)
+            self._httpd.socket = context.wrap_socket(self._httpd.socket, server_side=True)
+        self._httpd.daemon_threads = True
+        self._httpd.latency = latency
+        self._httpd.request_count = 0
+        self._httpd.counter_lock = threading.Lock()
+        (self._httpd.categories,
+         self._httpd.listings,
+         self._httpd.details) = build_mealdb_dataset(num_categories, meals_per_category,
+                                                     shared_meals)
+        (self._httpd.spoonacular_listings,
+         self._httpd.spoonacular_details) = build_spoonacular_dataset(spoonacular_types)
+        self._httpd.spoonacular_daily_points = spoonacular_daily_points
+        self._httpd.spoonacular_fail_every = spoonacular_fail_every
+        self._httpd.spoonacular_points = 0.0
+        self._httpd.spoonacular_bulk_calls = 0
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"{'https' if self._tls else 'http'}://{host}:{port}"
+
+    @property
+    def mealdb_url(self):
+        return f"{self.base_url}/api/json/v1/1"
+
+    @property
+    def request_count(self):
+        return self._httpd.request_count
+
+    @property
+    def spoonacular_points(self):
+        """Spoonacular points billed so far."""
+        return self._httpd.spoonacular_points
+
+    def reset_spoonacular_day(self):
+        """Start a new billing day."""
+        self._httpd.spoonacular_points = 0.0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,201 @@
+"""
+API Fixtures (Record / Replay)
+
+Captures TheMealDB, Edamam and Spoonacular responses into fixture files so
+the aggregator can be benchmarked offline and reproducibly against
+benchmarks/replay_server.py.
+
+Fixtures are one JSON Lines file per source (`TheMealDB.jsonl`, ...), one
+response per line:
+
+    {"path": "/api/json/v1/1/lookup.php", "query": [["i", "52772"]],
+     "status": 200, "content_type": "application/json", "body": "..."}
+
+Credentials (apiKey, app_id, app_key) are dropped from the query and
+scrubbed from bodies (Edamam echoes them in `_links`). Spoonacular
+informationBulk responses are also stored per recipe, so a replay can
+answer any grouping of IDs, not only the exact batches that were recorded.
+
+Usage:
+    python scripts/recipe_aggregator.py --record-fixtures fixtures/
+
+    fixtures = FixtureSet('fixtures/')
+    entry = fixtures.lookup('/api/json/v1/1/lookup.php', [('i', '52772')])
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import glob
+import json
+import logging
+import os
+import threading
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+logger = logging.getLogger(__name__)
+
+SECRET_PARAMS = ('apiKey', 'app_id', 'app_key')
+REDACTED = 'REDACTED'
+
+# URL path prefix -> source (paths are the same on the real hosts and the stubs)
+SOURCE_PATHS = (
+    ('/api/json/', 'TheMealDB'),
+    ('/api/recipes/v2', 'Edamam'),
+    ('/recipes/', 'Spoonacular'),
+)
+
+BULK_PATH = '/recipes/informationBulk'
+
+
+def recipe_information_path(recipe_id):
+    """Per-recipe key that informationBulk responses are split into."""
+    return f'/recipes/{recipe_id}/information'
+
+
+def source_for_path(path):
+    """Source whose API a URL path belongs to (None if unknown)."""
+    return next((source for prefix, source in SOURCE_PATHS if path.startswith(prefix)), None)
+
+
+def fixture_key(path, query):
+    """
+    Lookup key for a request: path plus sorted query, credentials removed.
+
+    Args:
+        path (str): URL path
+        query (list): (name, value) pairs
+
+    Returns:
+        str: e.g. '/api/recipes/v2?q=chicken&to=10&type=public'
+    """
+    pairs = sorted((name, value) for name, value in query if name not in SECRET_PARAMS)
+    return f"{path}?{urlencode(pairs)}" if pairs else path
+
+
+class FixtureRecorder:
+    """
+    Records every response a requests.Session receives from a known API.
+
+    Attach it to a dedicated session (not the process-wide shared one) and
+    run the aggregator without its response cache, so every request
+    actually reaches the network and gets recorded.
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Fixture directory (created if missing; files are appended to)
+        """
+        self.directory = directory
+        self.recorded = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def attach(self, session):
+        """Add the recording hook to `session` and return it."""
+        session.hooks['response'].append(self._record)
+        return session
+
+    def _record(self, response, *args, **kwargs):
+        url = urlparse(response.request.url)
+        source = source_for_path(url.path)
+        if source is None or response.status_code not in (200, 404):
+            return response  # Not a recipe API, or a transient error not worth replaying
+
+        query = parse_qsl(url.query, keep_blank_values=True)
+        body = response.text
+        for name, value in query:
+            if name in SECRET_PARAMS and len(value) >= 4:
+                body = body.replace(value, REDACTED)
+
+        entries = [self._entry(url.path, query, response.status_code,
+                               response.headers.get('Content-Type', 'application/json'), body)]
+        if url.path.endswith(BULK_PATH) and response.status_code == 200:
+            entries.extend(self._entry(recipe_information_path(recipe['id']), [], 200,
+                                       'application/json', json.dumps(recipe))
+                           for recipe in json.loads(body))
+
+        with self._lock:
+            with open(os.path.join(self.directory, f'{source}.jsonl'), 'a', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + '\n')
+            self.recorded += 1
+        return response
+
+    @staticmethod
+    def _entry(path, query, status, content_type, body):
+        return {
+            'path': path,
+            'query': sorted([name, value] for name, value in query if name not in SECRET_PARAMS),
+            'status': status,
+            'content_type': content_type,
+            'body': body,
+        }
+
+
+def write_fixtures(directory, source, entries):
+    """
+    Write fixture entries for `source` (replacing its file).
+
+    Args:
+        entries (iterable): (path, query pairs, status, body object or str)
+    """
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    with open(os.path.join(directory, f'{source}.jsonl'), 'w', encoding='utf-8') as f:
+        for path, query, status, body in entries:
+            if not isinstance(body, str):
+                body = json.dumps(body)
+            f.write(json.dumps(FixtureRecorder._entry(path, query, status,
+                                                      'application/json', body)) + '\n')
+            count += 1
+    return count
+
+
+class FixtureSet:
+    """Recorded responses loaded from a fixture directory, keyed by fixture_key()."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._entries = {}
+        self.by_source = {}
+        for path in sorted(glob.glob(os.path.join(directory, '*.jsonl'))):
+            source = os.path.splitext(os.path.basename(path))[0]
+            count = 0
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    entry['body'] = entry['body'].encode('utf-8')
+                    # Later recordings of the same request win
+                    self._entries[fixture_key(entry['path'], entry['query'])] = entry
+                    count += 1
+            self.by_source[source] = count
+        logger.info(f"📼 Loaded {len(self._entries)} fixtures from {directory}")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, path, query):
+        """
+        Recorded response for a request, or None.
+
+        An informationBulk request with no exact recording is assembled
+        from the per-recipe entries (IDs without one are left out, as the
+        real API does).
+
+        Returns:
+            dict | None: Entry with 'status', 'content_type' and 'body' (bytes)
+        """
+        entry = self._entries.get(fixture_key(path, query))
+        if entry is not None or not path.endswith(BULK_PATH):
+            return entry
+
+        ids = next((value for name, value in query if name == 'ids'), '')
+        recipes = [self._entries[key]['body'].decode('utf-8')
+                   for key in (recipe_information_path(i) for i in ids.split(',') if i)
+                   if key in self._entries]
+        return {'status': 200, 'content_type': 'application/json',
+                'body': f"[{','.join(recipes)}]".encode('utf-8')}
@@ -0,0 +1,130 @@
+"""
+Aggregation Checkpoints
+
+Persists a run's progress after every batch so a crash or exhausted
+quota only costs the batch in flight:
+
+    <directory>/recipes.jsonl  - collected recipes, appended per batch
+    <directory>/state.json     - per-source cursors + committed recipe count
+
+state.json is replaced atomically after the recipes it counts are on
+disk, so a torn final line in recipes.jsonl is ignored on resume.
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """Append-only recipe log plus atomically replaced cursor state."""
+
+    def __init__(self, directory='data/checkpoint'):
+        """
+        Args:
+            directory (str): Where checkpoint files live
+        """
+        self.directory = directory
+        self.state_path = os.path.join(directory, 'state.json')
+        self.recipes_path = os.path.join(directory, 'recipes.jsonl')
+        self._lock = threading.Lock()
+        self._state = {'cursors': {}, 'recipe_count': 0}
+
+    def exists(self):
+        return os.path.exists(self.state_path)
+
+    def load(self):
+        """
+        Read the last committed checkpoint and drop any uncommitted tail.
+
+        Returns:
+            tuple: (cursors dict, number of committed recipes)
+        """
+        with self._lock:
+            with open(self.state_path, encoding='utf-8') as f:
+                self._state = json.load(f)
+
+            count = self._state.get('recipe_count', 0)
+            found = self._truncate_recipes(count)
+            if found < count:
+                logger.warning(f"⚠️  Checkpoint expected {count} recipes, found {found}")
+                self._state['recipe_count'] = found
+
+        logger.info(f"♻️  Loaded checkpoint: {found} recipes, "
+                    f"cursors for {', '.join(self._state['cursors']) or 'no sources'}")
+        return dict(self._state['cursors']), found
+
+    def iter_recipes(self):
+        """Stream committed recipes back from disk, one dict at a time."""
+        if not os.path.exists(self.recipes_path):
+            return
+        with open(self.recipes_path, encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def start(self):
+        """Discard any previous checkpoint and begin a new one."""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            self._state = {'cursors': {}, 'recipe_count': 0}
+            open(self.recipes_path, 'w', encoding='utf-8').close()
+            self._write_state()
+
+    def save(self, source, cursor, new_recipes):
+        """
+        Commit one batch.
+
+        Args:
+            source (str): Source whose cursor advanced
+            cursor (dict): Where that source should resume
+            new_recipes (list): Recipes collected since the last save
+        """
+        with self._lock:
+            if new_recipes:
+                with open(self.recipes_path, 'a', encoding='utf-8') as f:
+                    for recipe in new_recipes:
+                        f.write(json.dumps(recipe, ensure_ascii=False) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            self._state['cursors'][source] = cursor
+            self._state['recipe_count'] += len(new_recipes)
+            self._write_state()
+
+    def clear(self):
+        """Remove checkpoint files after a successful run."""
+        with self._lock:
+            for path in (self.state_path, self.recipes_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _write_state(self):
+        self._state['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+
+    def _truncate_recipes(self, count):
+        """Keep the first `count` lines of recipes.jsonl; return lines kept."""
+        if not os.path.exists(self.recipes_path):
+            return 0
+        kept = 0
+        with open(self.recipes_path, 'rb+') as f:
+            while kept < count:
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    f.seek(-len(line), os.SEEK_CUR)  # Torn write
+                    break
+                kept += 1
+            f.truncate(f.tell())
+        return kept
@@ -0,0 +1,386 @@
+"""
+Near-Duplicate Recipe Index
+
+MinHash/LSH index that answers "have we already got this recipe?" in
+sub-millisecond time, without comparing against every recipe seen so far.
+
+- Each recipe name is reduced to character 3-gram shingles plus whole-word
+  features (after dropping punctuation, parentheticals and filler words
+  like "easy"), so
+  "Chicken Tikka Masala" and "Chicken Tikka-Masala (Easy)" collide.
+- Ingredient tokens get their own smaller signature and act as a veto:
+  similar names with nothing in common in the pan are kept apart.
+- LSH banding turns the name signature into bucket keys; only recipes
+  sharing a bucket are compared, with one vectorized numpy pass.
+
+The index can be persisted to SQLite and records which record won each
+duplicate match.
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Words that decorate a recipe title without changing the dish
+FILLER_WORDS = {
+    'a', 'an', 'the', 'and', 'with', 'recipe', 'easy', 'best', 'quick', 'simple',
+    'homemade', 'classic', 'ultimate', 'perfect', 'favorite', 'favourite', 'style',
+}
+
+# Ingredient words that say nothing about the dish
+MEASURE_WORDS = {
+    'cup', 'cups', 'tbsp', 'tsp', 'tablespoon', 'tablespoons', 'teaspoon', 'teaspoons',
+    'oz', 'ounce', 'ounces', 'lb', 'lbs', 'pound', 'pounds', 'gram', 'grams', 'kg', 'ml',
+    'pinch', 'dash', 'large', 'small', 'medium', 'chopped', 'diced', 'sliced', 'minced',
+    'fresh', 'freshly', 'ground', 'and', 'for', 'the', 'or', 'to', 'of', 'taste', 'optional',
+}
+
+_PARENTHETICAL = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)  # splitmix64 constants
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_S27, _S30, _S31, _S32 = (np.uint64(n) for n in (27, 30, 31, 32))
+_BAND_MULTIPLIER = np.uint64(0x100000001B3)  # FNV-1a 64-bit prime
+
+
+def name_shingles(name, k=3):
+    """
+    Character k-gram shingles of a normalized recipe name, plus one feature
+    per whole word so that swapping a word ("Pie" for "Pasta") costs more
+    than its few changed characters.
+
+    Returns:
+        set: Shingle strings (empty for blank names)
+    """
+    text = _PARENTHETICAL.sub(' ', name.lower())
+    words = [w for w in _NON_WORD.split(text) if w and w not in FILLER_WORDS]
+    joined = ''.join(words)
+    shingles = {f'#{w}' for w in words}
+    if len(joined) <= k:
+        return shingles | ({joined} if joined else set())
+    return shingles | {joined[i:i + k] for i in range(len(joined) - k + 1)}
+
+
+def ingredient_tokens(ingredients):
+    """
+    Content words from an ingredient list (' | '-joined string or list).
+
+    Returns:
+        set: Lowercase tokens with quantities and measure words removed
+    """
+    if not ingredients:
+        return set()
+    if not isinstance(ingredients, str):
+        ingredients = ' '.join(ingredients)
+    return {
+        token for token in _NON_WORD.split(ingredients.lower())
+        if len(token) > 2 and not token.isdigit() and token not in MEASURE_WORDS
+    }
+
+
+class MinHasher:
+    """MinHash over string features, vectorized with numpy."""
+
+    def __init__(self, num_perm, seed=1):
+        rng = np.random.RandomState(seed)
+        # One random 64-bit salt per permutation, mixed with splitmix64
+        self.salts = rng.randint(0, 1 << 62, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, features):
+        """
+        Args:
+            features (set): String features
+
+        Returns:
+            np.ndarray: uint32 signature of length num_perm (all max for empty input)
+        """
+        if not features:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter(
+            (zlib.crc32(f.encode('utf-8')) for f in features),
+            dtype=np.uint64, count=len(features)
+        )
+        with np.errstate(over='ignore'):
+            z = np.bitwise_xor.outer(hashes, self.salts)
+            z = (z ^ (z >> _S30)) * _MIX1
+            z = (z ^ (z >> _S27)) * _MIX2
+            z ^= z >> _S31
+        return (z.min(axis=0) >> _S32).astype(np.uint32)
+
+
+class DuplicateMatch:
+    """The earlier record a new recipe duplicates."""
+
+    def __init__(self, record_id, name, source, similarity):
+        self.record_id = record_id
+        self.name = name
+        self.source = source
+        self.similarity = similarity
+
+    def __repr__(self):
+        return (f"DuplicateMatch({self.name!r} from {self.source}, "
+                f"similarity={self.similarity:.2f})")
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of recipe name signatures.
+
+    Args:
+        threshold (float): Estimated name Jaccard similarity that counts as a duplicate
+        num_perm (int): Name signature length
+        bands (int): LSH bands (num_perm must divide evenly); more bands = higher recall
+        ingredient_perm (int): Ingredient signature length (veto check)
+        min_ingredient_similarity (float): Below this, similar names are only
+            duplicates if the names are near-identical
+        path (str): SQLite file to load from / save to (None = in-memory only)
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=32, ingredient_perm=32,
+                 min_ingredient_similarity=0.15, path=None, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_ingredient_similarity = min_ingredient_similarity
+        self.path = path
+        self.seed = seed
+
+        self._name_hasher = MinHasher(num_perm, seed)
+        self._ingredient_hasher = MinHasher(ingredient_perm, seed + 1)
+
+        self._names = []
+        self._sources = []
+        self._name_sigs = np.empty((self.INITIAL_CAPACITY, num_perm), dtype=np.uint32)
+        self._ingredient_sigs = np.empty((self.INITIAL_CAPACITY, ingredient_perm), dtype=np.uint32)
+        self._has_ingredients = np.zeros(self.INITIAL_CAPACITY, dtype=bool)
+        self._buckets = [{} for _ in range(bands)]  # Per band: band hash -> record ids
+
+        self._saved_count = 0
+        self._unsaved_matches = []
+        self.duplicates_found = 0
+
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._names)
+
+    # ----- Queries -----
+
+    def check_and_add(self, name, ingredients=None, source=None):
+        """
+        Look for a near-duplicate; index the recipe if none is found.
+
+        Args:
+            name (str): Recipe name
+            ingredients (str | list): Ingredient lines
+            source (str): Source the record came from
+
+        Returns:
+            DuplicateMatch: The record that won, or None if this recipe is new
+        """
+        name_sig, ingredient_sig, has_ingredients = self._signatures(name, ingredients)
+        match = self._best_match(name_sig, ingredient_sig, has_ingredients)
+
+        if match is None:
+            self._add(name, source, name_sig, ingredient_sig, has_ingredients)
+            return None
+
+        # Seeing the very same record again (e.g. replayed on resume) is not news
+        if not (match.name == name and match.source == source):
+            self.duplicates_found += 1
+            self._unsaved_matches.append((name, source, match.record_id, match.similarity))
+        return match
+
+    def query(self, name, ingredients=None):
+        """Find a near-duplicate without adding anything to the index."""
+        return self._best_match(*self._signatures(name, ingredients))
+
+    def _signatures(self, name, ingredients):
+        name_sig = self._name_hasher.signature(name_shingles(name))
+        tokens = ingredient_tokens(ingredients)
+        return name_sig, self._ingredient_hasher.signature(tokens), bool(tokens)
+
+    def _band_hashes(self, name_sigs):
+        """
+        Collapse each band of rows into one uint64 bucket key.
+
+        Args:
+            name_sigs (np.ndarray): (n, num_perm) signatures
+
+        Returns:
+            np.ndarray: (n, bands) uint64 keys
+        """
+        banded = name_sigs.reshape(len(name_sigs), self.bands, self.rows).astype(np.uint64)
+        keys = np.zeros(banded.shape[:2], dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for row in range(self.rows):
+                keys = keys * _BAND_MULTIPLIER ^ banded[:, :, row]
+        return keys
+
+    def _best_match(self, name_sig, ingredient_sig, has_ingredients):
+        candidates = set()
+        for buckets, key in zip(self._buckets, self._band_hashes(name_sig[None, :])[0].tolist()):
+            bucket = buckets.get(key)
+            if bucket:
+                candidates.update(bucket)
+        if not candidates:
+            return None
+
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        name_sim = (self._name_sigs[ids] == name_sig).mean(axis=1)
+
+        accept = name_sim >= self.threshold
+        if has_ingredients:
+            ingredient_sim = (self._ingredient_sigs[ids] == ingredient_sig).mean(axis=1)
+            # Only veto when both sides have ingredients and names aren't near-identical
+            veto = (self._has_ingredients[ids]
+                    & (ingredient_sim < self.min_ingredient_similarity)
+                    & (name_sim < 0.9))
+            accept &= ~veto
+
+        if not accept.any():
+            return None
+
+        best = int(np.argmax(np.where(accept, name_sim, -1.0)))
+        record_id = int(ids[best])
+        return DuplicateMatch(record_id, self._names[record_id], self._sources[record_id],
+                              float(name_sim[best]))
+
+    # ----- Storage -----
+
+    def _add(self, name, source, name_sig, ingredient_sig, has_ingredients):
+        record_id = len(self._names)
+        if record_id == len(self._name_sigs):
+            self._grow()
+
+        self._names.append(name)
+        self._sources.append(source)
+        self._name_sigs[record_id] = name_sig
+        self._ingredient_sigs[record_id] = ingredient_sig
+        self._has_ingredients[record_id] = has_ingredients
+        for buckets, key in zip(self._buckets, self._band_hashes(name_sig[None, :])[0].tolist()):
+            buckets.setdefault(key, []).append(record_id)
+        return record_id
+
+    def _grow(self):
+        capacity = len(self._name_sigs) * 2
+        self._name_sigs = np.resize(self._name_sigs, (capacity, self._name_sigs.shape[1]))
+        self._ingredient_sigs = np.resize(self._ingredient_sigs,
+                                          (capacity, self._ingredient_sigs.shape[1]))
+        self._has_ingredients = np.resize(self._has_ingredients, capacity)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS records (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                source TEXT,
+                name_sig BLOB NOT NULL,
+                ingredient_sig BLOB NOT NULL,
+                has_ingredients INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS duplicates (
+                name TEXT NOT NULL,
+                source TEXT,
+                winner_id INTEGER NOT NULL REFERENCES records (id),
+                similarity REAL NOT NULL,
+                found_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        return conn
+
+    def _params(self):
+        return {
+            'num_perm': str(self.num_perm),
+            'bands': str(self.bands),
+            'ingredient_perm': str(self._ingredient_hasher.num_perm),
+            'seed': str(self.seed),
+        }
+
+    def _load(self):
+        conn = self._connect()
+        try:
+            stored = dict(conn.execute('SELECT key, value FROM meta'))
+            if stored and stored != self._params():
+                raise ValueError(f"Dedup index {self.path} was built with {stored}; "
+                                 f"delete it or use matching parameters")
+
+            rows = conn.execute(
+                'SELECT name, source, name_sig, ingredient_sig, has_ingredients '
+                'FROM records ORDER BY id'
+            ).fetchall()
+        finally:
+            conn.close()
+
+        if rows:
+            names, sources, name_sigs, ingredient_sigs, has_ingredients = zip(*rows)
+            count = len(rows)
+            capacity = max(self.INITIAL_CAPACITY, 1 << (count - 1).bit_length())
+
+            self._names = list(names)
+            self._sources = list(sources)
+            self._name_sigs = np.resize(
+                np.frombuffer(b''.join(name_sigs), dtype=np.uint32).reshape(count, -1),
+                (capacity, self.num_perm))
+            self._ingredient_sigs = np.resize(
+                np.frombuffer(b''.join(ingredient_sigs), dtype=np.uint32).reshape(count, -1),
+                (capacity, self._ingredient_hasher.num_perm))
+            self._has_ingredients = np.resize(np.array(has_ingredients, dtype=bool), capacity)
+
+            # Rebuild LSH buckets band by band from the signature matrix
+            band_keys = self._band_hashes(self._name_sigs[:count])
+            for band, buckets in enumerate(self._buckets):
+                for record_id, key in enumerate(band_keys[:, band].tolist()):
+                    buckets.setdefault(key, []).append(record_id)
+
+        self._saved_count = len(self._names)
+        logger.info(f"🔎 Loaded dedup index with {len(self)} recipes from {self.path}")
+
+    def save(self):
+        """Write records and duplicate matches added since the last save."""
+        if not self.path:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                                 self._params().items())
+                conn.executemany(
+                    'INSERT INTO records VALUES (?, ?, ?, ?, ?, ?)',
+                    ((i, self._names[i], self._sources[i],
+                      self._name_sigs[i].tobytes(), self._ingredient_sigs[i].tobytes(),
+                      int(self._has_ingredients[i]))
+                     for i in range(self._saved_count, len(self._names)))
+                )
+                conn.executemany(
+                    'INSERT INTO duplicates (name, source, winner_id, similarity) '
+                    'VALUES (?, ?, ?, ?)',
+                    self._unsaved_matches
+                )
+        finally:
+            conn.close()
+
+        self._saved_count = len(self._names)
+        self._unsaved_matches = []
@@ -0,0 +1,612 @@
+"""
+Inverted Ingredient Index
+
+Answers "which recipes use chickpeas and spinach?" without scanning every
+recipe's ' | '-joined ingredient string:
+
+- Each ingredient line is normalized to its ingredient words ("2 cups
+  baby spinach, chopped" -> baby spinach): quantities, units, prep words
+  and notes after a comma are dropped, plurals are folded.
+- Every word and adjacent word pair ("baby", "spinach", "baby spinach")
+  is a term; each term maps to a posting list of recipe doc ids, kept as
+  sorted uint32 numpy arrays.
+- AND queries intersect posting lists smallest first; OR and NOT go
+  through a boolean doc bitmap.
+- `rank_by_sale` ranks recipes by the share of their ingredients that are
+  on sale (pantry staples like salt and oil don't count against them).
+
+Recipes are added one at a time as they arrive (doc ids only grow, so
+appending keeps lists sorted); re-adding a recipe key replaces the old
+document. Saving to SQLite appends only what changed since the last save,
+as one delta-encoded, zlib-compressed segment per term; `compact()`
+merges the segments.
+
+Usage:
+    index = IngredientIndex('data/ingredient_index.sqlite')
+    index.add(recipe)
+    index.search('chickpeas AND spinach AND NOT feta')
+    index.rank_by_sale(['Boneless Chicken Breasts', 'Baby Spinach 5 oz'])
+
+    python scripts/ingredient_index.py build recipe_database.csv
+    python scripts/ingredient_index.py search "tomato OR basil, NOT cream"
+    python scripts/ingredient_index.py rank --on-sale "chicken breast, spinach, feta"
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from dedup_index import MEASURE_WORDS
+from recipe_sink import RecipeSink
+from recipe_store import recipe_key
+
+logger = logging.getLogger(__name__)
+
+# Words in an ingredient line that are not the ingredient
+NON_INGREDIENT_WORDS = MEASURE_WORDS | {
+    'can', 'cans', 'jar', 'jars', 'package', 'packages', 'pkg', 'bag', 'bags', 'box',
+    'bunch', 'bunches', 'clove', 'cloves', 'slice', 'slices', 'piece', 'pieces',
+    'stick', 'sticks', 'sprig', 'sprigs', 'handful', 'quart', 'pint', 'liter', 'litre',
+    'g', 'ml', 'l', 'x', 'each', 'whole', 'half', 'about', 'plus', 'more', 'extra',
+    'peeled', 'drained', 'rinsed', 'softened', 'melted', 'beaten', 'divided', 'cubed',
+    'grated', 'shredded', 'crushed', 'halved', 'quartered', 'thinly', 'finely',
+    'roughly', 'coarsely', 'packed', 'cooked', 'uncooked', 'room', 'temperature',
+    'into', 'in', 'at', 'as', 'a', 'an', 'per', 'lb', 'ct', 'count', 'pack',
+}
+
+# Always on hand; a recipe isn't "missing" these when ranking by sale items
+PANTRY_STAPLES = {'salt', 'pepper', 'black pepper', 'water', 'ice', 'oil', 'olive oil',
+                  'vegetable oil', 'cooking spray', 'salt pepper'}
+
+# Words whose trailing 's' is not a plural
+_SINGULAR_S = {'molasses', 'couscous', 'hummus', 'asparagus', 'swiss', 'grits', 'oats',
+               'brussels', 'lemongrass', 'citrus', 'octopus', 'watercress', 'bass'}
+
+_IRREGULAR_PLURALS = {'leaves': 'leaf', 'loaves': 'loaf', 'halves': 'half'}
+
+_PARENTHETICAL = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_WORD = re.compile(r'[a-z]+')
+_QUERY_AND = re.compile(r'\s+AND\s+|,')
+_QUERY_OR = re.compile(r'\s+OR\s+|\|')
+_QUERY_NOT = re.compile(r'^(?:NOT\s+|-)')
+
+# On-disk posting encodings: delta width byte -> numpy dtype
+_DELTA_DTYPES = {1: np.uint8, 2: np.uint16, 4: np.uint32}
+_EMPTY = np.empty(0, dtype=np.uint32)
+
+
+def singular(word):
+    """Fold common English plurals ("tomatoes" -> "tomato", "berries" -> "berry")."""
+    if len(word) <= 3 or word in _SINGULAR_S:
+        return word
+    if word in _IRREGULAR_PLURALS:
+        return _IRREGULAR_PLURALS[word]
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if word.endswith(('oes', 'ches', 'shes', 'sses', 'xes')):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def ingredient_words(line):
+    """
+    The ingredient named by one ingredient line.
+
+    Args:
+        line (str): e.g. "1 (15 oz) can chickpeas, drained and rinsed"
+
+    Returns:
+        tuple: Normalized ingredient words, e.g. ('chickpea',)
+    """
+    text = _PARENTHETICAL.sub(' ', line.lower()).split(',', 1)[0]
+    return tuple(singular(word) for word in _WORD.findall(text)
+                 if word not in NON_INGREDIENT_WORDS)
+
+
+def line_terms(words):
+    """Index terms for one ingredient: each word plus each adjacent pair."""
+    terms = set(words)
+    terms.update(f'{a} {b}' for a, b in zip(words, words[1:]))
+    return terms
+
+
+def split_ingredients(ingredients):
+    """Ingredient lines from a ' | '-joined string or a list."""
+    if not ingredients or ingredients != ingredients:  # None, '' or NaN
+        return []
+    if isinstance(ingredients, str):
+        return [line for line in ingredients.split('|') if line.strip()]
+    return [line for line in ingredients if line]
+
+
+def phrase_terms(phrase):
+    """
+    Terms that must all be present for a recipe to contain `phrase`:
+    its adjacent word pairs, or the single word.
+
+    Returns:
+        list: Terms (empty if the phrase has no ingredient words)
+    """
+    words = ingredient_words(phrase)
+    if len(words) <= 1:
+        return list(words)
+    return [f'{a} {b}' for a, b in zip(words, words[1:])]
+
+
+def encode_postings(doc_ids):
+    """Sorted doc ids -> width byte + zlib-compressed deltas in the narrowest dtype."""
+    deltas = np.diff(doc_ids.astype(np.int64), prepend=0)
+    largest = int(deltas.max()) if len(deltas) else 0
+    width = 1 if largest < (1 << 8) else 2 if largest < (1 << 16) else 4
+    return bytes([width]) + zlib.compress(deltas.astype(_DELTA_DTYPES[width]).tobytes())
+
+
+def decode_postings(blob):
+    """Inverse of encode_postings."""
+    deltas = np.frombuffer(zlib.decompress(blob[1:]), dtype=_DELTA_DTYPES[blob[0]])
+    return np.cumsum(deltas, dtype=np.uint32)
+
+
+class IngredientIndex:
+    """Incrementally built inverted index: ingredient term -> sorted recipe doc ids."""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str): SQLite file to load from / save to (None = in-memory only)
+        """
+        self.path = path
+
+        # Per document (doc id = list position)
+        self._keys = []
+        self._names = []
+        self._sources = []
+        self._lines = []          # Ingredient lines, not counting pantry staples
+        self._deleted = set()
+        self._doc_by_key = {}
+
+        self._postings = {}                 # term -> sealed sorted np.uint32 array
+        self._pending = defaultdict(list)   # term -> doc ids added since the last seal
+        self._unsaved = defaultdict(list)   # term -> doc ids added since the last save
+        self._saved_docs = 0
+        self._newly_deleted = set()
+
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._keys) - len(self._deleted)
+
+    @property
+    def vocabulary_size(self):
+        return len(self._postings.keys() | self._pending.keys())
+
+    # ===== BUILDING =====
+    def add(self, recipe):
+        """
+        Index one recipe, replacing any earlier version with the same key.
+
+        Args:
+            recipe (dict): Recipe with 'name', 'source', 'ingredients'
+                (and optionally 'source_url', part of the key)
+
+        Returns:
+            int: Doc id
+        """
+        key = recipe_key(recipe)
+        previous = self._doc_by_key.get(key)
+        if previous is not None:
+            self._deleted.add(previous)
+            self._newly_deleted.add(previous)
+
+        doc_id = len(self._keys)
+        terms = set()
+        lines = 0
+        for line in split_ingredients(recipe.get('ingredients')):
+            words = ingredient_words(line)
+            if not words:
+                continue
+            terms |= line_terms(words)
+            if ' '.join(words) not in PANTRY_STAPLES:
+                lines += 1
+
+        for term in terms:
+            self._pending[term].append(doc_id)
+            self._unsaved[term].append(doc_id)
+
+        self._keys.append(key)
+        self._names.append(recipe.get('name') or '')
+        self._sources.append(recipe.get('source'))
+        self._lines.append(lines)
+        self._doc_by_key[key] = doc_id
+        return doc_id
+
+    def add_many(self, recipes):
+        for recipe in recipes:
+            self.add(recipe)
+
+    def postings(self, term):
+        """Sorted doc ids containing `term` (deleted documents included)."""
+        pending = self._pending.pop(term, None)
+        if pending:
+            sealed = self._postings.get(term, _EMPTY)
+            self._postings[term] = np.concatenate([sealed, np.asarray(pending, dtype=np.uint32)])
+        return self._postings.get(term, _EMPTY)
+
+    # ===== QUERIES =====
+    def phrase_ids(self, phrase):
+        """Doc ids of recipes with an ingredient matching `phrase` (e.g. "olive oil")."""
+        terms = phrase_terms(phrase)
+        if not terms:
+            return _EMPTY
+        return self._intersect([self.postings(term) for term in terms])
+
+    def match_ids(self, all_of=(), any_of=(), none_of=()):
+        """
+        Doc ids of live recipes matching ingredient conditions.
+
+        Args:
+            all_of (list): Phrases or lists of alternative phrases; each entry
+                must match (a list entry matches if any alternative does)
+            any_of (list): At least one of these must match (if given)
+            none_of (list): None of these may match
+
+        Returns:
+            np.ndarray: Sorted doc ids
+        """
+        required = []
+        for entry in all_of:
+            alternatives = [entry] if isinstance(entry, str) else entry
+            required.append(self._union([self.phrase_ids(p) for p in alternatives]))
+        if any_of:
+            required.append(self._union([self.phrase_ids(p) for p in any_of]))
+
+        if required:
+            result = self._intersect(required)
+        else:
+            result = np.arange(len(self._keys), dtype=np.uint32)
+
+        excluded = [self.phrase_ids(p) for p in none_of]
+        if self._deleted:
+            excluded.append(np.fromiter(self._deleted, dtype=np.uint32))
+        if excluded and len(result):
+            result = result[~self._mask(excluded)[result]]
+        return result
+
+    def search(self, query, limit=None):
+        """
+        Recipes matching an ingredient query.
+
+        Clauses are separated by AND (or commas) and must all match;
+        alternatives within a clause are separated by OR (or '|'); a clause
+        starting with NOT (or '-') excludes. Operators are upper case so
+        ingredient names can contain "and"/"or".
+
+            "chickpeas AND spinach AND NOT feta"
+            "tomato OR cherry tomatoes, basil, -cream"
+
+        Returns:
+            list: Dicts with 'doc_id', 'recipe_key', 'name', 'source'
+        """
+        all_of, none_of = parse_query(query)
+        ids = self.match_ids(all_of=all_of, none_of=none_of)
+        if limit is not None:
+            ids = ids[:limit]
+        return [self._describe(doc_id) for doc_id in ids.tolist()]
+
+    def sale_term(self, item):
+        """
+        Index term best describing a store item ("Boneless Chicken Breasts,
+        Family Pack" -> "chicken breast"): the last word pair the index
+        knows, else its last known word (brand names are not in recipes).
+
+        Returns:
+            str: Term, or None if nothing in the item appears in any recipe
+        """
+        words = ingredient_words(item)
+        for a, b in reversed(list(zip(words, words[1:]))):
+            if len(self.postings(f'{a} {b}')):
+                return f'{a} {b}'
+        for word in reversed(words):
+            if len(self.postings(word)):
+                return word
+        return None
+
+    def rank_by_sale(self, on_sale, limit=20, min_on_sale=1):
+        """
+        Recipes you can make mostly from what's on sale.
+
+        Each recipe scores the share of its (non-staple) ingredients that
+        match a sale item; ties go to the recipe using more sale items.
+
+        Args:
+            on_sale (list): Sale item names or ingredient names
+            limit (int): Recipes to return
+            min_on_sale (int): Ignore recipes using fewer sale items than this
+
+        Returns:
+            list: Dicts with 'doc_id', 'recipe_key', 'name', 'source',
+                'on_sale' (matched sale terms), 'ingredients' and 'coverage'
+        """
+        terms = sorted({term for term in map(self.sale_term, on_sale) if term})
+        if not terms or not self._keys:
+            return []
+
+        counts = np.zeros(len(self._keys), dtype=np.int32)
+        for term in terms:
+            counts[self.postings(term)] += 1
+
+        lines = np.asarray(self._lines, dtype=np.int32)
+        matched = np.minimum(counts, np.maximum(lines, 1))
+        coverage = np.where(lines > 0, matched / np.maximum(lines, 1), 0.0)
+        eligible = counts >= min_on_sale
+        if self._deleted:
+            eligible[list(self._deleted)] = False
+
+        candidates = np.flatnonzero(eligible)
+        order = np.lexsort((-counts[candidates], -coverage[candidates]))[:limit]
+
+        ranked = []
+        for doc_id in candidates[order].tolist():
+            result = self._describe(doc_id)
+            result['on_sale'] = [term for term in terms if self._contains(term, doc_id)]
+            result['ingredients'] = int(lines[doc_id])
+            result['coverage'] = round(float(coverage[doc_id]), 3)
+            ranked.append(result)
+        return ranked
+
+    def _contains(self, term, doc_id):
+        ids = self.postings(term)
+        position = np.searchsorted(ids, doc_id)
+        return position < len(ids) and ids[position] == doc_id
+
+    def _describe(self, doc_id):
+        return {'doc_id': doc_id, 'recipe_key': self._keys[doc_id],
+                'name': self._names[doc_id], 'source': self._sources[doc_id]}
+
+    @staticmethod
+    def _intersect(lists):
+        if not lists:
+            return _EMPTY
+        lists = sorted(lists, key=len)  # Smallest first keeps every step small
+        result = lists[0]
+        for ids in lists[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+    def _mask(self, lists):
+        """Boolean doc-id bitmap of the union of posting lists."""
+        mask = np.zeros(len(self._keys), dtype=bool)
+        for ids in lists:
+            mask[ids] = True
+        return mask
+
+    def _union(self, lists):
+        lists = [ids for ids in lists if len(ids)]
+        if not lists:
+            return _EMPTY
+        if len(lists) == 1:
+            return lists[0]
+        # A bitmap pass is linear, where merging through a sort is not
+        return np.flatnonzero(self._mask(lists)).astype(np.uint32)
+
+    # ===== PERSISTENCE =====
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                recipe_key TEXT NOT NULL,
+                name TEXT,
+                source TEXT,
+                lines INTEGER NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                doc_ids BLOB NOT NULL,
+                PRIMARY KEY (term, segment)
+            );
+        """)
+        return conn
+
+    def save(self):
+        """Append documents and posting segments added since the last save."""
+        if not self.path:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        segment = self._saved_docs
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    'INSERT INTO documents (id, recipe_key, name, source, lines) VALUES (?, ?, ?, ?, ?)',
+                    ((i, self._keys[i], self._names[i], self._sources[i], self._lines[i])
+                     for i in range(self._saved_docs, len(self._keys)))
+                )
+                conn.executemany('UPDATE documents SET deleted = 1 WHERE id = ?',
+                                 ((doc_id,) for doc_id in self._newly_deleted))
+                conn.executemany(
+                    'INSERT INTO postings VALUES (?, ?, ?)',
+                    ((term, segment, encode_postings(np.asarray(ids, dtype=np.uint32)))
+                     for term, ids in self._unsaved.items())
+                )
+        finally:
+            conn.close()
+
+        self._saved_docs = len(self._keys)
+        self._unsaved.clear()
+        self._newly_deleted.clear()
+
+    def compact(self):
+        """Rewrite the file with one segment per term, dropping deleted documents' ids."""
+        if not self.path:
+            return
+        self.save()
+
+        deleted = np.fromiter(sorted(self._deleted), dtype=np.uint32)
+        for term in list(self._postings.keys() | self._pending.keys()):
+            ids = self.postings(term)
+            if len(deleted):
+                ids = np.setdiff1d(ids, deleted, assume_unique=True)
+            if len(ids):
+                self._postings[term] = ids
+            else:
+                del self._postings[term]
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM postings')
+                conn.executemany('INSERT INTO postings VALUES (?, 0, ?)',
+                                 ((term, encode_postings(ids)) for term, ids in self._postings.items()))
+            conn.execute('VACUUM')
+        finally:
+            conn.close()
+        logger.info(f"🗜️ Compacted ingredient index to {self.vocabulary_size} terms")
+
+    def _load(self):
+        conn = self._connect()
+        try:
+            documents = conn.execute(
+                'SELECT recipe_key, name, source, lines, deleted FROM documents ORDER BY id'
+            ).fetchall()
+            segments = defaultdict(list)
+            for term, blob in conn.execute('SELECT term, doc_ids FROM postings ORDER BY term, segment'):
+                segments[term].append(decode_postings(blob))
+        finally:
+            conn.close()
+
+        for doc_id, (key, name, source, lines, deleted) in enumerate(documents):
+            self._keys.append(key)
+            self._names.append(name)
+            self._sources.append(source)
+            self._lines.append(lines)
+            if deleted:
+                self._deleted.add(doc_id)
+            else:
+                self._doc_by_key[key] = doc_id
+
+        # Segments hold increasing doc ids, so concatenating keeps lists sorted
+        self._postings = {term: parts[0] if len(parts) == 1 else np.concatenate(parts)
+                          for term, parts in segments.items()}
+        self._saved_docs = len(self._keys)
+        logger.info(f"🥕 Loaded ingredient index with {len(self)} recipes, "
+                    f"{self.vocabulary_size} terms from {self.path}")
+
+
+def parse_query(query):
+    """
+    Split an ingredient query into match_ids() arguments.
+
+    Returns:
+        tuple: (all_of, none_of), where each all_of entry is a list of
+            alternative phrases
+    """
+    all_of, none_of = [], []
+    for clause in _QUERY_AND.split(query):
+        clause = clause.strip()
+        if not clause:
+            continue
+        negated = _QUERY_NOT.match(clause)
+        alternatives = [alt.strip() for alt in _QUERY_OR.split(_QUERY_NOT.sub('', clause))
+                        if alt.strip()]
+        if negated:
+            none_of.extend(alternatives)
+        elif alternatives:
+            all_of.append(alternatives)
+    return all_of, none_of
+
+
+class IngredientIndexSink(RecipeSink):
+    """Adds recipes to an IngredientIndex as they stream in; saves periodically."""
+
+    def __init__(self, path, save_every=1000):
+        super().__init__(path)
+        self.index = IngredientIndex(path)
+        self._save_every = save_every
+
+    def _write(self, row):
+        self.index.add(row)
+        if (self.count + 1) % self._save_every == 0:
+            self.index.save()
+
+    def close(self):
+        if self.index is not None:
+            self.index.save()
+            self.index = None
+
+
+# ===== MAIN EXECUTION =====
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import pandas as pd
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    parser = argparse.ArgumentParser(description='Build and query the ingredient index')
+    parser.add_argument('--index', default=os.path.join(os.getenv('DATA_DIR', 'data'),
+                                                        'ingredient_index.sqlite'))
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Index recipes from a CSV (incremental)')
+    build.add_argument('csv')
+    build.add_argument('--compact', action='store_true', help='Merge segments afterwards')
+
+    search = commands.add_parser('search', help='AND/OR/NOT ingredient query')
+    search.add_argument('query')
+    search.add_argument('--limit', type=int, default=20)
+
+    rank = commands.add_parser('rank', help="Recipes you can make with what's on sale")
+    rank.add_argument('--on-sale', default='', help='Comma-separated sale items')
+    rank.add_argument('--coupons-csv', help='Coupon CSV from southern_savers_scraper.py')
+    rank.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    index = IngredientIndex(args.index)
+
+    if args.command == 'build':
+        df = pd.read_csv(args.csv)
+        df = df.astype(object).where(df.notna(), None)
+        start = time.perf_counter()
+        index.add_many(df.to_dict('records'))
+        index.save()
+        if args.compact:
+            index.compact()
+        print(f"✅ Indexed {len(df)} recipes in {time.perf_counter() - start:.1f}s "
+              f"({len(index)} total, {index.vocabulary_size} terms)")
+
+    elif args.command == 'search':
+        start = time.perf_counter()
+        results = index.search(args.query)
+        elapsed = (time.perf_counter() - start) * 1000
+        for result in results[:args.limit]:
+            print(f"  {result['name']:<50}{result['source'] or ''}")
+        print(f"\n{len(results)} recipes in {elapsed:.1f} ms")
+
+    else:
+        items = [item.strip() for item in args.on_sale.split(',') if item.strip()]
+        if args.coupons_csv:
+            coupons = pd.read_csv(args.coupons_csv)
+            column = ('Matched_Ingredient__c' if 'Matched_Ingredient__c' in coupons.columns
+                      else 'Item_Name__c')
+            items += coupons[column].dropna().astype(str).tolist()
+        for result in index.rank_by_sale(items, limit=args.limit):
+            print(f"  {result['coverage']:>5.0%}  {result['name']:<45}"
+                  f"on sale: {', '.join(result['on_sale'])}")
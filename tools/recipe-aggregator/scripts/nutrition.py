@@ -0,0 +1,150 @@
+"""
+Batched Nutrition Normalization
+
+Turns a page of raw API nutrient payloads into per-serving recipe columns
+in one vectorized pass:
+
+1. Each payload is reduced to {source code: (quantity, unit)}
+2. Quantities are converted to the column's unit and packed into an
+   (n_recipes x n_nutrients) NumPy matrix
+3. Division by servings, rounding and the health flags run column-wise
+
+Which API code feeds which column (and in what unit) lives in `NUTRIENTS`;
+adding a nutrient is one new row there plus the column in
+recipe_sink.RECIPE_COLUMNS.
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import numpy as np
+
+from recipe_sink import (
+    DIABETIC_FRIENDLY_MAX_SUGAR_G,
+    HEART_HEALTHY_MAX_SODIUM_MG,
+    WEEKNIGHT_MAX_MINUTES,
+)
+
+
+class Nutrient:
+    """One output column and the code each source reports it under."""
+
+    __slots__ = ('column', 'unit', 'decimals', 'codes')
+
+    def __init__(self, column, unit, decimals, **codes):
+        """
+        Args:
+            column (str): Recipe column name
+            unit (str): Unit the column is stored in
+            decimals (int): Rounding for the per-serving value (None = whole
+                number, truncated)
+            **codes: Source name -> nutrient code/name in that API's payload
+        """
+        self.column = column
+        self.unit = unit
+        self.decimals = decimals
+        self.codes = codes
+
+
+NUTRIENTS = (
+    Nutrient('calories', 'kcal', None, Edamam='ENERC_KCAL', Spoonacular='Calories'),
+    Nutrient('protein_g', 'g', 1, Edamam='PROCNT', Spoonacular='Protein'),
+    Nutrient('carbs_g', 'g', 1, Edamam='CHOCDF', Spoonacular='Carbohydrates'),
+    Nutrient('fat_g', 'g', 1, Edamam='FAT', Spoonacular='Fat'),
+    Nutrient('fiber_g', 'g', 1, Edamam='FIBTG', Spoonacular='Fiber'),
+    Nutrient('sugar_g', 'g', 1, Edamam='SUGAR', Spoonacular='Sugar'),
+    Nutrient('sodium_mg', 'mg', None, Edamam='NA', Spoonacular='Sodium'),
+)
+
+# Every unit expressed in a base unit of its dimension (grams or kcal)
+UNIT_SCALE = {
+    'kg': 1000.0, 'g': 1.0, 'mg': 1e-3, 'µg': 1e-6, 'mcg': 1e-6, 'ug': 1e-6,
+    'kcal': 1.0, 'cal': 1.0, 'kj': 1 / 4.184,
+}
+
+
+def unit_factor(from_unit, to_unit):
+    """
+    Multiplier converting a quantity from `from_unit` to `to_unit`.
+
+    Unknown or missing source units are assumed to already match.
+    """
+    if not from_unit:
+        return 1.0
+    source = UNIT_SCALE.get(from_unit.strip().lower())
+    target = UNIT_SCALE[to_unit.lower()]
+    return source / target if source is not None else 1.0
+
+
+def nutrient_matrix(payloads, source):
+    """
+    Pack nutrient payloads into a float matrix in each column's unit.
+
+    Args:
+        payloads (list): Per recipe, {code: (quantity, unit)}
+        source (str): Source name selecting the codes in NUTRIENTS
+
+    Returns:
+        np.ndarray: (len(payloads), len(NUTRIENTS)) totals; missing values are 0
+    """
+    codes = [(nutrient.codes.get(source), nutrient.unit) for nutrient in NUTRIENTS]
+    matrix = np.zeros((len(payloads), len(NUTRIENTS)), dtype=np.float64)
+
+    for row, payload in enumerate(payloads):
+        for col, (code, unit) in enumerate(codes):
+            entry = payload.get(code)
+            if entry is not None:
+                quantity, from_unit = entry
+                matrix[row, col] = (quantity or 0) * unit_factor(from_unit, unit)
+    return matrix
+
+
+def normalize_nutrition(payloads, servings, source, prep_minutes=None, cook_minutes=None):
+    """
+    Per-serving nutrition, total time and health flags for a page of recipes.
+
+    Args:
+        payloads (list): Per recipe, {code: (quantity, unit)} for the whole recipe
+        servings (list): Servings per recipe (missing/zero treated as 1)
+        source (str): Source name selecting the codes in NUTRIENTS
+        prep_minutes (list): Prep time per recipe (None = all zero)
+        cook_minutes (list): Cook time per recipe (None = all zero)
+
+    Returns:
+        dict: Column name -> list of Python values, one per recipe
+    """
+    count = len(payloads)
+    totals = nutrient_matrix(payloads, source)
+
+    servings = np.asarray([s or 0 for s in servings], dtype=np.float64)
+    servings = np.where(servings > 0, servings, 1.0)
+    per_serving = totals / servings[:, None]
+
+    columns = {}
+    for col, nutrient in enumerate(NUTRIENTS):
+        values = per_serving[:, col]
+        if nutrient.decimals is None:
+            columns[nutrient.column] = np.trunc(values).astype(np.int64).tolist()
+        else:
+            columns[nutrient.column] = np.round(values, nutrient.decimals).tolist()
+
+    prep = np.asarray(prep_minutes if prep_minutes is not None else np.zeros(count),
+                      dtype=np.float64)
+    cook = np.asarray(cook_minutes if cook_minutes is not None else np.zeros(count),
+                      dtype=np.float64)
+    total_time = np.nan_to_num(prep) + np.nan_to_num(cook)
+
+    sodium = per_serving[:, _column_index('sodium_mg')]
+    sugar = per_serving[:, _column_index('sugar_g')]
+    columns['total_time_minutes'] = total_time.astype(np.int64).tolist()
+    columns['is_heart_healthy'] = (np.trunc(sodium) < HEART_HEALTHY_MAX_SODIUM_MG).tolist()
+    columns['is_diabetic_friendly'] = (np.round(sugar, 1) < DIABETIC_FRIENDLY_MAX_SUGAR_G).tolist()
+    columns['is_weeknight_friendly'] = (total_time <= WEEKNIGHT_MAX_MINUTES).tolist()
+    return columns
+
+
+def _column_index(column):
+    for index, nutrient in enumerate(NUTRIENTS):
+        if nutrient.column == column:
+            return index
+    raise KeyError(column)
@@ -0,0 +1,344 @@
+"""
+Pipeline Profiler
+
+Per-source, per-stage instrumentation for RecipeAggregator runs:
+
+    throttle   - waiting on the source's token bucket (including holds after 429/5xx)
+    network    - HTTP round trips (also feeds the latency histogram)
+    backoff    - sleeping before retrying a connection error
+    cache      - response cache lookups and writes
+    decode     - JSON decoding
+    normalize  - mapping raw records to the recipe schema
+    dedup      - exact + near-duplicate checks
+    write      - computed fields, stats and the output sink
+    checkpoint - checkpoint and dedup index saves
+    export     - closing the output sink(s), or save_to_csv/save_to_parquet
+
+Page latency (fetch_page from start to records, retries and throttle
+waits included) is recorded separately from single-request latency; the
+two differ most when a source is being rate limited.
+
+Stage seconds are summed over threads, so with concurrent sources or
+workers they can add up to more than the wall time; compare them with
+each other, and use `wall_seconds` and `records_per_second` for
+throughput. A disabled profiler turns every hook into a no-op.
+
+Usage:
+    python scripts/recipe_aggregator.py --profile                   # JSON report
+    python scripts/recipe_aggregator.py --profile --profiler cprofile
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import bisect
+import cProfile
+import datetime
+import json
+import logging
+import os
+import pstats
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('throttle', 'network', 'backoff', 'cache', 'decode', 'normalize', 'dedup', 'write',
+          'checkpoint', 'export')
+
+# Request latency histogram bucket upper bounds (ms)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+PIPELINE = 'pipeline'  # Pseudo-source for work not tied to one API
+
+
+class _Stage:
+    """Times one `with` block into a profiler stage."""
+
+    __slots__ = ('profiler', 'source', 'stage', 'start')
+
+    def __init__(self, profiler, source, stage):
+        self.profiler = profiler
+        self.source = source
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.source, self.stage, time.perf_counter() - self.start)
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+class _SourceStats:
+    def __init__(self):
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+        self.latencies_ms = []
+        self.page_ms = []
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.status = defaultdict(int)
+        self.bytes = 0
+        self.errors = 0
+        self.cache = defaultdict(int)
+        self.records = 0
+        self.started = None
+        self.wall_seconds = 0.0
+
+
+class PipelineProfiler:
+    """Thread-safe stage timers, request latency histograms and throughput counters."""
+
+    def __init__(self, enabled=True):
+        """
+        Args:
+            enabled (bool): False makes every hook a no-op (the aggregator's default)
+        """
+        self.enabled = enabled
+        self._sources = defaultdict(_SourceStats)
+        self._lock = threading.Lock()
+        self._started_at = datetime.datetime.now()
+        self._start = time.perf_counter()
+
+    # ===== HOOKS =====
+    def stage(self, source, stage):
+        """Context manager timing a block of `source`'s work into `stage`."""
+        if not self.enabled:
+            return _NO_STAGE
+        return _Stage(self, source, stage)
+
+    def add(self, source, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._sources[source]
+            stats.stage_seconds[stage] += seconds
+            stats.stage_calls[stage] += 1
+
+    def record_request(self, source, seconds, status=None, size=0):
+        """
+        One HTTP round trip.
+
+        Args:
+            source (str): Source name
+            seconds (float): Time from sending the request to having the body
+            status (int): HTTP status (None for a connection-level failure)
+            size (int): Response body bytes
+        """
+        if not self.enabled:
+            return
+        ms = seconds * 1000
+        with self._lock:
+            stats = self._sources[source]
+            stats.stage_seconds['network'] += seconds
+            stats.stage_calls['network'] += 1
+            stats.latencies_ms.append(ms)
+            stats.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+            stats.status[str(status) if status is not None else 'error'] += 1
+            stats.bytes += size
+            if status is None or status >= 400:
+                stats.errors += 1
+
+    def record_page(self, source, seconds):
+        """One fetch_page call, retries and throttle waits included."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._sources[source].page_ms.append(seconds * 1000)
+
+    def record_cache(self, source, outcome):
+        """Count a response cache 'hit', 'revalidated' or 'miss'."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._sources[source].cache[outcome] += 1
+
+    def source_started(self, source):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._sources[source].started = time.perf_counter()
+
+    def source_finished(self, source, records):
+        """A source's run ended with `records` new recipes."""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._sources[source]
+            if stats.started is not None:
+                stats.wall_seconds += time.perf_counter() - stats.started
+                stats.started = None
+            stats.records += records
+
+    # ===== REPORT =====
+    def report(self):
+        """
+        Structured summary of everything recorded so far.
+
+        Returns:
+            dict: JSON-serializable report (`sources` per source, `stages`
+                summed over sources, `totals`)
+        """
+        with self._lock:
+            wall = time.perf_counter() - self._start
+            sources = {name: self._source_report(stats) for name, stats in self._sources.items()}
+            latencies = [ms for stats in self._sources.values() for ms in stats.latencies_ms]
+            pages = [ms for stats in self._sources.values() for ms in stats.page_ms]
+
+        stages = defaultdict(float)
+        for source in sources.values():
+            for stage, entry in source['stages'].items():
+                stages[stage] += entry['seconds']
+
+        requests = sum(source['requests']['count'] for source in sources.values())
+        records = sum(source['records'] for source in sources.values())
+        return {
+            'started_at': self._started_at.isoformat(timespec='seconds'),
+            'wall_seconds': round(wall, 3),
+            'totals': {
+                'records': records,
+                'records_per_second': round(records / wall, 2) if wall else 0.0,
+                'requests': requests,
+                'bytes': sum(source['requests']['bytes'] for source in sources.values()),
+                'request_latency_ms': _percentiles(latencies),
+                'page_latency_ms': _percentiles(pages),
+            },
+            'stages': {stage: round(stages[stage], 4) for stage in STAGES if stage in stages},
+            'sources': sources,
+        }
+
+    @staticmethod
+    def _source_report(stats):
+        latencies = stats.latencies_ms
+        labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            'wall_seconds': round(stats.wall_seconds, 3),
+            'records': stats.records,
+            'records_per_second': (round(stats.records / stats.wall_seconds, 2)
+                                   if stats.wall_seconds else 0.0),
+            'stages': {stage: {'seconds': round(stats.stage_seconds[stage], 4),
+                               'calls': stats.stage_calls[stage]}
+                       for stage in STAGES if stage in stats.stage_calls},
+            'requests': {
+                'count': len(latencies),
+                'errors': stats.errors,
+                'bytes': stats.bytes,
+                'status': dict(stats.status),
+                'latency_ms': {**_percentiles(latencies),
+                               'histogram': dict(zip(labels, stats.histogram))},
+            },
+            'pages': {'count': len(stats.page_ms), 'latency_ms': _percentiles(stats.page_ms)},
+            'cache': dict(stats.cache),
+        }
+
+    def write(self, path):
+        """Write report() as JSON to `path` (parent directories created)."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def log_summary(self):
+        """One log line per stage, slowest first."""
+        report = self.report()
+        totals = report['totals']
+        logger.info(f"⏱️  Profile: {report['wall_seconds']:.1f}s wall, {totals['records']} recipes "
+                    f"({totals['records_per_second']:.1f}/s), {totals['requests']} requests, "
+                    f"{totals['bytes'] / 1024 / 1024:.1f} MB")
+        for stage, seconds in sorted(report['stages'].items(), key=lambda item: -item[1]):
+            logger.info(f"   {stage:<11}{seconds:>9.3f}s")
+
+
+def _percentiles(samples_ms):
+    """p50/p95/p99/max of a list of millisecond samples (zeros when empty)."""
+    samples = sorted(samples_ms)
+    if len(samples) >= 2:
+        cuts = statistics.quantiles(samples, n=100, method='inclusive')
+        values = {'p50': cuts[49], 'p95': cuts[94], 'p99': cuts[98], 'max': samples[-1]}
+    else:
+        value = samples[0] if samples else 0.0
+        values = {'p50': value, 'p95': value, 'p99': value, 'max': value}
+    return {name: round(value, 2) for name, value in values.items()}
+
+
+class CodeProfiler:
+    """
+    Optional function-level profile around a whole run: cProfile (standard
+    library) or pyinstrument (if installed).
+
+    cProfile only sees the thread that enables it, so every thread started
+    while profiling gets its own profile and they are merged into one
+    .prof file. pyinstrument samples the main thread only.
+    """
+
+    def __init__(self, kind, path):
+        """
+        Args:
+            kind (str): 'cprofile' or 'pyinstrument'
+            path (str): Output path without extension (.prof / .html added)
+        """
+        self.kind = kind
+        self.path = path
+        self._profiler = None
+        self._thread_profiles = []
+
+    def start(self):
+        if self.kind == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                logger.warning("⚠️  pyinstrument not installed (pip install pyinstrument); "
+                               "using cProfile instead")
+                self.kind = 'cprofile'
+            else:
+                self._profiler = Profiler()
+                self._profiler.start()
+                return self
+
+        threading.setprofile(self._profile_thread)
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        return self
+
+    def _profile_thread(self, frame, event, arg):
+        # First profile event in a new thread: swap in a per-thread cProfile
+        profile = cProfile.Profile()
+        self._thread_profiles.append(profile)
+        profile.enable()
+
+    def stop(self):
+        """Stop profiling and write the output file; returns its path."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if self.kind == 'pyinstrument':
+            self._profiler.stop()
+            path = self.path + '.html'
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self._profiler.output_html())
+        else:
+            self._profiler.disable()
+            threading.setprofile(None)
+            stats = pstats.Stats(self._profiler)
+            for profile in self._thread_profiles:
+                profile.create_stats()
+                if profile.stats:
+                    stats.add(profile)
+            path = self.path + '.prof'
+            stats.dump_stats(path)
+            logger.info(f"🔬 Merged cProfile data from {len(self._thread_profiles)} worker threads")
+        logger.info(f"🔬 {self.kind} output saved to {path}")
+        return path
@@ -0,0 +1,349 @@
+"""
+Rate Limiting Helpers
+
+Token buckets and the shared request scheduler that keep every API source
+under its provider's polite request rate and daily quota.
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import datetime
+import email.utils
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+
+from http_session import get_session
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    Each request takes one token; callers block until one is available.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum burst size (defaults to one second of tokens)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1, rate))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._held_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens without blocking.
+
+        Returns:
+            float: 0 if acquired, otherwise seconds until enough tokens exist
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._held_until:
+                return self._held_until - now
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` are available, then take them."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0:
+                return
+            time.sleep(wait)
+
+    def hold(self, seconds):
+        """Stop handing out tokens for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._held_until = max(self._held_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+class QuotaExceeded(Exception):
+    """Raised when a source has used up its daily request quota."""
+
+
+class SourcePolicy:
+    """
+    Pacing rules for one API source.
+
+    Args:
+        requests_per_minute (float): Sustained request rate
+        daily_quota (int): Maximum requests per calendar day (None = unlimited)
+        burst (int): Requests allowed back-to-back before pacing kicks in
+    """
+
+    def __init__(self, requests_per_minute, daily_quota=None, burst=1):
+        self.requests_per_minute = requests_per_minute
+        self.daily_quota = daily_quota
+        self.burst = burst
+
+
+# Free-tier limits (see README "API Rate Limits")
+DEFAULT_POLICIES = {
+    'TheMealDB': SourcePolicy(requests_per_minute=600, burst=10),
+    'Edamam': SourcePolicy(requests_per_minute=10),          # 10,000/month overall
+    'Spoonacular': SourcePolicy(requests_per_minute=60, daily_quota=150),
+}
+
+
+class RequestScheduler:
+    """
+    Central pacing and retry layer shared by every aggregator source.
+
+    Owns one token bucket and one daily counter per source, so sources can
+    run concurrently while each stays within its own budget. Requests that
+    come back 429/503 (or fail at the connection level) are retried with
+    exponential backoff, honoring `Retry-After` when the server sends it.
+
+    The daily counter only keeps requests the API actually served: an
+    attempt that never connected or came back 429/5xx is refunded. With a
+    `usage_path` the counter is saved per calendar day, so a restart (or
+    `--resume`) on the same day carries on from today's usage.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, policies=None, max_retries=4, backoff_base=1.0, max_backoff=60.0,
+                 session=None, profiler=None, usage_path=None):
+        """
+        Args:
+            policies (dict): Source name -> SourcePolicy (defaults to DEFAULT_POLICIES)
+            max_retries (int): Retries per request after the first attempt
+            backoff_base (float): First retry delay in seconds (doubles each retry)
+            max_backoff (float): Upper bound on any single retry delay
+            session (requests.Session): Keep-alive session for all sources
+                (default: http_session.get_session())
+            profiler (PipelineProfiler): Records throttle waits, round trips
+                and backoff sleeps (None = off)
+            usage_path (str): JSON file holding today's request counts
+                (None = in memory only, reset on every start)
+        """
+        self.session = session or get_session()
+        self.profiler = profiler
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+
+        self._buckets = {}
+        self._policies = {}
+        self._usage = {}
+        self._sent = {}  # Served requests since start, per source (never reset)
+        self._usage_day = datetime.date.today()
+        self._lock = threading.Lock()
+        self.usage_path = usage_path
+        self._load_usage()
+
+        for source, policy in (policies or DEFAULT_POLICIES).items():
+            self.register(source, policy)
+
+    def register(self, source, policy):
+        """Add or replace the pacing policy for a source."""
+        with self._lock:
+            self._policies[source] = policy
+            self._buckets[source] = TokenBucket(
+                policy.requests_per_minute / 60.0, capacity=policy.burst
+            )
+            self._usage.setdefault(source, 0)
+            self._sent.setdefault(source, 0)
+
+    def remaining_quota(self, source):
+        """Requests left today for `source` (None if unlimited)."""
+        with self._lock:
+            self._roll_day()
+            quota = self._policies[source].daily_quota
+            if quota is None:
+                return None
+            return max(0, quota - self._usage.get(source, 0))
+
+    def usage(self):
+        """Requests issued today, per source."""
+        with self._lock:
+            self._roll_day()
+            return dict(self._usage)
+
+    def requests_sent(self, source):
+        """
+        Requests the API has served for `source` since this scheduler started,
+        retries included (attempts refunded as unserved are not counted).
+        Callers diff it around a call to see whether it reached the API.
+        """
+        with self._lock:
+            return self._sent.get(source, 0)
+
+    def _roll_day(self):
+        today = datetime.date.today()
+        if today != self._usage_day:
+            self._usage = {source: 0 for source in self._usage}
+            self._usage_day = today
+
+    def _reserve(self, source):
+        """Count one request against the daily quota or raise QuotaExceeded."""
+        with self._lock:
+            self._roll_day()
+            quota = self._policies[source].daily_quota
+            if quota is not None and self._usage[source] >= quota:
+                raise QuotaExceeded(f"{source} daily quota of {quota} requests used up")
+            self._usage[source] += 1
+            self._sent[source] += 1
+            if quota is not None:
+                self._save_usage()
+
+    def _refund(self, source):
+        """Give back a reserved request the API did not serve."""
+        with self._lock:
+            self._roll_day()
+            self._usage[source] = max(0, self._usage[source] - 1)
+            self._sent[source] -= 1
+            if self._policies[source].daily_quota is not None:
+                self._save_usage()
+
+    # ===== PERSISTENCE =====
+    def _load_usage(self):
+        """Pick up today's counts from usage_path; other days' counts are ignored."""
+        if not self.usage_path or not os.path.exists(self.usage_path):
+            return
+        try:
+            with open(self.usage_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Ignoring unreadable API usage file {self.usage_path}: {e}")
+            return
+        if saved.get('day') == self._usage_day.isoformat():
+            self._usage.update({source: int(count) for source, count in saved.get('usage', {}).items()})
+
+    def _save_usage(self):
+        """Atomically write today's counts (caller holds self._lock)."""
+        if not self.usage_path:
+            return
+        os.makedirs(os.path.dirname(self.usage_path) or '.', exist_ok=True)
+        tmp_path = self.usage_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'day': self._usage_day.isoformat(), 'usage': self._usage}, f)
+        os.replace(tmp_path, self.usage_path)
+
+    def _retry_delay(self, attempt, response=None):
+        """Seconds to wait before retry number `attempt` (0-based)."""
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+
+        delay = min(self.backoff_base * (2 ** attempt), self.max_backoff)
+        return delay + random.uniform(0, delay * 0.1)
+
+    def get(self, source, url, **kwargs):
+        """
+        Paced, retried GET on behalf of `source`.
+
+        Args:
+            source (str): Registered source name
+            url (str): Request URL
+            **kwargs: Passed through to session.get (params, timeout, headers...)
+
+        Returns:
+            requests.Response: Successful response
+
+        Raises:
+            QuotaExceeded: Source has no daily quota left
+            requests.RequestException: Request still failing after all retries
+        """
+        if source not in self._buckets:
+            raise KeyError(f"No rate limit policy registered for source '{source}'")
+
+        kwargs.setdefault('timeout', 10)
+        bucket = self._buckets[source]
+
+        profiler = self.profiler
+        for attempt in range(self.max_retries + 1):
+            self._reserve(source)
+            start = time.perf_counter()
+            bucket.acquire()
+            sent = time.perf_counter()
+            if profiler is not None:
+                profiler.add(source, 'throttle', sent - start)
+
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if profiler is not None:
+                    profiler.record_request(source, time.perf_counter() - sent)
+                # A read timeout may still have been served; a failed connect never was
+                if isinstance(e, requests.ConnectionError):
+                    self._refund(source)
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(attempt)
+                logger.warning(f"{source}: {e.__class__.__name__}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                if profiler is not None:
+                    profiler.add(source, 'backoff', delay)
+                continue
+
+            if profiler is not None:
+                profiler.record_request(source, time.perf_counter() - sent,
+                                        response.status_code, len(response.content))
+
+            if response.status_code in self.RETRY_STATUSES:
+                # Throttled or failed server-side: not served, so not counted
+                self._refund(source)
+            if response.status_code in self.RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response)
+                logger.warning(f"{source}: HTTP {response.status_code}, retrying in {delay:.1f}s")
+                # Back off every worker for this source, not just this request
+                bucket.hold(delay)
+                continue
+
+            response.raise_for_status()
+            return response
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date).
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing/invalid
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    now = datetime.datetime.now(retry_at.tzinfo)
+    return max(0.0, (retry_at - now).total_seconds())
@@ -8,14 +8,33 @@ Author: Abby (Portfolio Project)
 Date: December 2025
 """
 
-import requests
-import pandas as pd
-import time
 from tqdm import tqdm
 import os
 from dotenv import load_dotenv
+import argparse
+import functools
 import hashlib
+import json
 import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+
+from api_fixtures import FixtureRecorder
+from checkpoint import Checkpoint
+from dedup_index import NearDuplicateIndex
+from http_session import create_session
+from ingredient_index import IngredientIndexSink
+from pipeline_profiler import PIPELINE, CodeProfiler, PipelineProfiler
+from rate_limiter import QuotaExceeded, RequestScheduler
+from recipe_parquet import write_parquet
+from recipe_sink import RecipeStats, TeeSink, add_computed_fields, open_sink
+from recipe_sources import SOURCES, TheMealDBSource
+from recipe_table import RecipeTable
+from request_coalescer import RequestCoalescer
+from response_cache import ResponseCache
 
 # Load environment variables
 load_dotenv()
@@ -32,139 +51,381 @@ class RecipeAggregator:
     """
     Aggregates recipes from multiple free APIs.
     
-    Supported sources:
+    Supported sources (plugins in recipe_sources.py):
     - TheMealDB (unlimited, no key needed)
     - Edamam (10,000/month free tier)
     - Spoonacular (150/day free tier)
     """
     
-    def __init__(self):
-        self.recipes = []
-        self.seen_names = set()  # For deduplication
-        
-        # API Keys from environment
-        self.edamam_id = os.getenv('EDAMAM_APP_ID')
-        self.edamam_key = os.getenv('EDAMAM_APP_KEY')
-        self.spoonacular_key = os.getenv('SPOONACULAR_API_KEY')
+    def __init__(self, mealdb_base_url=None, scheduler=None, cache=None, checkpoint=None,
+                 sink=None, dedup_index=None, profiler=None, allow_refetch=False,
+                 lookups=None):
+        """
+        Args:
+            mealdb_base_url (str): Override TheMealDB endpoint (benchmarks/stubs)
+            scheduler (RequestScheduler): Shared pacing/retry layer for all sources
+            cache (ResponseCache): On-disk response cache (None = always fetch)
+            checkpoint (Checkpoint): Persist progress after every batch (None = off)
+            sink (RecipeSink): Stream recipes to disk as they arrive instead of
+                keeping them in self.recipes
+            dedup_index (NearDuplicateIndex): Near-duplicate index, optionally
+                persisted between runs (default: fresh in-memory index)
+            profiler (PipelineProfiler): Per-source, per-stage timings (default: off)
+            allow_refetch (bool): Pass through a record the dedup index already
+                holds from the same source under the same name, instead of
+                skipping it (incremental sync diffs it against the store)
+            lookups (RequestCoalescer): TheMealDB meal lookups, shared by every
+                TheMealDB run on this aggregator (default: a fresh one; pass
+                one in to share it across aggregators, e.g. sync cycles)
+        """
+        self.recipes = RecipeTable()  # Compact columnar storage, iterates as dicts
+        self.seen_names = set()  # Exact-match fast path for deduplication
+        self.dedup_index = dedup_index or NearDuplicateIndex()
+        self.allow_refetch = allow_refetch
+        self._dedup_lock = threading.Lock()  # Sources may run concurrently
+        
+        # Output: streamed to `sink` when set, otherwise kept in self.recipes
+        self.sink = sink
+        self.stats = RecipeStats()
+        self._record_lock = threading.Lock()
+        self.scheduler = scheduler or RequestScheduler()
+        self.cache = cache
+        
+        # Instrumentation: a disabled profiler makes every hook a no-op
+        self.profiler = profiler or PipelineProfiler(enabled=False)
+        if profiler is not None and self.scheduler.profiler is None:
+            self.scheduler.profiler = profiler
+        
+        # Checkpointing: per-source resume cursors + recipes already committed
+        self.checkpoint = checkpoint
+        self._cursors = {}
+        self._uncommitted = []  # Recipes added since the last checkpoint save
+        self._checkpoint_lock = threading.Lock()
+        self.unfinished = set()  # Sources that stopped early (quota, errors); resumable
+        
+        # Overridable so benchmarks can point at a local stub server
+        # (API keys are read from the environment by each source plugin)
+        self.mealdb_base_url = mealdb_base_url or TheMealDBSource.BASE_URL
+        self.lookups = lookups if lookups is not None else RequestCoalescer()
         
         logger.info("🍳 Recipe Aggregator initialized")
     
-    def deduplicate_recipe(self, name):
+    def deduplicate_recipe(self, name, ingredients=None, source=None):
         """
-        Check if recipe name has already been seen.
-        Uses normalized name (lowercase, no spaces) for comparison.
+        Check if a recipe (or a near-duplicate of it) has already been seen.
+        
+        Exact matches on the normalized name (lowercase, no spaces/hyphens)
+        are answered from a set; everything else goes to the MinHash/LSH
+        near-duplicate index, which also catches variants like
+        "Chicken Tikka-Masala (Easy)".
         
         Args:
             name (str): Recipe name to check
+            ingredients (str | list): Ingredient lines, used to tell apart
+                different dishes with similar names
+            source (str): Source the record came from
             
         Returns:
             bool: True if duplicate, False if new
         """
-        # Create hash of normalized name
         normalized = name.lower().strip().replace(' ', '').replace('-', '')
         
-        if normalized in self.seen_names:
-            return True
+        with self._dedup_lock:
+            if normalized in self.seen_names:
+                return True
+            
+            match = self.dedup_index.check_and_add(name, ingredients, source)
+            if match is not None:
+                if self.allow_refetch and match.name == name and match.source == source:
+                    self.seen_names.add(normalized)  # The same record again
+                    return False
+                if match.name == name:
+                    self.seen_names.add(normalized)  # Known from a previous run
+                logger.debug(f"Near-duplicate: '{name}' ({source}) ~ {match}")
+                return True
+            
+            self.seen_names.add(normalized)
+            return False
+    
+    def _add_recipe(self, recipe, committed=False):
+        """
+        Accept one normalized recipe: derive computed flags, update running
+        stats and hand it to the sink (or keep it in memory without one).
+        
+        Args:
+            recipe (dict): Normalized recipe
+            committed (bool): Already in the checkpoint (replayed on resume)
+        """
+        add_computed_fields(recipe)
         
-        self.seen_names.add(normalized)
-        return False
+        with self._record_lock:
+            self.stats.update(recipe)
+            
+            if self.sink is not None:
+                self.sink.write(recipe)
+            else:
+                self.recipes.append(recipe)
+            
+            if self.checkpoint is not None and not committed:
+                self._uncommitted.append(recipe)
     
-    # ===== SOURCE 1: TheMealDB =====
-    def fetch_from_mealdb(self, num_recipes=100):
+    def close(self):
+        """Flush and close the output sink (if any) and persist the dedup index."""
+        self.dedup_index.save()
+        if self.sink is not None:
+            with self.profiler.stage(PIPELINE, 'export'):
+                self.sink.close()
+            logger.info(f"✅ Saved {self.sink.count} recipes to {self.sink.path}")
+    
+    # ===== CHECKPOINTS =====
+    def resume_from_checkpoint(self):
         """
-        Fetch recipes from TheMealDB (completely free, unlimited)
+        Reload recipes and per-source cursors from the last checkpoint.
+        
+        Returns:
+            bool: True if a checkpoint was found and loaded
+        """
+        if self.checkpoint is None or not self.checkpoint.exists():
+            logger.info("No checkpoint found, starting a fresh run")
+            return False
+        
+        self._cursors, _ = self.checkpoint.load()
+        for recipe in self.checkpoint.iter_recipes():
+            self.deduplicate_recipe(recipe['name'], recipe.get('ingredients'), recipe.get('source'))
+            self._add_recipe(recipe, committed=True)
+        return True
+    
+    def _resume_cursor(self, source):
+        """Cursor a source saved in the loaded checkpoint ({} if none)."""
+        return self._cursors.get(source, {})
+    
+    def _save_progress(self, source, cursor):
+        """
+        Commit recipes collected since the last save plus `source`'s cursor.
+        
+        Sources running concurrently may contribute recipes to each other's
+        batches; that is safe because their names are already in
+        seen_names, so a resumed source skips them as duplicates.
+        """
+        if self.checkpoint is None:
+            return
+        
+        with self._checkpoint_lock, self.profiler.stage(source, 'checkpoint'):
+            with self._record_lock:
+                new_recipes, self._uncommitted = self._uncommitted, []
+            self.checkpoint.save(source, cursor, new_recipes)
+            with self._dedup_lock:
+                self.dedup_index.save()
+    
+    def _get_json(self, source, url, params=None, timeout=10, revalidate=False):
+        """
+        GET a JSON payload through the response cache and request scheduler.
+        
+        Fresh cache entries are returned without a request; stale ones are
+        revalidated with ETag/Last-Modified so an unchanged resource costs a
+        304 instead of a full download.
         
         Args:
-            num_recipes (int): Target number of recipes to fetch
+            source (str): Source name (selects rate limit and cache TTL)
+            url (str): Request URL
+            params (dict): Query parameters
+            timeout (int): Request timeout in seconds
+            revalidate (bool): Send a conditional request even when the
+                cached copy is still fresh
+            
+        Returns:
+            dict: Decoded JSON body
+        """
+        profiler = self.profiler
+        if self.cache is None:
+            response = self.scheduler.get(source, url, params=params, timeout=timeout)
+            with profiler.stage(source, 'decode'):
+                return response.json()
+        
+        with profiler.stage(source, 'cache'):
+            entry = self.cache.get(url, params)
+        if entry is not None and entry.is_fresh and not revalidate:
+            self.cache.record('hit')
+            profiler.record_cache(source, 'hit')
+            with profiler.stage(source, 'decode'):
+                return json.loads(entry.body)
+        
+        headers = entry.conditional_headers() if entry is not None else {}
+        response = self.scheduler.get(source, url, params=params, headers=headers,
+                                      timeout=timeout)
+        
+        if response.status_code == 304 and entry is not None:
+            self.cache.record('revalidated')
+            profiler.record_cache(source, 'revalidated')
+            with profiler.stage(source, 'cache'):
+                self.cache.refresh(source, entry)
+            with profiler.stage(source, 'decode'):
+                return json.loads(entry.body)
+        
+        self.cache.record('miss')
+        profiler.record_cache(source, 'miss')
+        with profiler.stage(source, 'cache'):
+            self.cache.put(source, url, params, response.content,
+                           etag=response.headers.get('ETag'),
+                           last_modified=response.headers.get('Last-Modified'))
+        with profiler.stage(source, 'decode'):
+            return response.json()
+    
+    # ===== SOURCES =====
+    def create_source(self, name, **options):
         """
-        logger.info(f"🍽️  Fetching from TheMealDB (target: {num_recipes} recipes)...")
-        base_url = 'https://www.themealdb.com/api/json/v1/1'
+        Instantiate a registered source plugin bound to this aggregator's
+        cache and scheduler.
         
-        try:
-            # Get all categories
-            categories_url = f'{base_url}/categories.php'
-            response = requests.get(categories_url, timeout=10)
-            response.raise_for_status()
-            categories = response.json()['categories']
+        Args:
+            name (str): Key in recipe_sources.SOURCES
+            **options: Source-specific constructor arguments
             
-            recipes_collected = 0
+        Returns:
+            RecipeSource: Ready-to-run source
+        """
+        if name == 'TheMealDB':
+            options.setdefault('base_url', self.mealdb_base_url)
+            options.setdefault('coalescer', self.lookups)
+        source = SOURCES[name](self._get_json, **options)
+        source.requests_sent = functools.partial(self.scheduler.requests_sent, name)
+        return source
+    
+    def run_source(self, source, num_recipes=None):
+        """
+        Run one source plugin: discover pages, fetch up to `source.max_workers`
+        of them in parallel, and consume them in discovery order so
+        deduplication, the recipe cap and checkpoint cursors are deterministic.
+        
+        Args:
+            source (RecipeSource): Source to run
+            num_recipes (int): Target number of recipes (default: source.default_target)
             
-            # Iterate through categories
-            for category in tqdm(categories, desc="TheMealDB Categories"):
-                if recipes_collected >= num_recipes:
-                    break
-                
-                cat_name = category['strCategory']
+        Returns:
+            int: Recipes collected by this source (including resumed ones)
+        """
+        name = source.name
+        num_recipes = num_recipes or source.default_target
+        logger.info(f"{source.icon} Fetching from {name} (target: {num_recipes} recipes)...")
+        
+        cursor = self._resume_cursor(name)
+        if cursor.get('done'):
+            logger.info(f"⏭️  {name} already completed in checkpoint")
+            return cursor.get('collected', 0)
+        
+        if not source.is_configured():
+            return 0
+        
+        recipes_collected = resumed = cursor.get('collected', 0)
+        consumed = last_saved = cursor.get('page', 0)
+        profiler = self.profiler
+        profiler.source_started(name)
+        finished = True
+        # Only prefetch ahead when pages run in parallel; a serial source
+        # should not spend quota on a page it may never need
+        window = source.max_workers * 2 if source.max_workers > 1 else 1
+        
+        with ThreadPoolExecutor(max_workers=source.max_workers) as executor:
+            source.executor = executor if source.max_workers > 1 else None
+            pending = deque()
+            
+            try:
+                pages = source.resume(num_recipes, consumed)
                 
-                # Get meals in this category
-                meals_url = f'{base_url}/filter.php?c={cat_name}'
-                try:
-                    meals_response = requests.get(meals_url, timeout=10)
-                    meals_response.raise_for_status()
-                    meals = meals_response.json().get('meals', [])
-                    
-                    if not meals:
-                        continue
-                    
-                    # Get details for each meal (limit to avoid too many requests)
-                    for meal in meals[:10]:  # Max 10 per category
-                        if recipes_collected >= num_recipes:
-                            break
-                        
-                        meal_id = meal['idMeal']
-                        detail_url = f'{base_url}/lookup.php?i={meal_id}'
+                with tqdm(total=num_recipes, initial=recipes_collected,
+                          desc=f"{name}") as progress:
+                    while recipes_collected < num_recipes:
+                        # Every page before `consumed` is fully processed here
+                        if consumed - last_saved >= source.checkpoint_every:
+                            self._save_progress(name, {'page': consumed,
+                                                       'collected': recipes_collected})
+                            last_saved = consumed
                         
-                        detail_response = requests.get(detail_url, timeout=10)
-                        detail_response.raise_for_status()
-                        detail = detail_response.json()['meals'][0]
+                        for page in islice(pages, window - len(pending)):
+                            pending.append((page, executor.submit(self._fetch_page, source, page)))
+                        if not pending:
+                            break  # No more pages
                         
-                        # Skip duplicates
-                        if self.deduplicate_recipe(detail['strMeal']):
+                        page, future = pending.popleft()
+                        consumed += 1
+                        try:
+                            records = future.result()
+                        except QuotaExceeded as e:
+                            logger.warning(f"⚠️  {e}")
+                            consumed -= 1  # Retry this page on --resume
+                            finished = False
+                            break
+                        except Exception as e:
+                            logger.warning(f"Error fetching {name} page {page!r}: {e}")
+                            if source.stop_on_error:
+                                consumed -= 1
+                                finished = False
+                                break
                             continue
                         
-                        # Parse ingredients
-                        ingredients = []
-                        for i in range(1, 21):
-                            ing = detail.get(f'strIngredient{i}', '').strip()
-                            measure = detail.get(f'strMeasure{i}', '').strip()
-                            if ing:
-                                ingredients.append(f"{measure} {ing}".strip())
-                        
-                        # Add recipe
-                        self.recipes.append({
-                            'name': detail['strMeal'],
-                            'ingredients': ' | '.join(ingredients),
-                            'instructions': detail['strInstructions'],
-                            'meal_type': 'Dinner',
-                            'cuisine': detail.get('strArea', 'Unknown'),
-                            'source': 'TheMealDB',
-                            'source_url': detail.get('strSource', ''),
-                            'image_url': detail.get('strMealThumb', ''),
-                            'servings': 4,
-                            'prep_time_minutes': 0,
-                            'cook_time_minutes': 0,
-                            'calories': 0,  # Not provided by TheMealDB
-                            'protein_g': 0,
-                            'carbs_g': 0,
-                            'fat_g': 0,
-                            'fiber_g': 0,
-                            'sugar_g': 0,
-                            'sodium_mg': 0
-                        })
+                        with profiler.stage(name, 'normalize'):
+                            recipes = source.normalize_page(records)
                         
-                        recipes_collected += 1
-                        time.sleep(0.1)  # Be respectful
-                
-                except Exception as e:
-                    logger.warning(f"Error fetching category {cat_name}: {e}")
-                    continue
+                        for recipe in recipes:
+                            if recipes_collected >= num_recipes:
+                                break
+                            
+                            # Skip duplicates
+                            with profiler.stage(name, 'dedup'):
+                                duplicate = self.deduplicate_recipe(recipe['name'],
+                                                                    recipe['ingredients'], name)
+                            if duplicate:
+                                continue
+                            
+                            with profiler.stage(name, 'write'):
+                                self._add_recipe(recipe)
+                            recipes_collected += 1
+                            progress.update(1)
             
-            logger.info(f"✅ TheMealDB: Collected {recipes_collected} recipes")
+            except Exception as e:
+                logger.error(f"❌ {name} fetch failed: {e}")
+                finished = False
             
-        except Exception as e:
-            logger.error(f"❌ TheMealDB fetch failed: {e}")
+            finally:
+                # Target reached or stopped: drop pages that have not started yet
+                for _, future in pending:
+                    future.cancel()
+                source.executor = None
+                source.finish()
+        
+        if finished:
+            self._save_progress(name, {'done': True, 'collected': recipes_collected})
+            self.unfinished.discard(name)
+        else:
+            self._save_progress(name, {'page': consumed, 'collected': recipes_collected})
+            self.unfinished.add(name)
+        
+        profiler.source_finished(name, recipes_collected - resumed)
+        logger.info(f"✅ {name}: Collected {recipes_collected} recipes")
+        return recipes_collected
+    
+    def _fetch_page(self, source, page):
+        """source.fetch_page(page), timed for the profiler's page latency."""
+        start = time.perf_counter()
+        try:
+            return source.fetch_page(page)
+        finally:
+            self.profiler.record_page(source.name, time.perf_counter() - start)
+    
+    def fetch_from_mealdb(self, num_recipes=100, concurrent=False, max_workers=8, **options):
+        """
+        Fetch recipes from TheMealDB (completely free, unlimited)
+        
+        Args:
+            num_recipes (int): Target number of recipes to fetch
+            concurrent (bool): Run category and detail lookups in a thread pool
+            max_workers (int): Maximum in-flight requests in concurrent mode
+            **options: Crawl budget for TheMealDBSource (per_category, max_lookups)
+        """
+        source = self.create_source('TheMealDB', **options)
+        source.max_workers = max_workers if concurrent else 1
+        return self.run_source(source, num_recipes)
     
-    # ===== SOURCE 2: Edamam =====
     def fetch_from_edamam(self, num_recipes=100, search_terms=None):
         """
         Fetch recipes from Edamam Recipe Search API
@@ -174,175 +435,73 @@ class RecipeAggregator:
             num_recipes (int): Target number of recipes
             search_terms (list): Search terms to use
         """
-        logger.info(f"🥗 Fetching from Edamam (target: {num_recipes} recipes)...")
-        
-        if not self.edamam_id or not self.edamam_key:
-            logger.warning("⚠️  Edamam API keys not found in .env file")
-            logger.info("Sign up at: https://developer.edamam.com/")
-            return
-        
-        base_url = 'https://api.edamam.com/api/recipes/v2'
-        
-        if not search_terms:
-            search_terms = ['chicken', 'beef', 'salmon', 'pasta', 'vegetarian',
-                          'soup', 'salad', 'pork', 'shrimp', 'turkey']
-        
-        recipes_collected = 0
-        
-        for term in tqdm(search_terms, desc="Edamam Searches"):
-            if recipes_collected >= num_recipes:
-                break
-            
-            params = {
-                'type': 'public',
-                'q': term,
-                'app_id': self.edamam_id,
-                'app_key': self.edamam_key,
-                'to': 10
-            }
-            
-            try:
-                response = requests.get(base_url, params=params, timeout=15)
-                response.raise_for_status()
-                data = response.json()
-                
-                for hit in data.get('hits', []):
-                    if recipes_collected >= num_recipes:
-                        break
-                    
-                    recipe = hit['recipe']
-                    
-                    # Skip duplicates
-                    if self.deduplicate_recipe(recipe['label']):
-                        continue
-                    
-                    # Extract nutrition
-                    nutrients = recipe.get('totalNutrients', {})
-                    servings = recipe.get('yield', 4)
-                    
-                    self.recipes.append({
-                        'name': recipe['label'],
-                        'ingredients': ' | '.join(recipe.get('ingredientLines', [])),
-                        'instructions': recipe.get('url', ''),
-                        'meal_type': recipe.get('mealType', ['Dinner'])[0].title(),
-                        'cuisine': recipe.get('cuisineType', ['Unknown'])[0].title(),
-                        'servings': int(servings),
-                        'prep_time_minutes': 0,
-                        'cook_time_minutes': 0,
-                        'calories': int(nutrients.get('ENERC_KCAL', {}).get('quantity', 0) / servings),
-                        'protein_g': round(nutrients.get('PROCNT', {}).get('quantity', 0) / servings, 1),
-                        'carbs_g': round(nutrients.get('CHOCDF', {}).get('quantity', 0) / servings, 1),
-                        'fat_g': round(nutrients.get('FAT', {}).get('quantity', 0) / servings, 1),
-                        'fiber_g': round(nutrients.get('FIBTG', {}).get('quantity', 0) / servings, 1),
-                        'sugar_g': round(nutrients.get('SUGAR', {}).get('quantity', 0) / servings, 1),
-                        'sodium_mg': int(nutrients.get('NA', {}).get('quantity', 0) / servings),
-                        'source': 'Edamam',
-                        'source_url': recipe.get('url', ''),
-                        'image_url': recipe.get('image', '')
-                    })
-                    
-                    recipes_collected += 1
-                
-                # Rate limiting: 10 requests/min = 6 seconds between
-                time.sleep(6)
-                
-            except Exception as e:
-                logger.warning(f"Error fetching Edamam term '{term}': {e}")
-                continue
-        
-        logger.info(f"✅ Edamam: Collected {recipes_collected} recipes")
+        return self.run_source(self.create_source('Edamam', search_terms=search_terms),
+                               num_recipes)
     
-    # ===== SOURCE 3: Spoonacular =====
-    def fetch_from_spoonacular(self, num_recipes=150):
+    def fetch_from_spoonacular(self, num_recipes=None, **options):
         """
         Fetch recipes from Spoonacular API
-        Free tier: 150 points/day (1 point = 1 request)
+        Free tier: 150 points/day; searches find IDs and informationBulk
+        hydrates up to 100 per call (see spoonacular_planner.py)
         
         Args:
-            num_recipes (int): Target number of recipes
+            num_recipes (int): Target number of recipes (default: what today's
+                points can buy)
+            **options: SpoonacularSource options (plan_path, daily_points, reserve_points)
         """
-        logger.info(f"🥄 Fetching from Spoonacular (target: {num_recipes} recipes)...")
-        
-        if not self.spoonacular_key:
-            logger.warning("⚠️  Spoonacular API key not found in .env file")
-            logger.info("Sign up at: https://spoonacular.com/food-api")
-            return
+        return self.run_source(self.create_source('Spoonacular', **options), num_recipes)
+    
+    # ===== ORCHESTRATION =====
+    def run_all_sources(self, targets=None, sources=None, options=None):
+        """
+        Run every registered source at the same time.
         
-        base_url = 'https://api.spoonacular.com/recipes/complexSearch'
-        recipes_collected = 0
+        Each source is paced by its own token bucket in the shared scheduler,
+        so total wall time is bounded by the slowest source rather than the
+        sum of all of them. Recipes from all sources merge through the same
+        deduplication index and sink.
         
-        # Fetch in batches of 10
-        for offset in tqdm(range(0, num_recipes, 10), desc="Spoonacular Batches"):
-            if recipes_collected >= num_recipes:
-                break
+        Args:
+            targets (dict): Recipes wanted per source name (default: each
+                source's default_target)
+            sources (list): RecipeSource instances to run (default: one of
+                each class in recipe_sources.SOURCES)
+            options (dict): Source name -> constructor options for the
+                default sources, e.g. {'TheMealDB': {'per_category': 25}}
             
-            params = {
-                'apiKey': self.spoonacular_key,
-                'number': 10,
-                'offset': offset,
-                'addRecipeNutrition': True,
-                'fillIngredients': True
+        Returns:
+            dict: Recipes collected per source (sources that stopped early
+                are listed in self.unfinished)
+        """
+        targets = targets or {}
+        options = options or {}
+        if sources is None:
+            sources = [self.create_source(name, **options.get(name, {})) for name in SOURCES]
+        
+        collected = {}
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            futures = {
+                executor.submit(self.run_source, source, targets.get(source.name)): source.name
+                for source in sources
             }
-            
-            try:
-                response = requests.get(base_url, params=params, timeout=15)
-                response.raise_for_status()
-                data = response.json()
-                
-                for recipe in data.get('results', []):
-                    if recipes_collected >= num_recipes:
-                        break
-                    
-                    # Skip duplicates
-                    if self.deduplicate_recipe(recipe['title']):
-                        continue
-                    
-                    # Extract nutrition
-                    nutrition = recipe.get('nutrition', {}).get('nutrients', [])
-                    nutrients_dict = {n['name']: n['amount'] for n in nutrition}
-                    
-                    # Parse ingredients
-                    ingredients = []
-                    for ing in recipe.get('extendedIngredients', []):
-                        ingredients.append(ing.get('original', ''))
-                    
-                    servings = recipe.get('servings', 4)
-                    
-                    self.recipes.append({
-                        'name': recipe['title'],
-                        'ingredients': ' | '.join(ingredients),
-                        'instructions': '',  # Would need separate API call
-                        'servings': servings,
-                        'prep_time_minutes': recipe.get('preparationMinutes', 0),
-                        'cook_time_minutes': recipe.get('cookingMinutes', 0),
-                        'calories': int(nutrients_dict.get('Calories', 0) / servings),
-                        'protein_g': round(nutrients_dict.get('Protein', 0) / servings, 1),
-                        'carbs_g': round(nutrients_dict.get('Carbohydrates', 0) / servings, 1),
-                        'fat_g': round(nutrients_dict.get('Fat', 0) / servings, 1),
-                        'fiber_g': round(nutrients_dict.get('Fiber', 0) / servings, 1),
-                        'sugar_g': round(nutrients_dict.get('Sugar', 0) / servings, 1),
-                        'sodium_mg': int(nutrients_dict.get('Sodium', 0) / servings),
-                        'meal_type': 'Dinner',
-                        'cuisine': 'Various',
-                        'source': 'Spoonacular',
-                        'source_url': recipe.get('sourceUrl', ''),
-                        'image_url': recipe.get('image', '')
-                    })
-                    
-                    recipes_collected += 1
-                
-                time.sleep(1)  # Be respectful
-                
-            except Exception as e:
-                logger.error(f"Error fetching Spoonacular batch at offset {offset}: {e}")
-                break
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    collected[name] = future.result()
+                except Exception as e:
+                    logger.error(f"❌ {name} fetch failed: {e}")
+                    self.unfinished.add(name)
         
-        logger.info(f"✅ Spoonacular: Collected {recipes_collected} recipes")
+        logger.info(f"📡 API requests today: {self.scheduler.usage()}")
+        return collected
     
     # ===== SAVE & EXPORT =====
     def save_to_csv(self, filename='recipe_database.csv'):
         """
-        Save all collected recipes to CSV
+        Save recipes collected in memory to CSV.
+        
+        Not needed when a streaming sink was given to the constructor;
+        call close() instead.
         
         Args:
             filename (str): Output filename
@@ -350,61 +509,120 @@ class RecipeAggregator:
         Returns:
             pd.DataFrame: Recipe dataframe
         """
-        df = pd.DataFrame(self.recipes)
+        # Computed flags are already on each record (see _add_recipe)
+        df = self.recipes.to_dataframe()
         
         if len(df) == 0:
             logger.warning("⚠️  No recipes to save!")
             return df
         
-        # Calculate total_time_minutes
-        df['total_time_minutes'] = (
-            df.get('prep_time_minutes', 0) + 
-            df.get('cook_time_minutes', 0)
-        )
-        
-        # Add computed flags
-        df['is_heart_healthy'] = df.get('sodium_mg', 999999) < 600
-        df['is_diabetic_friendly'] = df.get('sugar_g', 999999) < 10
-        df['is_weeknight_friendly'] = df['total_time_minutes'] <= 30
-        
         # Save
-        df.to_csv(filename, index=False)
+        with self.profiler.stage(PIPELINE, 'export'):
+            df.to_csv(filename, index=False)
         logger.info(f"✅ Saved {len(df)} recipes to {filename}")
         
         return df
     
+    def save_to_parquet(self, filename='recipe_database.parquet'):
+        """
+        Save recipes collected in memory to typed, columnar Parquet
+        (see recipe_parquet.py; needs pyarrow).
+        
+        Args:
+            filename (str): Output filename
+            
+        Returns:
+            int: Recipes written
+        """
+        if not self.recipes:
+            logger.warning("⚠️  No recipes to save!")
+            return 0
+        
+        with self.profiler.stage(PIPELINE, 'export'):
+            rows = write_parquet(self.recipes.to_dataframe(), filename)
+        logger.info(f"✅ Saved {rows} recipes to {filename}")
+        return rows
+    
     def print_summary(self):
-        """Print collection summary"""
-        df = pd.DataFrame(self.recipes)
+        """Print collection summary from the running counters"""
+        stats = self.stats
         
-        if len(df) == 0:
+        if stats.total == 0:
             logger.warning("⚠️  No recipes collected!")
             return
         
         print("\n" + "="*60)
         print("📊 RECIPE COLLECTION SUMMARY")
         print("="*60)
-        print(f"Total Recipes: {len(df)}")
+        print(f"Total Recipes: {stats.total}")
         print(f"Unique Recipes: {len(self.seen_names)}")
+        print(f"Near-Duplicates Skipped: {self.dedup_index.duplicates_found}")
         
         print(f"\nBy Source:")
-        print(df['source'].value_counts())
+        for source, count in stats.by_source.most_common():
+            print(f"  {source:<15}{count:>6}")
         
-        if 'calories' in df.columns and df['calories'].notna().sum() > 0:
-            print(f"\nWith Nutrition Data: {df['calories'].notna().sum()}")
-            print(f"Average Calories: {df['calories'].mean():.0f}")
+        if stats.with_calories > 0:
+            print(f"\nWith Nutrition Data: {stats.with_calories}")
+            print(f"Average Calories: {stats.average_calories:.0f}")
         
-        if 'sodium_mg' in df.columns and df['sodium_mg'].notna().sum() > 0:
-            print(f"Heart-Healthy (<600mg sodium): {(df['sodium_mg'] < 600).sum()}")
+        print(f"Heart-Healthy (<600mg sodium): {stats.heart_healthy}")
+        print(f"Diabetic-Friendly (<10g sugar): {stats.diabetic_friendly}")
+        print(f"Weeknight-Friendly (≤30min): {stats.weeknight_friendly}")
         
-        if 'total_time_minutes' in df.columns:
-            print(f"Weeknight-Friendly (≤30min): {(df['total_time_minutes'] <= 30).sum()}")
+        if self.cache is not None and self.cache.lookups:
+            print(f"\nHTTP Cache: {self.cache.hits} fresh hits, "
+                  f"{self.cache.revalidated} revalidated (304), {self.cache.misses} misses")
+            print(f"Cache Hit Ratio: {self.cache.hit_ratio:.1%} "
+                  f"({self.cache.size_bytes / 1024 / 1024:.1f} MB on disk)")
         
         print("="*60)
 
 
 # ===== MAIN EXECUTION =====
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Aggregate recipes from free APIs')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue from the last checkpoint instead of starting over')
+    parser.add_argument('--output', default='recipe_database.csv',
+                        help='Output file; format from extension (.csv, .jsonl, .parquet)')
+    parser.add_argument('--store',
+                        default=os.path.join(os.getenv('DATA_DIR', 'data'), 'recipes.sqlite'),
+                        help="Indexed SQLite recipe store kept up to date alongside --output "
+                             "('' to skip)")
+    parser.add_argument('--ingredient-index',
+                        default=os.path.join(os.getenv('DATA_DIR', 'data'), 'ingredient_index.sqlite'),
+                        help="Inverted ingredient index built as recipes arrive ('' to skip)")
+    parser.add_argument('--dedup-index', default=None,
+                        help='SQLite file that keeps the near-duplicate index between runs')
+    parser.add_argument('--mealdb-per-category', type=int, default=10,
+                        help='TheMealDB meals taken per category listing (0 = all)')
+    parser.add_argument('--mealdb-max-lookups', type=int, default=None,
+                        help='Cap on distinct TheMealDB meal lookups per run')
+    parser.add_argument('--spoonacular-plan',
+                        default=os.path.join(os.getenv('DATA_DIR', 'data'), 'spoonacular_plan.json'),
+                        help='Where the Spoonacular fetch queue and daily point spend persist')
+    parser.add_argument('--spoonacular-points', type=float,
+                        default=float(os.getenv('SPOONACULAR_DAILY_POINTS', 150)),
+                        help='Spoonacular points to spend per day')
+    parser.add_argument('--spoonacular-reserve', type=float, default=0,
+                        help='Spoonacular points to leave unspent each day')
+    parser.add_argument('--profile', nargs='?', metavar='REPORT',
+                        const=os.path.join(os.getenv('DATA_DIR', 'data'), 'profile',
+                                           'aggregator_profile.json'),
+                        help='Write per-source/per-stage timings, request latency histograms '
+                             'and bytes transferred as JSON (default: '
+                             '$DATA_DIR/profile/aggregator_profile.json)')
+    parser.add_argument('--profiler', choices=['cprofile', 'pyinstrument'], default=None,
+                        help='With --profile, also save a function-level profile next to the report')
+    parser.add_argument('--record-fixtures', metavar='DIR', default=None,
+                        help='Record every API response into replay fixtures in DIR '
+                             '(bypasses the response cache; see benchmarks/replay_server.py)')
+    parser.add_argument('--checkpoint-dir',
+                        default=os.path.join(os.getenv('DATA_DIR', 'data'), 'checkpoint'),
+                        help='Where run progress is saved after every batch')
+    args = parser.parse_args()
+    
     print("""
 ╔══════════════════════════════════════════════════════════╗
 ║        RECIPE DATABASE AGGREGATOR                        ║
@@ -412,19 +630,66 @@ if __name__ == "__main__":
 ╚══════════════════════════════════════════════════════════╝
 """)
     
-    aggregator = RecipeAggregator()
+    # Cached responses let re-runs skip recipes we already downloaded
+    cache = ResponseCache(os.path.join(os.getenv('DATA_DIR', 'data'), 'http_cache.sqlite'))
+    # Today's request counts survive restarts, so daily quotas hold across runs
+    usage_path = os.path.join(os.getenv('DATA_DIR', 'data'), 'api_usage.json')
+    scheduler = RequestScheduler(usage_path=usage_path)
+    if args.record_fixtures:
+        # Every request must reach the API to be recorded
+        cache = None
+        scheduler = RequestScheduler(
+            session=FixtureRecorder(args.record_fixtures).attach(create_session()),
+            usage_path=usage_path)
+    checkpoint = Checkpoint(args.checkpoint_dir)
+    # Recipes stream straight to the output file (plus the store and ingredient index) as they arrive
+    sink = open_sink(args.output)
+    extra_sinks = []
+    if args.store:
+        extra_sinks.append(open_sink(args.store))
+    if args.ingredient_index:
+        extra_sinks.append(IngredientIndexSink(args.ingredient_index))
+    if extra_sinks:
+        sink = TeeSink([sink] + extra_sinks)
+    profiler = PipelineProfiler() if args.profile else None
+    code_profiler = None
+    if args.profile and args.profiler:
+        code_profiler = CodeProfiler(args.profiler, os.path.splitext(args.profile)[0]).start()
+    aggregator = RecipeAggregator(scheduler=scheduler, cache=cache, checkpoint=checkpoint, sink=sink,
+                                  dedup_index=NearDuplicateIndex(path=args.dedup_index),
+                                  profiler=profiler)
     
-    # Fetch from all available sources
-    aggregator.fetch_from_mealdb(num_recipes=100)
-    aggregator.fetch_from_edamam(num_recipes=100)
-    aggregator.fetch_from_spoonacular(num_recipes=150)
+    if not (args.resume and aggregator.resume_from_checkpoint()):
+        checkpoint.start()
     
-    # Save results
-    df = aggregator.save_to_csv('recipe_database.csv')
+    # Fetch from all available sources concurrently
+    aggregator.run_all_sources(options={
+        'TheMealDB': {'per_category': args.mealdb_per_category or None,
+                      'max_lookups': args.mealdb_max_lookups},
+        'Spoonacular': {'plan_path': args.spoonacular_plan,
+                        'daily_points': args.spoonacular_points,
+                        'reserve_points': args.spoonacular_reserve},
+    })
+    
+    # Finish writing results
+    aggregator.close()
     aggregator.print_summary()
     
+    if profiler is not None:
+        if code_profiler is not None:
+            code_profiler.stop()
+        profiler.log_summary()
+        logger.info(f"⏱️  Profile report saved to {profiler.write(args.profile)}")
+    
+    # Keep the checkpoint until every source has finished
+    if aggregator.unfinished:
+        logger.warning(f"⏸️  {', '.join(sorted(aggregator.unfinished))} stopped early; "
+                       f"checkpoint kept in {args.checkpoint_dir}, run again with --resume to continue")
+    else:
+        checkpoint.clear()
+    
     print("\n🎉 Recipe database created successfully!")
     print("\nNext steps:")
-    print("1. Review recipe_database.csv")
+    print(f"1. Review {args.output}")
     print("2. Run: python scripts/recipe_quality_filter.py")
-    print("3. Import to Salesforce")
+    print(f"3. Import to Salesforce: python scripts/salesforce_loader.py {args.store or args.output}")
@@ -0,0 +1,408 @@
+"""
+Recipe Query API
+
+Small asyncio HTTP/1.1 server (standard library only) that answers the
+React browser's filter, sort and search requests from the SQLite
+RecipeStore:
+
+    GET /api/recipes?q=chicken&maxCalories=600&heartHealthy=true&sort=calories&limit=24
+    GET /api/recipes?...&cursor=<next_cursor from the previous page>
+    GET /api/recipes/<id>
+    GET /api/health
+
+- keyset pagination (`next_cursor`), so deep pages cost the same as page 1
+  (`total` is only computed for the first page)
+- gzip responses for clients that accept them
+- ETags on every response; `If-None-Match` revalidation returns 304
+- an in-process LRU of finished responses for hot filter combinations,
+  dropped whenever the store changes; identical concurrent misses share
+  one query
+- keep-alive connections; SQLite queries run on a small thread pool so the
+  event loop keeps serving cache hits meanwhile
+
+Query parameters use the frontend's names (see src/App.js): q,
+maxCalories, maxSodium, maxCookTime, heartHealthy, diabeticFriendly,
+weeknightFriendly, source ('all' = any), cuisine, sort (name, calories,
+cookTime, protein), limit, cursor, fields ('all' adds ingredients and
+instructions to the list results).
+
+Usage:
+    python scripts/recipe_api.py --db data/recipes.sqlite --port 8000
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from recipe_store import SORTS, RecipeStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 24
+MAX_LIMIT = 200
+GZIP_MIN_BYTES = 1024      # Smaller bodies are not worth compressing
+KEEP_ALIVE_SECONDS = 15
+
+# What src/components/RecipeCard.js renders; ingredients and instructions
+# (most of a recipe's bytes) come from /api/recipes/<id> or fields=all
+CARD_COLUMNS = ['name', 'cuisine', 'source', 'source_url', 'image_url', 'calories',
+                'protein_g', 'carbs_g', 'fat_g', 'sodium_mg', 'total_time_minutes',
+                'is_heart_healthy', 'is_diabetic_friendly', 'is_weeknight_friendly']
+
+# Frontend query parameter -> RecipeStore filter keyword
+_INT_PARAMS = {'maxCalories': 'max_calories', 'maxSodium': 'max_sodium', 'maxCookTime': 'max_time'}
+_FLAG_PARAMS = {'heartHealthy': 'heart_healthy', 'diabeticFriendly': 'diabetic_friendly',
+                'weeknightFriendly': 'weeknight_friendly'}
+
+
+class BadRequest(ValueError):
+    """Invalid query parameters (answered with 400)."""
+
+
+def encode_cursor(value, recipe_id):
+    """Opaque keyset cursor for the row after (sort value, id); the value may be None."""
+    raw = json.dumps([value, recipe_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, recipe_id = json.loads(raw)
+        return value, int(recipe_id)
+    except (ValueError, TypeError):
+        raise BadRequest(f"Invalid cursor '{cursor}'")
+
+
+def parse_query(query_string):
+    """
+    Turn /api/recipes query parameters into RecipeStore.query() arguments.
+
+    Returns:
+        dict: sort, limit, after, columns and filter keyword arguments
+    """
+    params = dict(parse_qsl(query_string, keep_blank_values=False))
+    options = {}
+
+    for name, keyword in _INT_PARAMS.items():
+        if name in params:
+            try:
+                options[keyword] = int(float(params[name]))
+            except ValueError:
+                raise BadRequest(f"{name} must be a number")
+    for name, keyword in _FLAG_PARAMS.items():
+        if params.get(name, '').lower() in ('true', '1', 'yes'):
+            options[keyword] = True
+    if params.get('source', 'all') != 'all':
+        options['source'] = params['source']
+    if params.get('cuisine'):
+        options['cuisine'] = params['cuisine']
+    if params.get('q', '').strip():
+        options['text'] = params['q'].strip()
+
+    sort = params.get('sort', 'name')
+    if sort not in SORTS:
+        raise BadRequest(f"sort must be one of: {', '.join(SORTS)}")
+    options['sort'] = sort
+
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise BadRequest("limit must be a number")
+    options['limit'] = max(1, min(limit, MAX_LIMIT))
+
+    if params.get('cursor'):
+        options['after'] = decode_cursor(params['cursor'])
+    if params.get('fields') != 'all':
+        options['columns'] = tuple(CARD_COLUMNS)
+    return options
+
+
+class CachedResponse:
+    """A finished JSON response, plus its gzip form and ETag."""
+
+    __slots__ = ('status', 'body', 'gzipped', 'etag')
+
+    def __init__(self, status, payload):
+        self.status = status
+        self.body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()[:20]}"'
+        self.gzipped = gzip.compress(self.body, 5) if len(self.body) >= GZIP_MIN_BYTES else None
+
+
+class ResponseLRU:
+    """Least-recently-used cache of responses, cleared when the store changes."""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    def validate(self, version):
+        """Drop everything if the store has changed since the last call."""
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key):
+        response = self._entries.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key, response):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0}
+
+
+class RecipeAPI:
+    """Routes requests to a RecipeStore and serves them over asyncio streams."""
+
+    def __init__(self, store, cache_size=512, query_threads=4):
+        """
+        Args:
+            store (RecipeStore): Recipe store to query
+            cache_size (int): Responses kept in the LRU (0 disables caching)
+            query_threads (int): Threads running SQLite queries
+        """
+        self.store = store
+        self.cache = ResponseLRU(cache_size)
+        self._executor = ThreadPoolExecutor(max_workers=query_threads,
+                                            thread_name_prefix='recipe-api')
+        self._in_flight = {}
+        self.requests = 0
+
+    # ===== ROUTES =====
+    async def respond(self, method, target):
+        """
+        Resolve one request to a response (from the cache when possible).
+
+        Returns:
+            CachedResponse: The response to send
+        """
+        if method not in ('GET', 'HEAD'):
+            return CachedResponse(HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Use GET'})
+
+        parts = urlsplit(target)
+        path = parts.path.rstrip('/')
+        if path == '/api/health':
+            return CachedResponse(HTTPStatus.OK, {'status': 'ok', 'requests': self.requests,
+                                                  'cache': self.cache.stats()})
+        if path == '/api/recipes':
+            try:
+                options = parse_query(parts.query)
+            except BadRequest as e:
+                return CachedResponse(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+            key = ('list',) + tuple(sorted(options.items()))
+            return await self._cached(key, lambda: self._list(options))
+        if path.startswith('/api/recipes/'):
+            recipe_id = path.rsplit('/', 1)[1]
+            if not recipe_id.isdigit():
+                return CachedResponse(HTTPStatus.NOT_FOUND, {'error': 'Unknown recipe'})
+            return await self._cached(('get', int(recipe_id)), lambda: self._get(int(recipe_id)))
+        return CachedResponse(HTTPStatus.NOT_FOUND, {'error': f'No route for {parts.path}'})
+
+    async def _cached(self, key, build):
+        """Serve `key` from the LRU, or build it once even under concurrent misses."""
+        self.cache.validate(self.store.version())
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        pending = self._in_flight[key] = loop.run_in_executor(self._executor, build)
+        try:
+            response = await pending
+        finally:
+            del self._in_flight[key]
+        if response.status == HTTPStatus.OK:
+            self.cache.put(key, response)
+        return response
+
+    def _list(self, options):
+        filters = {k: v for k, v in options.items() if k not in ('sort', 'limit', 'after', 'columns')}
+        rows = self.store.query(**options)
+        # The client already has the total from the first page
+        total = self.store.count(**filters) if 'after' not in options else None
+
+        next_cursor = None
+        if len(rows) == options['limit']:
+            sort_column = SORTS[options['sort']][0]
+            next_cursor = encode_cursor(rows[-1][sort_column], rows[-1]['id'])
+        return CachedResponse(HTTPStatus.OK, {'recipes': rows, 'total': total,
+                                              'next_cursor': next_cursor})
+
+    def _get(self, recipe_id):
+        recipe = self.store.get(recipe_id)
+        if recipe is None:
+            return CachedResponse(HTTPStatus.NOT_FOUND, {'error': 'Unknown recipe'})
+        return CachedResponse(HTTPStatus.OK, recipe)
+
+    # ===== HTTP =====
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one keep-alive connection until it closes."""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    writer.write(self._serialize(
+                        CachedResponse(HTTPStatus.BAD_REQUEST, {'error': 'Malformed request'}),
+                        {}, keep_alive=False))
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('content-length'):
+                    await reader.readexactly(int(headers['content-length']))
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+
+                self.requests += 1
+                if method == 'OPTIONS':
+                    writer.write(self._preflight(keep_alive))
+                else:
+                    try:
+                        response = await self.respond(method, target)
+                    except Exception as e:
+                        logger.error(f"❌ {method} {target} failed: {e}")
+                        response = CachedResponse(HTTPStatus.INTERNAL_SERVER_ERROR,
+                                                  {'error': 'Query failed'})
+                    writer.write(self._serialize(response, headers, keep_alive,
+                                                 head=(method == 'HEAD')))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _serialize(response, request_headers, keep_alive, head=False):
+        status = HTTPStatus(response.status)
+        lines = [f'HTTP/1.1 {status.value} {status.phrase}']
+        body = response.body
+        extra = []
+
+        if response.status == HTTPStatus.OK:
+            extra += [f'ETag: {response.etag}', 'Cache-Control: no-cache', 'Vary: Accept-Encoding']
+            if request_headers.get('if-none-match') == response.etag:
+                status = HTTPStatus.NOT_MODIFIED
+                lines = [f'HTTP/1.1 {status.value} {status.phrase}']
+                body = b''
+            elif response.gzipped is not None and 'gzip' in request_headers.get('accept-encoding', ''):
+                body = response.gzipped
+                extra.append('Content-Encoding: gzip')
+
+        lines += [
+            'Content-Type: application/json; charset=utf-8',
+            f'Content-Length: {len(body)}',
+            'Access-Control-Allow-Origin: *',
+            'Access-Control-Expose-Headers: ETag',
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ] + extra
+        head_bytes = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        return head_bytes if head else head_bytes + body
+
+    @staticmethod
+    def _preflight(keep_alive):
+        lines = [
+            'HTTP/1.1 204 No Content',
+            'Access-Control-Allow-Origin: *',
+            'Access-Control-Allow-Methods: GET, HEAD, OPTIONS',
+            'Access-Control-Allow-Headers: If-None-Match',
+            'Content-Length: 0',
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    async def serve(self, host='127.0.0.1', port=8000, ready=None):
+        """
+        Run the server until cancelled.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind (0 = any free port)
+            ready (callable): Called with the bound port once listening
+        """
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        bound = server.sockets[0].getsockname()[1]
+        logger.info(f"🍳 Recipe API listening on http://{host}:{bound}/api/recipes")
+        if ready is not None:
+            ready(bound)
+        async with server:
+            try:
+                await server.serve_forever()
+            finally:
+                self._executor.shutdown(wait=False)
+
+
+def run_server(db_path, host='127.0.0.1', port=8000, cache_size=512, query_threads=4, ready=None):
+    """Blocking entry point: serve `db_path` until interrupted."""
+    api = RecipeAPI(RecipeStore(db_path), cache_size=cache_size, query_threads=query_threads)
+    try:
+        asyncio.run(api.serve(host, port, ready=ready))
+    except KeyboardInterrupt:
+        logger.info("👋 Recipe API stopped")
+
+
+# ===== MAIN EXECUTION =====
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Serve the recipe store as a JSON API')
+    parser.add_argument('--db', default=os.path.join(os.getenv('DATA_DIR', 'data'), 'recipes.sqlite'))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-size', type=int, default=512,
+                        help='Responses kept in the in-process LRU (0 disables)')
+    parser.add_argument('--query-threads', type=int, default=4,
+                        help='Threads running SQLite queries')
+    args = parser.parse_args()
+
+    run_server(args.db, args.host, args.port, args.cache_size, args.query_threads)
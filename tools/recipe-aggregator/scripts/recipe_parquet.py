@@ -0,0 +1,171 @@
+"""
+Columnar Recipe Storage (Parquet)
+
+Typed, compressed alternative to recipe_database.csv:
+
+- `cuisine`, `meal_type` and `source` are dictionary-encoded (they have a
+  handful of distinct values and load back as pandas categoricals)
+- nutrition and time columns are stored as real integers/floats, so they
+  are never re-parsed from text
+- row groups carry min/max statistics, so a filter like `sodium_mg < 600`
+  skips whole row groups before decoding them
+
+`read_recipes` loads only the requested columns and pushes filters down
+to the Parquet reader. Requires pyarrow.
+
+Usage:
+    df = read_recipes('recipe_database.parquet',
+                      columns=['name', 'calories', 'sodium_mg'],
+                      filters=['sodium_mg < 600', 'source == Edamam'])
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import os
+import re
+
+from recipe_sink import RECIPE_COLUMNS
+
+DICTIONARY_COLUMNS = ('meal_type', 'cuisine', 'source')
+INTEGER_COLUMNS = ('prep_time_minutes', 'cook_time_minutes', 'total_time_minutes',
+                   'calories', 'sodium_mg')
+FLOAT_COLUMNS = ('servings', 'protein_g', 'carbs_g', 'fat_g', 'fiber_g', 'sugar_g')
+
+_FILTER = re.compile(r'^\s*(\w+)\s*(==|!=|<=|>=|<|>|=)\s*(.+?)\s*$')
+
+
+def require_pyarrow():
+    """Import pyarrow (and its parquet module) or explain how to install it."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet support requires pyarrow: pip install pyarrow")
+    return pa, pq
+
+
+def recipe_schema():
+    """Arrow schema for the recipe columns, in RECIPE_COLUMNS order."""
+    pa, _ = require_pyarrow()
+
+    def column_type(column):
+        if column in DICTIONARY_COLUMNS:
+            return pa.dictionary(pa.int32(), pa.string())
+        if column in INTEGER_COLUMNS:
+            return pa.int32()
+        if column in FLOAT_COLUMNS:
+            return pa.float64()
+        if column.startswith('is_'):
+            return pa.bool_()
+        return pa.string()
+
+    return pa.schema([(column, column_type(column)) for column in RECIPE_COLUMNS])
+
+
+def writer_options():
+    """ParquetWriter keyword arguments shared by every recipe file."""
+    return {
+        'compression': 'zstd',
+        'use_dictionary': list(DICTIONARY_COLUMNS),
+        'write_statistics': True,
+    }
+
+
+def write_parquet(df, path, row_group_size=5000):
+    """
+    Write a recipe DataFrame (e.g. a loaded recipe_database.csv) to Parquet.
+
+    Args:
+        df (pd.DataFrame): Recipes; missing columns are written as nulls
+        path (str): Output .parquet file
+        row_group_size (int): Rows per row group (smaller = finer filter pruning)
+
+    Returns:
+        int: Rows written
+    """
+    pa, pq = require_pyarrow()
+    schema = recipe_schema()
+
+    df = df.reindex(columns=RECIPE_COLUMNS)
+    # Missing or all-blank text columns arrive as float NaN, which Arrow
+    # cannot cast to string/dictionary: hand them over as object + None
+    text_columns = [field.name for field in schema
+                    if pa.types.is_string(field.type) or pa.types.is_dictionary(field.type)]
+    text = df[text_columns].astype(object)
+    df[text_columns] = text.where(text.notna(), None)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # CSV round trips turn integer columns into floats; cast without overflow checks
+    table = table.cast(schema, safe=False)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    pq.write_table(table, path, row_group_size=row_group_size, **writer_options())
+    return table.num_rows
+
+
+def parse_filter(expression):
+    """
+    Turn 'sodium_mg < 600' into a pyarrow filter tuple ('sodium_mg', '<', 600).
+
+    Tuples are passed through unchanged. Values are typed by the column:
+    numbers for numeric columns, True/False for flags, text otherwise.
+    """
+    if not isinstance(expression, str):
+        return tuple(expression)
+
+    match = _FILTER.match(expression)
+    if not match:
+        raise ValueError(f"Cannot parse filter '{expression}' (expected 'column op value')")
+
+    column, op, raw = match.groups()
+    if column not in RECIPE_COLUMNS:
+        raise ValueError(f"Unknown column '{column}' in filter '{expression}'")
+
+    raw = raw.strip('\'"')
+    if column in INTEGER_COLUMNS or column in FLOAT_COLUMNS:
+        value = float(raw)
+        if column in INTEGER_COLUMNS and value.is_integer():
+            value = int(value)
+    elif column.startswith('is_'):
+        value = raw.lower() in ('true', '1', 'yes')
+    else:
+        value = raw
+
+    return column, '==' if op == '=' else op, value
+
+
+def read_recipes(path, columns=None, filters=None):
+    """
+    Load recipes from Parquet, decoding only what is asked for.
+
+    Args:
+        path (str): .parquet file written by ParquetSink or write_parquet
+        columns (list): Columns to load (None = all)
+        filters (list): Conditions ANDed together, as strings
+            ('sodium_mg < 600') or pyarrow tuples (('source', '==', 'Edamam'))
+
+    Returns:
+        pd.DataFrame: Matching recipes (dictionary columns as categoricals)
+    """
+    _, pq = require_pyarrow()
+    parsed = [parse_filter(f) for f in filters] if filters else None
+    table = pq.read_table(path, columns=columns, filters=parsed)
+    return table.to_pandas()
+
+
+# ===== MAIN EXECUTION =====
+if __name__ == "__main__":
+    import argparse
+
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description='Convert a recipe CSV to typed Parquet')
+    parser.add_argument('csv', help='Input CSV (e.g. recipe_database.csv)')
+    parser.add_argument('parquet', nargs='?', help='Output file (default: same name, .parquet)')
+    args = parser.parse_args()
+
+    output = args.parquet or os.path.splitext(args.csv)[0] + '.parquet'
+    rows = write_parquet(pd.read_csv(args.csv), output)
+    print(f"✅ Wrote {rows} recipes to {output}")
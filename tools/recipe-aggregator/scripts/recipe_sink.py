@@ -0,0 +1,240 @@
+"""
+Streaming Recipe Sinks
+
+Fetchers hand each recipe to a sink as soon as it is normalized, so the
+aggregator never holds the whole corpus in memory. Computed flags are
+derived per record and summary statistics are kept as running counters.
+
+Supported formats (picked by file extension in `open_sink`):
+- .csv     - same columns as the original recipe_database.csv
+- .jsonl   - one JSON object per line
+- .parquet - typed columnar file, written one row group at a time (needs
+            pyarrow; read it back with recipe_parquet.read_recipes)
+- .sqlite  - indexed, full-text searchable RecipeStore (recipe_store.py)
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import csv
+import json
+import os
+from collections import Counter
+
+# Output column order for every sink
+RECIPE_COLUMNS = [
+    'name', 'ingredients', 'instructions', 'meal_type', 'cuisine',
+    'source', 'source_url', 'image_url', 'servings',
+    'prep_time_minutes', 'cook_time_minutes',
+    'calories', 'protein_g', 'carbs_g', 'fat_g', 'fiber_g', 'sugar_g', 'sodium_mg',
+    'total_time_minutes', 'is_heart_healthy', 'is_diabetic_friendly', 'is_weeknight_friendly',
+]
+
+# Health thresholds (see docs/ARCHITECTURE.md "Computed Flags")
+HEART_HEALTHY_MAX_SODIUM_MG = 600
+DIABETIC_FRIENDLY_MAX_SUGAR_G = 10
+WEEKNIGHT_MAX_MINUTES = 30
+
+
+def add_computed_fields(recipe):
+    """
+    Fill in total time and health flags for a single recipe (in place).
+
+    Records from a batched normalizer (see nutrition.py) already carry
+    them and are returned unchanged.
+
+    Args:
+        recipe (dict): Normalized recipe
+
+    Returns:
+        dict: The same recipe, for chaining
+    """
+    if 'is_weeknight_friendly' in recipe:
+        return recipe
+
+    total_time = (recipe.get('prep_time_minutes') or 0) + (recipe.get('cook_time_minutes') or 0)
+    recipe['total_time_minutes'] = total_time
+    recipe['is_heart_healthy'] = recipe.get('sodium_mg', 999999) < HEART_HEALTHY_MAX_SODIUM_MG
+    recipe['is_diabetic_friendly'] = recipe.get('sugar_g', 999999) < DIABETIC_FRIENDLY_MAX_SUGAR_G
+    recipe['is_weeknight_friendly'] = total_time <= WEEKNIGHT_MAX_MINUTES
+    return recipe
+
+
+class RecipeStats:
+    """Running summary counters, updated one recipe at a time."""
+
+    def __init__(self):
+        self.total = 0
+        self.by_source = Counter()
+        self.with_calories = 0
+        self.calories_sum = 0
+        self.heart_healthy = 0
+        self.diabetic_friendly = 0
+        self.weeknight_friendly = 0
+
+    def update(self, recipe):
+        self.total += 1
+        self.by_source[recipe.get('source', 'Unknown')] += 1
+
+        calories = recipe.get('calories')
+        if calories is not None:
+            self.with_calories += 1
+            self.calories_sum += calories
+
+        self.heart_healthy += bool(recipe.get('is_heart_healthy'))
+        self.diabetic_friendly += bool(recipe.get('is_diabetic_friendly'))
+        self.weeknight_friendly += bool(recipe.get('is_weeknight_friendly'))
+
+    @property
+    def average_calories(self):
+        return self.calories_sum / self.with_calories if self.with_calories else 0
+
+
+class RecipeSink:
+    """Base class: write recipes one at a time, then close."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, recipe):
+        self._write({column: recipe.get(column) for column in RECIPE_COLUMNS})
+        self.count += 1
+
+    def _write(self, row):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink(RecipeSink):
+    """Appends rows to a CSV file with the standard header."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=RECIPE_COLUMNS)
+        self._writer.writeheader()
+
+    def _write(self, row):
+        self._writer.writerow(row)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class JsonLinesSink(RecipeSink):
+    """One JSON object per line."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def _write(self, row):
+        self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class ParquetSink(RecipeSink):
+    """
+    Buffers `row_group_size` records, then writes them as one Parquet row
+    group, so memory is bounded by the row group rather than the corpus.
+    Uses the typed, dictionary-encoded schema from recipe_parquet.py.
+    """
+
+    def __init__(self, path, row_group_size=5000):
+        from recipe_parquet import recipe_schema, require_pyarrow, writer_options
+
+        pa, pq = require_pyarrow()
+        super().__init__(path)
+        self._pa = pa
+        self._schema = recipe_schema()
+        self._writer = pq.ParquetWriter(path, self._schema, **writer_options())
+        self._row_group_size = row_group_size
+        self._buffer = {column: [] for column in RECIPE_COLUMNS}
+        self._buffered = 0
+
+    def _write(self, row):
+        for column in RECIPE_COLUMNS:
+            self._buffer[column].append(row[column])
+        self._buffered += 1
+        if self._buffered >= self._row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffered:
+            return
+        # Infer, then cast: sources may hand over 4.0 for an integer column
+        table = self._pa.Table.from_pydict(self._buffer).cast(self._schema, safe=False)
+        self._writer.write_table(table)
+        self._buffer = {column: [] for column in RECIPE_COLUMNS}
+        self._buffered = 0
+
+    def close(self):
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+
+class TeeSink(RecipeSink):
+    """Writes every recipe to several sinks, e.g. the output file plus the SQLite store."""
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+        self.path = ', '.join(sink.path for sink in self.sinks)
+        self.count = 0
+
+    def _write(self, row):
+        for sink in self.sinks:
+            sink.write(row)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def _sqlite_sink(path):
+    from recipe_store import SQLiteSink  # recipe_store imports this module
+    return SQLiteSink(path)
+
+
+SINKS = {
+    '.csv': CsvSink,
+    '.jsonl': JsonLinesSink,
+    '.parquet': ParquetSink,
+    '.sqlite': _sqlite_sink,
+    '.db': _sqlite_sink,
+}
+
+
+def open_sink(path):
+    """
+    Create the sink matching a file's extension.
+
+    Args:
+        path (str): Output file (.csv, .jsonl, .parquet, or .sqlite/.db for
+            an indexed RecipeStore)
+
+    Returns:
+        RecipeSink: Open sink
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported output format '{extension}' "
+                         f"(use one of: {', '.join(SINKS)})")
+    return SINKS[extension](path)
@@ -0,0 +1,565 @@
+"""
+Recipe Source Plugins
+
+Every API the aggregator reads from is a `RecipeSource` with three steps:
+
+    discover(num_recipes)  - yield page descriptors (a meal ID, a search term, an offset)
+    fetch_page(page)       - turn one page into a list of raw API records
+    normalize_page(raws)   - map a page of raw records to the common recipe
+                             schema (default: normalize(raw) for each)
+
+`RecipeAggregator.run_source` drives those steps: it keeps up to
+`max_workers` pages in flight, consumes them in discovery order, runs each
+recipe through deduplication and checkpoints the page cursor. Adding a new
+API means writing one subclass and listing it in `SOURCES`.
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import logging
+import os
+import re
+from itertools import islice
+
+from nutrition import normalize_nutrition
+from rate_limiter import QuotaExceeded
+from request_coalescer import RequestCoalescer
+from spoonacular_planner import SpoonacularPlanner
+
+logger = logging.getLogger(__name__)
+
+
+class RecipeSource:
+    """
+    Base class for a recipe API.
+
+    Class attributes subclasses may override:
+        name (str): Source name; also selects the rate limit and cache TTL
+        icon (str): Emoji used in progress logs
+        max_workers (int): Pages fetched in parallel (the scheduler's token
+            bucket still sets the actual request rate)
+        checkpoint_every (int): Pages between checkpoint saves
+        stop_on_error (bool): Stop the source after a failed page instead of
+            skipping it
+        default_target (int): Recipes fetched when no target is given
+
+    Instance attributes set by incremental sync (recipe_sync.py):
+        skip_ids (set): Native record IDs already synced; discovery skips them
+            where the API allows
+        refresh_listings (bool): Revalidate discovery listings instead of
+            trusting the response cache, so new records show up
+        fetched_ids (set): Native IDs fetched during this run
+
+    Instance attributes set by RecipeAggregator.create_source():
+        requests_sent (callable): Requests the API has served for this
+            source so far (RequestScheduler.requests_sent); None when the
+            source runs outside an aggregator
+    """
+
+    name = None
+    icon = '📡'
+    max_workers = 1
+    checkpoint_every = 1
+    stop_on_error = False
+    default_target = 100
+
+    def __init__(self, get_json):
+        """
+        Args:
+            get_json (callable): `get_json(source, url, params=None, timeout=10)`,
+                normally RecipeAggregator._get_json (cache + scheduler)
+        """
+        self._get_json = get_json
+        self.executor = None  # Set by the orchestrator while the source runs
+        self.skip_ids = set()
+        self.refresh_listings = False
+        self.fetched_ids = set()
+        self.requests_sent = None
+
+    def get_json(self, url, params=None, timeout=10, revalidate=False):
+        """
+        GET a JSON payload on behalf of this source.
+
+        Args:
+            revalidate (bool): Ask the API even if the cached copy is fresh
+                (a conditional request, so unchanged data costs a 304)
+        """
+        return self._get_json(self.name, url, params=params, timeout=timeout,
+                              revalidate=revalidate)
+
+    def get_many(self, urls, revalidate=False):
+        """
+        GET several URLs, in parallel when the orchestrator has given this
+        source a thread pool.
+
+        Yields:
+            dict | None: Decoded body per URL, in order (None if that request failed)
+        """
+        if self.executor is None:
+            futures = None
+        else:
+            futures = [self.executor.submit(self.get_json, url, revalidate=revalidate)
+                       for url in urls]
+
+        for index, url in enumerate(urls):
+            try:
+                yield futures[index].result() if futures else self.get_json(url, revalidate=revalidate)
+            except Exception as e:
+                logger.warning(f"Error fetching {url}: {e}")
+                yield None
+
+    def is_configured(self):
+        """False (after logging why) when the source cannot run, e.g. no API key."""
+        return True
+
+    def discover(self, num_recipes):
+        raise NotImplementedError
+
+    def resume(self, num_recipes, pages_done):
+        """
+        Discovery for a resumed run, `pages_done` pages in (see run_source).
+        Sources that persist their own progress override this.
+        """
+        return islice(self.discover(num_recipes), pages_done, None)
+
+    def fetch_page(self, page):
+        raise NotImplementedError
+
+    def normalize(self, raw):
+        raise NotImplementedError
+
+    def normalize_page(self, raws):
+        """Normalize one fetched page; override to batch work across records."""
+        return [self.normalize(raw) for raw in raws]
+
+    def finish(self):
+        """Called once the orchestrator is done with the source (log stats, etc.)."""
+
+
+class TheMealDBSource(RecipeSource):
+    """
+    TheMealDB: one page per meal lookup, discovered through category listings.
+
+    Meal IDs cross-listed under several categories are looked up once, and
+    detail lookups go through a RequestCoalescer so a meal requested again
+    while in flight (another source instance on the same aggregator) or
+    already resolved (an earlier run or sync cycle sharing the coalescer)
+    costs no request and no cache read.
+    """
+
+    name = 'TheMealDB'
+    icon = '🍽️ '
+    max_workers = 8
+    checkpoint_every = 16
+
+    BASE_URL = 'https://www.themealdb.com/api/json/v1/1'
+
+    def __init__(self, get_json, base_url=None, per_category=10, max_lookups=None,
+                 coalescer=None):
+        """
+        Args:
+            base_url (str): Override the API endpoint (benchmarks/stubs)
+            per_category (int): New meals taken from each category listing (None = all)
+            max_lookups (int): Total distinct meals to look up (None = no cap
+                beyond the recipe target)
+            coalescer (RequestCoalescer): Lookups shared with other runs
+                (RecipeAggregator passes its own; default: a fresh one)
+        """
+        super().__init__(get_json)
+        self.base_url = base_url or self.BASE_URL
+        self.per_category = per_category
+        self.max_lookups = max_lookups
+        self.lookups = coalescer if coalescer is not None else RequestCoalescer()
+        self._counts_at_start = self._lookup_counts()
+
+    def discover(self, num_recipes):
+        refresh = self.refresh_listings
+        categories = self.get_json(f'{self.base_url}/categories.php',
+                                   revalidate=refresh)['categories']
+        listing_urls = [f"{self.base_url}/filter.php?c={category['strCategory']}"
+                        for category in categories]
+
+        seen_ids = set()
+        for listing in self.get_many(listing_urls, revalidate=refresh):
+            taken = 0
+            for meal in (listing or {}).get('meals') or []:
+                if self.per_category is not None and taken >= self.per_category:
+                    break
+                if meal['idMeal'] in seen_ids or meal['idMeal'] in self.skip_ids:
+                    continue  # Listed under an earlier category too, or already synced
+                if self.max_lookups is not None and len(seen_ids) >= self.max_lookups:
+                    return
+                seen_ids.add(meal['idMeal'])
+                taken += 1
+                yield meal['idMeal']
+
+    def fetch_page(self, meal_id):
+        detail = self.lookups.get(meal_id, lambda: self._lookup(meal_id))
+        if not detail:
+            return []
+        self.fetched_ids.add(meal_id)
+        return [detail]
+
+    def _lookup(self, meal_id):
+        meals = self.get_json(f'{self.base_url}/lookup.php?i={meal_id}').get('meals')
+        return meals[0] if meals else None
+
+    def _lookup_counts(self):
+        return self.lookups.fetched, self.lookups.joined, self.lookups.memo_hits
+
+    def finish(self):
+        # The coalescer outlives this run: report only this run's share
+        fetched, joined, memo_hits = (now - start for now, start in
+                                      zip(self._lookup_counts(), self._counts_at_start))
+        if joined or memo_hits:
+            logger.info(f"🔗 TheMealDB lookups: {fetched} fetched, "
+                        f"{joined} shared in flight, {memo_hits} from memo")
+
+    def normalize(self, detail):
+        """
+        Convert a TheMealDB lookup.php record to the common recipe schema.
+
+        Args:
+            detail (dict): Single entry from the 'meals' array
+
+        Returns:
+            dict: Normalized recipe
+        """
+        # Parse ingredients
+        ingredients = []
+        for i in range(1, 21):
+            ing = (detail.get(f'strIngredient{i}') or '').strip()
+            measure = (detail.get(f'strMeasure{i}') or '').strip()
+            if ing:
+                ingredients.append(f"{measure} {ing}".strip())
+
+        return {
+            'name': detail['strMeal'],
+            'ingredients': ' | '.join(ingredients),
+            'instructions': detail['strInstructions'],
+            'meal_type': 'Dinner',
+            'cuisine': detail.get('strArea', 'Unknown'),
+            'source': 'TheMealDB',
+            'source_url': detail.get('strSource', ''),
+            'image_url': detail.get('strMealThumb', ''),
+            'servings': 4,
+            'prep_time_minutes': 0,
+            'cook_time_minutes': 0,
+            'calories': 0,  # Not provided by TheMealDB
+            'protein_g': 0,
+            'carbs_g': 0,
+            'fat_g': 0,
+            'fiber_g': 0,
+            'sugar_g': 0,
+            'sodium_mg': 0
+        }
+
+
+class EdamamSource(RecipeSource):
+    """Edamam Recipe Search: one page per search term (free tier: 10 requests/min)."""
+
+    name = 'Edamam'
+    icon = '🥗'
+
+    BASE_URL = 'https://api.edamam.com/api/recipes/v2'
+    SEARCH_TERMS = ['chicken', 'beef', 'salmon', 'pasta', 'vegetarian',
+                    'soup', 'salad', 'pork', 'shrimp', 'turkey']
+
+    def __init__(self, get_json, app_id=None, app_key=None, search_terms=None, base_url=None):
+        """
+        Args:
+            app_id (str): Edamam application ID (default: EDAMAM_APP_ID)
+            app_key (str): Edamam application key (default: EDAMAM_APP_KEY)
+            search_terms (list): One page is fetched per term
+            base_url (str): Override the API endpoint (benchmarks/stubs)
+        """
+        super().__init__(get_json)
+        self.base_url = base_url or self.BASE_URL
+        self.app_id = app_id or os.getenv('EDAMAM_APP_ID')
+        self.app_key = app_key or os.getenv('EDAMAM_APP_KEY')
+        self.search_terms = search_terms or self.SEARCH_TERMS
+
+    def is_configured(self):
+        if not self.app_id or not self.app_key:
+            logger.warning("⚠️  Edamam API keys not found in .env file")
+            logger.info("Sign up at: https://developer.edamam.com/")
+            return False
+        return True
+
+    def discover(self, num_recipes):
+        return iter(self.search_terms)
+
+    def fetch_page(self, term):
+        params = {
+            'type': 'public',
+            'q': term,
+            'app_id': self.app_id,
+            'app_key': self.app_key,
+            'to': 10
+        }
+        data = self.get_json(self.base_url, params=params, timeout=15,
+                             revalidate=self.refresh_listings)
+        recipes = [hit['recipe'] for hit in data.get('hits', [])
+                   if hit['recipe'].get('uri') not in self.skip_ids]
+        self.fetched_ids.update(recipe['uri'] for recipe in recipes if recipe.get('uri'))
+        return recipes
+
+    def normalize(self, recipe):
+        return self.normalize_page([recipe])[0]
+
+    def normalize_page(self, recipes):
+        # Nutrition for the whole page in one vectorized pass
+        nutrition = normalize_nutrition(
+            [{code: (entry.get('quantity'), entry.get('unit'))
+              for code, entry in (recipe.get('totalNutrients') or {}).items()}
+             for recipe in recipes],
+            [recipe.get('yield', 4) for recipe in recipes],
+            self.name,
+        )
+
+        normalized = []
+        for index, recipe in enumerate(recipes):
+            record = {
+                'name': recipe['label'],
+                'ingredients': ' | '.join(recipe.get('ingredientLines', [])),
+                'instructions': recipe.get('url', ''),
+                'meal_type': recipe.get('mealType', ['Dinner'])[0].title(),
+                'cuisine': recipe.get('cuisineType', ['Unknown'])[0].title(),
+                'servings': int(recipe.get('yield', 4)),
+                'prep_time_minutes': 0,
+                'cook_time_minutes': 0,
+                'source': 'Edamam',
+                'source_url': recipe.get('url', ''),
+                'image_url': recipe.get('image', '')
+            }
+            for column, values in nutrition.items():
+                record[column] = values[index]
+            normalized.append(record)
+        return normalized
+
+
+class SpoonacularSource(RecipeSource):
+    """
+    Spoonacular, planned around the daily point budget (free tier: 150 points/day).
+
+    complexSearch only discovers IDs (100 per call, about 2 points), and
+    recipes/informationBulk hydrates up to 100 of them per call with
+    ingredients, nutrition and instructions. A SpoonacularPlanner persists
+    the queue and today's spend, so a run stops when the points are gone
+    and the next day's run picks up where it left off.
+    """
+
+    name = 'Spoonacular'
+    icon = '🥄'
+    stop_on_error = True  # Only bad keys reach the orchestrator; fetch_page requeues the rest
+
+    BASE_URL = 'https://api.spoonacular.com'
+    MEAL_TYPES = {'breakfast': 'Breakfast', 'brunch': 'Breakfast', 'morning meal': 'Breakfast',
+                  'lunch': 'Lunch', 'main course': 'Dinner', 'main dish': 'Dinner',
+                  'dinner': 'Dinner', 'snack': 'Snack', 'dessert': 'Dessert'}
+
+    def __init__(self, get_json, api_key=None, base_url=None, plan_path=None, daily_points=None,
+                 reserve_points=0, planner=None):
+        """
+        Args:
+            api_key (str): Spoonacular key (default: SPOONACULAR_API_KEY)
+            base_url (str): Override the API endpoint (benchmarks/stubs)
+            plan_path (str): Where the fetch plan persists between runs
+                (default: $DATA_DIR/spoonacular_plan.json)
+            daily_points (float): Daily point budget (default:
+                SPOONACULAR_DAILY_POINTS or 150)
+            reserve_points (float): Points left unspent as a safety margin
+            planner (SpoonacularPlanner): Use this planner instead of building one
+        """
+        super().__init__(get_json)
+        self.api_key = api_key or os.getenv('SPOONACULAR_API_KEY')
+        self.base_url = base_url or self.BASE_URL
+        if planner is None:
+            plan_path = plan_path or os.path.join(os.getenv('DATA_DIR', 'data'),
+                                                  'spoonacular_plan.json')
+            daily_points = daily_points or float(os.getenv('SPOONACULAR_DAILY_POINTS', 150))
+            planner = SpoonacularPlanner(plan_path, daily_points=daily_points,
+                                         reserve_points=reserve_points)
+        self.planner = planner
+        # Without an explicit target, take whatever today's points can hydrate
+        self.default_target = planner.estimated_recipes()
+
+    def is_configured(self):
+        if not self.api_key:
+            logger.warning("⚠️  Spoonacular API key not found in .env file")
+            logger.info("Sign up at: https://spoonacular.com/food-api")
+            return False
+        return True
+
+    def discover(self, num_recipes):
+        """
+        Yield lists of recipe IDs to hydrate, searching for more IDs
+        whenever the queue can't fill the next bulk call, until
+        `num_recipes` recipes are fetched or today's points run out.
+        """
+        planner = self.planner
+        fetched_before = planner.fetched
+        searching = True
+        while True:
+            # Pages run one at a time, so the previous chunk has settled here;
+            # IDs from a failed chunk went back to the queue and still count as wanted
+            wanted = num_recipes - (planner.fetched - fetched_before)
+            if wanted <= 0:
+                break
+            chunk = min(wanted, planner.bulk_size)
+            if searching and planner.queued < chunk:
+                search = planner.next_search()
+                if search is not None:
+                    searching = self._search(search)
+                    continue
+
+            ids = planner.take(chunk)
+            if not ids:
+                break
+            yield ids
+
+        planner.save()
+        if wanted > 0 and (planner.queued or not planner.search_exhausted):
+            logger.info(f"💤 Spoonacular stopping at today's point budget; {planner.queued} "
+                        f"recipes queued for the next run")
+
+    def resume(self, num_recipes, pages_done):
+        # The planner already knows which IDs were fetched; don't skip its new chunks
+        return self.discover(num_recipes)
+
+    def _billed_since(self, sent_before, default):
+        """
+        Calls Spoonacular served since `sent_before` (cache hits are 0,
+        billed retries count each). Pages run one at a time, so nothing
+        else is sending for this source meanwhile. `default` when the
+        source has no request counter.
+        """
+        if sent_before is None:
+            return default
+        return self.requests_sent() - sent_before
+
+    def _search(self, search):
+        """Queue one complexSearch page of IDs; False if searching should stop for this run."""
+        params = {'apiKey': self.api_key, 'type': search['type'], 'offset': search['offset'],
+                  'number': search['number']}
+        sent_before = self.requests_sent() if self.requests_sent else None
+        try:
+            data = self.get_json(f'{self.base_url}/recipes/complexSearch', params=params,
+                                 timeout=15)
+        except Exception as e:
+            status = _status(e)
+            if status == 402:
+                self.planner.exhaust()
+            elif status not in (401, 403):  # Rejected keys are not billed
+                self.planner.record_failed_search(self._billed_since(sent_before, 0))
+            logger.warning(f"Spoonacular search {search['type']!r} at {search['offset']} "
+                           f"failed: {e}")
+            return False
+        self.planner.record_search([result['id'] for result in data.get('results', [])],
+                                   billed=self._billed_since(sent_before, 1))
+        return True
+
+    def fetch_page(self, ids):
+        params = {'apiKey': self.api_key, 'ids': ','.join(map(str, ids)),
+                  'includeNutrition': True}
+        sent_before = self.requests_sent() if self.requests_sent else None
+        try:
+            recipes = self.get_json(f'{self.base_url}/recipes/informationBulk', params=params,
+                                    timeout=30)
+        except Exception as e:
+            status = _status(e)
+            if status == 402:
+                # Out of points: keep the IDs for tomorrow and stop for today
+                self.planner.release(ids)
+                self.planner.exhaust()
+                self.planner.save()
+                raise QuotaExceeded("Spoonacular daily points used up (HTTP 402)") from e
+            if status in (401, 403):
+                self.planner.release(ids)
+                self.planner.save()
+                raise
+            # Anything else (retries exhausted, bad payload): requeue and keep going
+            logger.warning(f"Spoonacular bulk fetch of {len(ids)} recipes failed, requeued: {e}")
+            self.planner.record_failure(ids, billed=self._billed_since(sent_before, 0))
+            self.planner.save()
+            return []
+
+        self.planner.record_success(ids, billed=self._billed_since(sent_before, 1))
+        self.planner.save()
+        self.fetched_ids.update(ids)
+        return recipes
+
+    def finish(self):
+        self.planner.save()
+        logger.info(f"🥄 Spoonacular plan: {self.planner.summary()}")
+
+    def normalize(self, recipe):
+        return self.normalize_page([recipe])[0]
+
+    def normalize_page(self, recipes):
+        prep = [recipe.get('preparationMinutes') or 0 for recipe in recipes]
+        cook = [recipe.get('cookingMinutes') or 0 for recipe in recipes]
+
+        # Nutrition for the whole page in one vectorized pass
+        nutrition = normalize_nutrition(
+            [{n['name']: (n.get('amount'), n.get('unit'))
+              for n in (recipe.get('nutrition') or {}).get('nutrients', [])}
+             for recipe in recipes],
+            [recipe.get('servings', 4) for recipe in recipes],
+            self.name, prep, cook,
+        )
+
+        normalized = []
+        for index, recipe in enumerate(recipes):
+            # Parse ingredients
+            ingredients = [ing.get('original', '') for ing in recipe.get('extendedIngredients', [])]
+            cuisines = recipe.get('cuisines') or ['Various']
+
+            record = {
+                'name': recipe['title'],
+                'ingredients': ' | '.join(ingredients),
+                'instructions': self._instructions(recipe),
+                'servings': recipe.get('servings', 4),
+                'prep_time_minutes': prep[index],
+                'cook_time_minutes': cook[index],
+                'meal_type': self._meal_type(recipe.get('dishTypes') or []),
+                'cuisine': cuisines[0].title(),
+                'source': 'Spoonacular',
+                'source_url': recipe.get('sourceUrl', ''),
+                'image_url': recipe.get('image', '')
+            }
+            for column, values in nutrition.items():
+                record[column] = values[index]
+            normalized.append(record)
+        return normalized
+
+    @staticmethod
+    def _instructions(recipe):
+        """Step text from analyzedInstructions, else the HTML instructions as plain text."""
+        steps = [step['step'].strip()
+                 for section in recipe.get('analyzedInstructions') or []
+                 for step in section.get('steps', []) if step.get('step')]
+        if steps:
+            return ' '.join(steps)
+        return re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', ' ', recipe.get('instructions') or '')).strip()
+
+    @classmethod
+    def _meal_type(cls, dish_types):
+        for dish_type in dish_types:
+            if dish_type in cls.MEAL_TYPES:
+                return cls.MEAL_TYPES[dish_type]
+        return 'Dinner'
+
+
+def _status(error):
+    """HTTP status behind a requests error, if any."""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+# Registered sources, run by RecipeAggregator.run_all_sources
+SOURCES = {
+    source.name: source
+    for source in (TheMealDBSource, EdamamSource, SpoonacularSource)
+}
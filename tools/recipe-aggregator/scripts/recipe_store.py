@@ -0,0 +1,507 @@
+"""
+Indexed SQLite Recipe Store
+
+Queryable home for the aggregated corpus, so filtering does not mean
+loading a CSV into a DataFrame every time:
+
+- one row per recipe, upserted on a stable `recipe_key` (source + source
+  URL, or source + normalized name when there is no URL)
+- composite indexes on the filter combinations the React FilterPanel
+  uses (health flags, calories, sodium, total time, source, cuisine)
+- an FTS5 index over name and ingredients, kept in sync by triggers
+- a content hash per row, so diff() can tell new, changed and unchanged
+  recipes apart without comparing every column (see DeltaSink)
+
+Usage:
+    store = RecipeStore('data/recipes.sqlite')
+    store.upsert_many(recipes)
+    rows = store.query(max_calories=600, heart_healthy=True, text='chickpea',
+                       sort='calories', limit=20)
+
+    python scripts/recipe_store.py import recipe_database.csv
+    python scripts/recipe_store.py search --text "chicken curry" --heart-healthy
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+
+from recipe_sink import RECIPE_COLUMNS, RecipeSink
+
+logger = logging.getLogger(__name__)
+
+_INTEGER_COLUMNS = {'prep_time_minutes', 'cook_time_minutes', 'total_time_minutes',
+                    'calories', 'sodium_mg'}
+_REAL_COLUMNS = {'servings', 'protein_g', 'carbs_g', 'fat_g', 'fiber_g', 'sugar_g'}
+_FLAG_COLUMNS = {'is_heart_healthy', 'is_diabetic_friendly', 'is_weeknight_friendly'}
+
+# Frontend sort keys (see src/App.js) -> (column, direction)
+SORTS = {
+    'name': ('name', 'ASC'),
+    'calories': ('calories', 'ASC'),
+    'cookTime': ('total_time_minutes', 'ASC'),
+    'protein': ('protein_g', 'DESC'),
+}
+
+# Numeric filter/sort columns carried by every filter index, so counts and
+# the id-only first phase of query() never touch the table
+_COVERED = ('calories', 'sodium_mg', 'total_time_minutes', 'protein_g')
+_FLAGS = ('is_heart_healthy', 'is_diabetic_friendly', 'is_weeknight_friendly')
+
+_INDEXES = {
+    # Checkboxes narrow first, the sliders range within them
+    'idx_recipes_health': _FLAGS + _COVERED,
+    'idx_recipes_source': ('source',) + _COVERED + _FLAGS,
+    'idx_recipes_cuisine': ('cuisine',) + _COVERED + _FLAGS,
+    # Slider-only queries lead with whichever range the planner prefers
+    'idx_recipes_calories': _COVERED + _FLAGS,
+    'idx_recipes_sodium': ('sodium_mg', 'calories', 'total_time_minutes', 'protein_g') + _FLAGS,
+    'idx_recipes_time': ('total_time_minutes', 'calories', 'sodium_mg', 'protein_g') + _FLAGS,
+    # Sort orders, with id as the keyset pagination tie-breaker
+    # Name order carries the filter columns too: walking it and filtering in
+    # the index finds a page without a table lookup per candidate
+    'idx_recipes_name': ('name', 'id', 'source') + _COVERED + _FLAGS,
+    'idx_recipes_protein': ('protein_g', 'id'),
+}
+
+_WORD = re.compile(r'\w+')
+
+
+def recipe_key(recipe):
+    """
+    Stable identity for a recipe across runs.
+
+    Returns:
+        str: 16-hex-digit key from source + source URL (or normalized name)
+    """
+    source = recipe.get('source') or ''
+    identity = recipe.get('source_url') or ' '.join(_WORD.findall((recipe.get('name') or '').lower()))
+    return hashlib.sha1(f"{source}\x00{identity}".encode('utf-8')).hexdigest()[:16]
+
+
+def content_hash(values):
+    """Fingerprint of a stored row's column values (everything but the key)."""
+    return hashlib.sha1(json.dumps(values, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every word must appear (prefix match)."""
+    return ' '.join(f'"{word}"*' for word in _WORD.findall(text.lower()))
+
+
+class RecipeStore:
+    """SQLite-backed recipe table with filter indexes and full-text search."""
+
+    def __init__(self, path='data/recipes.sqlite'):
+        """
+        Args:
+            path (str): Database file (':memory:' for a throwaway store)
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._create_schema()
+
+    # ===== CONNECTIONS =====
+    @property
+    def connection(self):
+        """One connection per thread (readers never block each other in WAL mode)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _create_schema(self):
+        def column_type(column):
+            if column in _INTEGER_COLUMNS or column in _FLAG_COLUMNS:
+                return 'INTEGER'
+            if column in _REAL_COLUMNS:
+                return 'REAL'
+            return 'TEXT'
+
+        columns = ',\n'.join(f'    {column} {column_type(column)}' for column in RECIPE_COLUMNS)
+        conn = self.connection
+        with conn:
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS recipes (
+                    id INTEGER PRIMARY KEY,
+                    recipe_key TEXT NOT NULL UNIQUE,
+                    {columns},
+                    content_hash TEXT,
+                    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )''')
+            existing = {row['name'] for row in conn.execute('PRAGMA table_info(recipes)')}
+            if 'content_hash' not in existing:
+                # Stores created before delta sync; rows get a hash on their next upsert
+                conn.execute('ALTER TABLE recipes ADD COLUMN content_hash TEXT')
+            for name, index_columns in _INDEXES.items():
+                conn.execute(f'CREATE INDEX IF NOT EXISTS {name} '
+                             f'ON recipes ({", ".join(index_columns)})')
+
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+                    name, ingredients, content='recipes', content_rowid='id',
+                    tokenize='porter unicode61 remove_diacritics 2'
+                )''')
+            conn.executescript('''
+                CREATE TRIGGER IF NOT EXISTS recipes_fts_insert AFTER INSERT ON recipes BEGIN
+                    INSERT INTO recipes_fts(rowid, name, ingredients)
+                    VALUES (new.id, new.name, new.ingredients);
+                END;
+                CREATE TRIGGER IF NOT EXISTS recipes_fts_delete AFTER DELETE ON recipes BEGIN
+                    INSERT INTO recipes_fts(recipes_fts, rowid, name, ingredients)
+                    VALUES ('delete', old.id, old.name, old.ingredients);
+                END;
+                CREATE TRIGGER IF NOT EXISTS recipes_fts_update AFTER UPDATE ON recipes BEGIN
+                    INSERT INTO recipes_fts(recipes_fts, rowid, name, ingredients)
+                    VALUES ('delete', old.id, old.name, old.ingredients);
+                    INSERT INTO recipes_fts(rowid, name, ingredients)
+                    VALUES (new.id, new.name, new.ingredients);
+                END;
+            ''')
+
+    # ===== WRITES =====
+    def upsert_many(self, recipes):
+        """
+        Insert or update recipes in one transaction.
+
+        Args:
+            recipes (iterable): Normalized recipe dicts (RECIPE_COLUMNS keys)
+
+        Returns:
+            int: Rows written
+        """
+        columns = RECIPE_COLUMNS + ['content_hash']
+        placeholders = ', '.join('?' for _ in range(len(columns) + 1))
+        updates = ', '.join(f'{column} = excluded.{column}' for column in columns)
+        sql = (f'INSERT INTO recipes (recipe_key, {", ".join(columns)}) '
+               f'VALUES ({placeholders}) '
+               f'ON CONFLICT(recipe_key) DO UPDATE SET {updates}, '
+               f'updated_at = CURRENT_TIMESTAMP')
+
+        rows = []
+        for recipe in recipes:
+            row = self._row(recipe)
+            rows.append(row + [content_hash(row[1:])])
+        with self._write_lock:
+            conn = self.connection
+            with conn:
+                conn.executemany(sql, rows)
+        return len(rows)
+
+    def upsert(self, recipe):
+        return self.upsert_many([recipe])
+
+    def diff(self, recipes, chunk_size=500):
+        """
+        Split a batch into recipes the store lacks, has in another version,
+        or already holds exactly.
+
+        Args:
+            recipes (iterable): Normalized recipe dicts
+            chunk_size (int): Keys looked up per query
+
+        Returns:
+            tuple: (new, changed, unchanged) lists of recipes
+        """
+        new, changed, unchanged = [], [], []
+        recipes = list(recipes)
+        conn = self.connection
+        for start in range(0, len(recipes), chunk_size):
+            chunk = recipes[start:start + chunk_size]
+            rows = [self._row(recipe) for recipe in chunk]
+            keys = [row[0] for row in rows]
+            stored = dict(conn.execute(
+                f'SELECT recipe_key, content_hash FROM recipes '
+                f'WHERE recipe_key IN ({", ".join("?" for _ in keys)})', keys).fetchall())
+            for recipe, row in zip(chunk, rows):
+                if row[0] not in stored:
+                    new.append(recipe)
+                elif stored[row[0]] != content_hash(row[1:]):
+                    changed.append(recipe)
+                else:
+                    unchanged.append(recipe)
+        return new, changed, unchanged
+
+    def analyze(self):
+        """Refresh planner statistics (run after large loads)."""
+        with self._write_lock:
+            self.connection.execute('ANALYZE')
+
+    @staticmethod
+    def _row(recipe):
+        values = [recipe_key(recipe)]
+        for column in RECIPE_COLUMNS:
+            value = recipe.get(column)
+            if column in _FLAG_COLUMNS:
+                # Never NULL, so the flag IN (0, 1) index clauses match every row
+                value = int(bool(value)) if value == value else 0
+            values.append(value)
+        return values
+
+    # ===== READS =====
+    def _where(self, text=None, max_calories=None, max_sodium=None, max_time=None,
+               heart_healthy=False, diabetic_friendly=False, weeknight_friendly=False,
+               source=None, cuisine=None):
+        clauses, params = [], []
+
+        # When any checkbox is set, constrain all three flags (unset ones to
+        # IN (0, 1)) so the whole composite health index prefix is usable
+        flags = (heart_healthy, diabetic_friendly, weeknight_friendly)
+        if any(flags):
+            for flag, column in zip(flags, _FLAGS):
+                clauses.append(f'{column} = 1' if flag else f'{column} IN (0, 1)')
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        if cuisine:
+            clauses.append('cuisine = ?')
+            params.append(cuisine)
+        for limit, column in ((max_calories, 'calories'), (max_sodium, 'sodium_mg'),
+                              (max_time, 'total_time_minutes')):
+            if limit is not None:
+                clauses.append(f'{column} <= ?')
+                params.append(limit)
+        if text:
+            match = fts_query(text)
+            if match:
+                clauses.append('id IN (SELECT rowid FROM recipes_fts WHERE recipes_fts MATCH ?)')
+                params.append(match)
+
+        return clauses, params
+
+    def query(self, sort='name', limit=50, after=None, columns=None, **filters):
+        """
+        Filtered, sorted page of recipes.
+
+        Args:
+            sort (str): One of SORTS ('name', 'calories', 'cookTime', 'protein')
+            limit (int): Page size
+            after (tuple): Keyset cursor (sort value, id) of the last row on
+                the previous page; None for the first page. Recipes with
+                no sort value (e.g. unknown calories) come last in either
+                direction, so the sort value may be None
+            columns (list): Columns to return (default: all recipe columns)
+            **filters: text, max_calories, max_sodium, max_time,
+                heart_healthy, diabetic_friendly, weeknight_friendly,
+                source, cuisine
+
+        Returns:
+            list: Rows as dicts (each includes 'id')
+        """
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort '{sort}' (use one of: {', '.join(SORTS)})")
+        sort_column, direction = SORTS[sort]
+
+        clauses, params = self._where(**filters)
+        if after is not None:
+            value, last_id = after
+            if value is None:
+                # Already in the trailing NULL block: only id moves on
+                clauses.append(f'({sort_column} IS NULL AND id > ?)')
+                params.append(last_id)
+            else:
+                comparison = '>' if direction == 'ASC' else '<'
+                clauses.append(f'({sort_column} {comparison} ? OR ({sort_column} = ? AND id > ?)'
+                               f' OR {sort_column} IS NULL)')
+                params.extend([value, value, last_id])
+
+        # Deferred join: pick the page's ids from the (covering) indexes
+        # first, then read full rows for just those ids
+        selected = ', '.join(['id'] + list(columns or RECIPE_COLUMNS))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        order = f'ORDER BY {sort_column} {direction} NULLS LAST, id ASC'
+        sql = (f'SELECT {selected} FROM recipes WHERE id IN '
+               f'(SELECT id FROM recipes {where} {order} LIMIT ?) {order}')
+        rows = self.connection.execute(sql, params + [limit]).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def count(self, **filters):
+        """Number of recipes matching the same filters as query()."""
+        clauses, params = self._where(**filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return self.connection.execute(f'SELECT COUNT(*) FROM recipes {where}', params).fetchone()[0]
+
+    def get(self, recipe_id):
+        row = self.connection.execute('SELECT * FROM recipes WHERE id = ?', (recipe_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def version(self):
+        """
+        Cheap change marker for caches: the database and WAL file mtimes.
+
+        Any committed write (from this or another process) changes it.
+        """
+        if self.path == ':memory:':
+            return None
+        stamps = []
+        for suffix in ('', '-wal'):
+            try:
+                stamps.append(os.stat(self.path + suffix).st_mtime_ns)
+            except FileNotFoundError:
+                stamps.append(0)
+        return tuple(stamps)
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM recipes').fetchone()[0]
+
+    @staticmethod
+    def _to_dict(row):
+        record = dict(row)
+        for column in _FLAG_COLUMNS & record.keys():
+            if record[column] is not None:
+                record[column] = bool(record[column])
+        return record
+
+
+class SQLiteSink(RecipeSink):
+    """Upserts recipes into a RecipeStore in batched transactions."""
+
+    def __init__(self, path, batch_size=500):
+        super().__init__(path)
+        self.store = RecipeStore(path)
+        self._batch_size = batch_size
+        self._batch = []
+
+    def _write(self, row):
+        self._batch.append(row)
+        if len(self._batch) >= self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._batch:
+            self.store.upsert_many(self._batch)
+            self._batch = []
+
+    def close(self):
+        if self.store is not None:
+            self._flush()
+            self.store.analyze()
+            self.store.close()
+            self.store = None
+
+
+class DeltaSink(RecipeSink):
+    """
+    Writes only what differs from a RecipeStore: each batch is diffed
+    against the store, new and changed recipes are upserted and forwarded
+    to the downstream sinks, and unchanged ones are dropped.
+    """
+
+    def __init__(self, path, downstream=None, batch_size=500):
+        """
+        Args:
+            path (str): RecipeStore database file
+            downstream (list): Sinks that receive new and changed recipes only
+            batch_size (int): Recipes diffed and upserted per transaction
+        """
+        super().__init__(path)
+        self.store = RecipeStore(path)
+        self.downstream = list(downstream or [])
+        self.new = Counter()      # Per source
+        self.changed = Counter()  # Per source
+        self.unchanged = 0
+        self._batch_size = batch_size
+        self._batch = []
+
+    def _write(self, row):
+        self._batch.append(row)
+        if len(self._batch) >= self._batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._batch:
+            return
+        new, changed, unchanged = self.store.diff(self._batch)
+        self._batch = []
+        self.new.update(recipe.get('source') for recipe in new)
+        self.changed.update(recipe.get('source') for recipe in changed)
+        self.unchanged += len(unchanged)
+        delta = new + changed
+        if delta:
+            self.store.upsert_many(delta)
+            for sink in self.downstream:
+                for recipe in delta:
+                    sink.write(recipe)
+
+    def close(self):
+        if self.store is not None:
+            self._flush()
+            if self.new or self.changed:
+                self.store.analyze()
+            self.store.close()
+            self.store = None
+            for sink in self.downstream:
+                sink.close()
+
+
+# ===== MAIN EXECUTION =====
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description='Load and query the SQLite recipe store')
+    parser.add_argument('--db', default=os.path.join(os.getenv('DATA_DIR', 'data'), 'recipes.sqlite'))
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('import', help='Upsert recipes from a CSV')
+    load.add_argument('csv')
+
+    search = commands.add_parser('search', help='Run a filter query')
+    search.add_argument('--text')
+    search.add_argument('--max-calories', type=int)
+    search.add_argument('--max-sodium', type=int)
+    search.add_argument('--max-time', type=int)
+    search.add_argument('--heart-healthy', action='store_true')
+    search.add_argument('--diabetic-friendly', action='store_true')
+    search.add_argument('--weeknight-friendly', action='store_true')
+    search.add_argument('--source')
+    search.add_argument('--sort', default='name', choices=list(SORTS))
+    search.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    store = RecipeStore(args.db)
+
+    if args.command == 'import':
+        df = pd.read_csv(args.csv).reindex(columns=RECIPE_COLUMNS)
+        records = df.astype(object).where(df.notna(), None).to_dict('records')
+        written = store.upsert_many(records)
+        store.analyze()
+        print(f"✅ Upserted {written} recipes into {args.db} ({len(store)} total)")
+    else:
+        filters = {key: getattr(args, key) for key in (
+            'text', 'max_calories', 'max_sodium', 'max_time', 'heart_healthy',
+            'diabetic_friendly', 'weeknight_friendly', 'source')}
+        start = time.perf_counter()
+        rows = store.query(sort=args.sort, limit=args.limit,
+                           columns=['name', 'source', 'calories', 'sodium_mg',
+                                    'total_time_minutes'], **filters)
+        elapsed = (time.perf_counter() - start) * 1000
+        for row in rows:
+            print(f"{row['name']:<45}{row['source']:<13}{row['calories'] or 0:>6} kcal"
+                  f"{row['sodium_mg'] or 0:>7} mg{row['total_time_minutes'] or 0:>5} min")
+        print(f"\n{len(rows)} of {store.count(**filters)} matches in {elapsed:.1f} ms")
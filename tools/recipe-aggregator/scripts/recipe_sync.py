@@ -0,0 +1,323 @@
+"""
+Incremental Recipe Sync
+
+Long-running alternative to the one-shot aggregator run: each source is
+polled on its own interval for records it has not seen yet, and only
+recipes that are new or changed relative to the local RecipeStore are
+written and pushed downstream.
+
+- known IDs per source (TheMealDB meal IDs, Edamam recipe URIs,
+  Spoonacular IDs) and last-sync markers live in `$DATA_DIR/sync/state.json`
+- discovery listings are revalidated (ETag, so unchanged ones cost a 304)
+  instead of trusted from the 30-day response cache, and known IDs are
+  skipped, so a steady-state TheMealDB poll is 15 small requests and no
+  lookups
+- the near-duplicate index persists across cycles, so a new record that
+  matches one synced earlier from another source is still dropped, while
+  a re-fetch of the same record reaches the delta check
+- every `full_every` a source is re-walked without skipping known IDs
+  (details come from the response cache within their TTLs); the store's
+  content hashes turn that into a delta of changed recipes only
+- each cycle's delta is written to `$DATA_DIR/sync/deltas/` as JSON Lines,
+  added to the ingredient index and, with --salesforce, bulk upserted into
+  Meal__c (salesforce_loader.py)
+
+Runs on the `schedule` package when installed (falls back to a plain
+sleep loop).
+
+Usage:
+    python scripts/recipe_sync.py --once              # one cycle of every due source
+    python scripts/recipe_sync.py --once --full       # full refresh now
+    python scripts/recipe_sync.py                     # daemon, checks every 15 minutes
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import time
+
+from dotenv import load_dotenv
+
+from dedup_index import NearDuplicateIndex
+from ingredient_index import IngredientIndexSink
+from rate_limiter import RequestScheduler
+from recipe_aggregator import RecipeAggregator
+from recipe_sink import JsonLinesSink
+from recipe_sources import SOURCES
+from recipe_store import DeltaSink
+from request_coalescer import RequestCoalescer
+from response_cache import ResponseCache
+from salesforce_loader import BulkApiClient, SalesforceBulkSink
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+
+# How often each source is polled for new records
+SYNC_INTERVALS = {
+    'TheMealDB': datetime.timedelta(hours=6),
+    'Edamam': datetime.timedelta(hours=24),
+    'Spoonacular': datetime.timedelta(hours=24),  # The planner spends each day's points once
+}
+
+# How often each source is re-walked in full to pick up edited recipes
+FULL_REFRESH_EVERY = datetime.timedelta(days=7)
+
+
+class SyncState:
+    """Known record IDs and last-sync times per source, persisted as JSON."""
+
+    def __init__(self, path=None, now=None):
+        """
+        Args:
+            path (str): JSON state file (None = in-memory only)
+            now (callable): Returns the current datetime (tests/benchmarks)
+        """
+        self.path = path
+        self.now = now or datetime.datetime.now
+        self.sources = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.sources = json.load(f).get('sources', {})
+
+    def _entry(self, source):
+        return self.sources.setdefault(source, {'ids': [], 'last_sync': None,
+                                                'last_full_sync': None, 'cycles': 0,
+                                                'new': 0, 'changed': 0})
+
+    def known_ids(self, source):
+        return set(self._entry(source)['ids'])
+
+    def last_sync(self, source, full=False):
+        stamp = self._entry(source)['last_full_sync' if full else 'last_sync']
+        return datetime.datetime.fromisoformat(stamp) if stamp else None
+
+    def is_due(self, source, interval):
+        """True if `source` has never synced or last synced `interval` ago."""
+        last = self.last_sync(source)
+        return last is None or self.now() - last >= interval
+
+    def needs_full_refresh(self, source, every):
+        last = self.last_sync(source, full=True)
+        return last is None or self.now() - last >= every
+
+    def record(self, source, fetched_ids, full=False, new=0, changed=0):
+        """
+        Mark a completed sync of `source`.
+
+        Args:
+            fetched_ids (iterable): Native IDs fetched this cycle
+            full (bool): The cycle re-walked everything
+            new (int): Recipes added to the store
+            changed (int): Recipes updated in the store
+        """
+        entry = self._entry(source)
+        entry['ids'] = sorted(set(entry['ids']) | {str(i) for i in fetched_ids})
+        stamp = self.now().isoformat(timespec='seconds')
+        entry['last_sync'] = stamp
+        if full:
+            entry['last_full_sync'] = stamp
+        entry['cycles'] += 1
+        entry['new'] += new
+        entry['changed'] += changed
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'sources': self.sources}, f)
+        os.replace(tmp, self.path)
+
+
+class RecipeSync:
+    """Runs incremental sync cycles against one RecipeStore."""
+
+    def __init__(self, store_path, state=None, sync_dir=None, scheduler=None, cache=None,
+                 ingredient_index=None, intervals=None, full_every=FULL_REFRESH_EVERY,
+                 max_new=1000, source_options=None, mealdb_base_url=None,
+                 salesforce_client=None):
+        """
+        Args:
+            store_path (str): RecipeStore the delta is computed against
+            state (SyncState): Known IDs and markers (default: sync_dir/state.json)
+            sync_dir (str): Dedup index, state and per-cycle delta files
+                (default: $DATA_DIR/sync)
+            scheduler (RequestScheduler): Shared across cycles so daily quotas hold
+            cache (ResponseCache): Response cache (None = always fetch)
+            ingredient_index (str): IngredientIndex file fed with the delta (None = skip)
+            intervals (dict): Source name -> poll interval (default: SYNC_INTERVALS)
+            full_every (timedelta): Full refresh interval per source
+            max_new (int): Cap on new records fetched per source per cycle
+            source_options (dict): Source name -> constructor options
+            mealdb_base_url (str): Override TheMealDB endpoint (benchmarks/stubs)
+            salesforce_client (BulkApiClient): Also upsert each delta into Meal__c
+        """
+        self.store_path = store_path
+        self.sync_dir = sync_dir or os.path.join(DATA_DIR, 'sync')
+        self.state = state or SyncState(os.path.join(self.sync_dir, 'state.json'))
+        self.scheduler = scheduler or RequestScheduler()
+        self.cache = cache
+        self.ingredient_index = ingredient_index
+        self.intervals = intervals or SYNC_INTERVALS
+        self.full_every = full_every
+        self.max_new = max_new
+        self.source_options = source_options or {}
+        self.mealdb_base_url = mealdb_base_url
+        self.lookups = RequestCoalescer()  # TheMealDB meals resolved in earlier cycles
+        self.salesforce_client = salesforce_client
+
+    def due_sources(self):
+        return [name for name in SOURCES
+                if self.state.is_due(name, self.intervals.get(name, datetime.timedelta(hours=24)))]
+
+    def run_once(self, sources=None, full=None):
+        """
+        One sync cycle.
+
+        Args:
+            sources (list): Source names to poll (default: the due ones)
+            full (bool): Force (True) or suppress (False) a full refresh;
+                None refreshes the sources whose full_every has elapsed
+
+        Returns:
+            dict: Cycle summary (sources, new, changed, unchanged, requests, seconds)
+        """
+        sources = self.due_sources() if sources is None else sources
+        if not sources:
+            logger.info("💤 No sources due for sync")
+            return {'sources': [], 'new': 0, 'changed': 0, 'unchanged': 0,
+                    'requests': 0, 'seconds': 0.0}
+
+        start = time.perf_counter()
+        requests_before = sum(self.scheduler.usage().values())
+        refresh = {name: full if full is not None
+                   else self.state.needs_full_refresh(name, self.full_every)
+                   for name in sources}
+
+        stamp = self.state.now().strftime('%Y%m%d_%H%M%S')
+        downstream = [JsonLinesSink(os.path.join(self.sync_dir, 'deltas', f'delta_{stamp}.jsonl'))]
+        if self.ingredient_index:
+            downstream.append(IngredientIndexSink(self.ingredient_index))
+        if self.salesforce_client is not None:
+            downstream.append(SalesforceBulkSink(
+                self.salesforce_client,
+                failures_path=os.path.join(self.sync_dir, 'deltas', f'salesforce_failures_{stamp}.csv')))
+        sink = DeltaSink(self.store_path, downstream=downstream)
+        dedup_index = NearDuplicateIndex(path=os.path.join(self.sync_dir, 'dedup_index.sqlite'))
+
+        if refresh.get('TheMealDB'):
+            self.lookups.clear()  # A full refresh must see edited meals, not the memo
+        aggregator = RecipeAggregator(mealdb_base_url=self.mealdb_base_url,
+                                      scheduler=self.scheduler, cache=self.cache,
+                                      sink=sink, dedup_index=dedup_index, allow_refetch=True,
+                                      lookups=self.lookups)
+        runs = [self._create_source(aggregator, name, refresh[name]) for name in sources]
+        targets = {name: self.max_new for name in sources if name != 'Spoonacular'}
+        aggregator.run_all_sources(targets=targets, sources=runs)
+        aggregator.close()
+
+        for source in runs:
+            self.state.record(source.name, source.fetched_ids, full=refresh[source.name],
+                              new=sink.new[source.name], changed=sink.changed[source.name])
+        self.state.save()
+
+        summary = {
+            'sources': sources,
+            'full': [name for name in sources if refresh[name]],
+            'new': sum(sink.new.values()),
+            'changed': sum(sink.changed.values()),
+            'unchanged': sink.unchanged,
+            'requests': sum(self.scheduler.usage().values()) - requests_before,
+            'seconds': round(time.perf_counter() - start, 2),
+        }
+        logger.info(f"🔄 Sync of {', '.join(sources)}: {summary['new']} new, "
+                    f"{summary['changed']} changed, {summary['unchanged']} unchanged "
+                    f"({summary['requests']} API requests, {summary['seconds']:.1f}s)")
+        return summary
+
+    def _create_source(self, aggregator, name, full):
+        options = dict(self.source_options.get(name, {}))
+        if name == 'TheMealDB':
+            # Every unseen meal in every category, capped per cycle at discovery
+            # so no fetched meal is left unconsumed
+            options.setdefault('per_category', None)
+            options.setdefault('max_lookups', self.max_new)
+        source = aggregator.create_source(name, **options)
+        source.refresh_listings = True
+        if not full:
+            source.skip_ids = self.state.known_ids(name)
+        return source
+
+    def run_forever(self, check_every_minutes=15):
+        """Run due sources every `check_every_minutes` until interrupted."""
+        def cycle():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Sync cycle failed: {e}")
+
+        logger.info(f"🔁 Sync daemon started (checking every {check_every_minutes} min)")
+        cycle()
+        try:
+            import schedule
+        except ImportError:
+            logger.warning("⚠️  schedule not installed (pip install schedule); using a sleep loop")
+            while True:
+                time.sleep(check_every_minutes * 60)
+                cycle()
+
+        schedule.every(check_every_minutes).minutes.do(cycle)
+        while True:
+            schedule.run_pending()
+            time.sleep(min(60, check_every_minutes * 60))
+
+
+# ===== MAIN EXECUTION =====
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Incrementally sync new and changed recipes')
+    parser.add_argument('--store', default=os.path.join(DATA_DIR, 'recipes.sqlite'),
+                        help='RecipeStore the delta is computed against')
+    parser.add_argument('--sync-dir', default=os.path.join(DATA_DIR, 'sync'),
+                        help='Sync state, dedup index and per-cycle delta files')
+    parser.add_argument('--ingredient-index',
+                        default=os.path.join(DATA_DIR, 'ingredient_index.sqlite'),
+                        help="Inverted ingredient index updated with each delta ('' to skip)")
+    parser.add_argument('--once', action='store_true', help='Run one cycle and exit')
+    parser.add_argument('--sources', nargs='+', choices=list(SOURCES), default=None,
+                        help='Sources to poll (default: whichever are due)')
+    parser.add_argument('--full', action='store_true',
+                        help='Re-walk every record now to pick up edits')
+    parser.add_argument('--every', type=int, default=15,
+                        help='Daemon: minutes between checks for due sources')
+    parser.add_argument('--max-new', type=int, default=1000,
+                        help='Cap on new records per source per cycle')
+    parser.add_argument('--spoonacular-plan', default=os.path.join(DATA_DIR, 'spoonacular_plan.json'))
+    parser.add_argument('--salesforce', action='store_true',
+                        help='Bulk upsert each delta into Meal__c (SF_* credentials in .env)')
+    args = parser.parse_args()
+
+    sync = RecipeSync(
+        args.store,
+        sync_dir=args.sync_dir,
+        scheduler=RequestScheduler(usage_path=os.path.join(DATA_DIR, 'api_usage.json')),
+        cache=ResponseCache(os.path.join(DATA_DIR, 'http_cache.sqlite')),
+        ingredient_index=args.ingredient_index or None,
+        max_new=args.max_new,
+        source_options={'Spoonacular': {'plan_path': args.spoonacular_plan}},
+        salesforce_client=BulkApiClient.from_env() if args.salesforce else None,
+    )
+    if args.once:
+        sync.run_once(sources=args.sources, full=True if args.full else None)
+    else:
+        sync.run_forever(args.every)
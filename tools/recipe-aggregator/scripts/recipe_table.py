@@ -0,0 +1,284 @@
+"""
+Compact In-Memory Recipe Table
+
+Struct-of-arrays replacement for a list of recipe dicts (what
+RecipeAggregator keeps when no streaming sink is given). A dict per
+recipe costs a 22-slot hash table plus a boxed object per number on top
+of the text itself; here each column is stored once for the whole table:
+
+- text (name, ingredients, instructions, URLs): UTF-8 packed end to end
+  and zlib-compressed in blocks of 64 recipes (recipe text repeats a lot
+  across recipes: step phrasing, units, URL prefixes), plus one null bit
+  per recipe so a missing value comes back as None rather than ''
+- cuisine, meal_type, source: uint16 codes into an interned category list
+  ('Dinner', 'TheMealDB', 'Unknown' are stored once)
+- nutrition and time columns: one float32 block (NaN = missing), decoded
+  back to each column's int/rounding on the way out
+- health flags: one bit each in a uint8 array
+
+Records go in and come out as plain dicts, so callers iterate it like the
+list it replaces; to_dataframe() builds columns straight from the arrays.
+
+Usage:
+    table = RecipeTable()
+    table.append(recipe)
+    for recipe in table: ...
+    df = table.to_dataframe()
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import zlib
+from array import array
+
+import numpy as np
+import pandas as pd
+
+from nutrition import NUTRIENTS
+from recipe_parquet import DICTIONARY_COLUMNS, FLOAT_COLUMNS, INTEGER_COLUMNS
+from recipe_sink import RECIPE_COLUMNS
+
+FLAG_COLUMNS = ('is_heart_healthy', 'is_diabetic_friendly', 'is_weeknight_friendly')
+NUMERIC_COLUMNS = INTEGER_COLUMNS + FLOAT_COLUMNS
+TEXT_COLUMNS = tuple(column for column in RECIPE_COLUMNS
+                     if column not in DICTIONARY_COLUMNS + NUMERIC_COLUMNS + FLAG_COLUMNS)
+
+# Decimal places float columns are rounded to (float32 keeps ~7 significant digits)
+DECIMALS = {nutrient.column: nutrient.decimals for nutrient in NUTRIENTS
+            if nutrient.decimals is not None}
+DECIMALS['servings'] = 2
+
+# Records per compressed text block: big enough for zlib to find the
+# repetition across recipes, small enough that one lookup stays cheap
+TEXT_BLOCK_SIZE = 64
+TEXT_COMPRESSION_LEVEL = 6
+
+_NAN = float('nan')
+_NUMERIC_INDEX = {column: i for i, column in enumerate(NUMERIC_COLUMNS)}
+
+
+class _TextColumn:
+    """
+    Strings packed end to end as UTF-8, sealed into zlib blocks of
+    TEXT_BLOCK_SIZE records; the open block at the end stays uncompressed.
+    None is stored as an empty string with its bit set in `nulls`.
+    """
+
+    __slots__ = ('blocks', 'tail', 'ends', 'nulls', '_cached')
+
+    def __init__(self):
+        self.blocks = []             # Compressed, sealed blocks
+        self.tail = bytearray()      # The open block
+        self.ends = array('I')       # Per record: end offset within its block
+        self.nulls = bytearray()     # One bit per record: value was None
+        self._cached = (None, b'')   # (block number, decompressed bytes)
+
+    def append(self, value):
+        index = len(self.ends)
+        if index % 8 == 0:
+            self.nulls.append(0)
+        if value is None:
+            self.nulls[index >> 3] |= 1 << (index & 7)
+        elif value:
+            self.tail += str(value).encode('utf-8')
+        self.ends.append(len(self.tail))
+        if len(self.ends) % TEXT_BLOCK_SIZE == 0:
+            self.blocks.append(zlib.compress(bytes(self.tail), TEXT_COMPRESSION_LEVEL))
+            self.tail = bytearray()
+
+    def _block(self, number):
+        if number == len(self.blocks):
+            return self.tail
+        cached_number, raw = self._cached
+        if cached_number != number:
+            raw = zlib.decompress(self.blocks[number])
+            self._cached = (number, raw)
+        return raw
+
+    def is_null(self, index):
+        return bool(self.nulls[index >> 3] >> (index & 7) & 1)
+
+    def get(self, index):
+        if self.is_null(index):
+            return None
+        start = self.ends[index - 1] if index % TEXT_BLOCK_SIZE else 0
+        return bytes(self._block(index // TEXT_BLOCK_SIZE)[start:self.ends[index]]).decode('utf-8')
+
+    def values(self):
+        values, ends = [], self.ends
+        for number in range(len(self.blocks) + 1):
+            raw = zlib.decompress(self.blocks[number]) if number < len(self.blocks) else bytes(self.tail)
+            start = 0
+            for index in range(number * TEXT_BLOCK_SIZE, min(len(ends), (number + 1) * TEXT_BLOCK_SIZE)):
+                values.append(None if self.is_null(index) else raw[start:ends[index]].decode('utf-8'))
+                start = ends[index]
+        return values
+
+    @property
+    def nbytes(self):
+        return (sum(len(block) for block in self.blocks) + len(self.tail)
+                + self.ends.itemsize * len(self.ends) + len(self.nulls))
+
+
+class _CategoryColumn:
+    """uint16 codes into a list of distinct values (None is a value too)."""
+
+    __slots__ = ('codes', 'categories', 'lookup')
+
+    def __init__(self):
+        self.codes = array('H')
+        self.categories = []
+        self.lookup = {}
+
+    def append(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def get(self, index):
+        return self.categories[self.codes[index]]
+
+    def values(self):
+        categories = self.categories
+        return [categories[code] for code in self.codes]
+
+    def categorical(self):
+        """Codes as a pd.Categorical (None becomes the missing code -1)."""
+        remap = np.array([-1 if value is None else i for i, value in enumerate(self.categories)],
+                         dtype=np.int32)
+        remap[remap >= 0] = np.arange((remap >= 0).sum(), dtype=np.int32)
+        codes = remap[np.frombuffer(self.codes, dtype=np.uint16)] if self.codes else []
+        return pd.Categorical.from_codes(
+            codes, categories=[value for value in self.categories if value is not None])
+
+    @property
+    def nbytes(self):
+        return self.codes.itemsize * len(self.codes)
+
+
+class RecipeTable:
+    """Append-only, columnar collection of recipes (see module docstring)."""
+
+    def __init__(self, capacity=1024):
+        """
+        Args:
+            capacity (int): Initial rows reserved in the numeric block (it doubles as needed)
+        """
+        self._size = 0
+        self._text = {column: _TextColumn() for column in TEXT_COLUMNS}
+        self._categories = {column: _CategoryColumn() for column in DICTIONARY_COLUMNS}
+        self._numbers = np.full((capacity, len(NUMERIC_COLUMNS)), np.nan, dtype=np.float32)
+        self._flags = bytearray()
+
+    def __len__(self):
+        return self._size
+
+    # ===== WRITES =====
+    def append(self, recipe):
+        """Add one recipe dict (RECIPE_COLUMNS keys; missing ones come back as None, or False for flags)."""
+        if self._size == len(self._numbers):
+            grown = np.full((len(self._numbers) * 2, len(NUMERIC_COLUMNS)), np.nan, dtype=np.float32)
+            grown[:self._size] = self._numbers
+            self._numbers = grown
+
+        for column, text in self._text.items():
+            text.append(recipe.get(column))
+        for column, categories in self._categories.items():
+            categories.append(recipe.get(column))
+
+        self._numbers[self._size] = [_NAN if recipe.get(column) is None else recipe[column]
+                                     for column in NUMERIC_COLUMNS]
+
+        bits = 0
+        for bit, column in enumerate(FLAG_COLUMNS):
+            if recipe.get(column):
+                bits |= 1 << bit
+        self._flags.append(bits)
+        self._size += 1
+
+    def extend(self, recipes):
+        for recipe in recipes:
+            self.append(recipe)
+
+    # ===== READS =====
+    def __getitem__(self, index):
+        """Recipe `index` as a dict (negative indexes count from the end)."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('recipe index out of range')
+
+        recipe = {}
+        for column in RECIPE_COLUMNS:
+            if column in self._text:
+                recipe[column] = self._text[column].get(index)
+            elif column in self._categories:
+                recipe[column] = self._categories[column].get(index)
+            elif column in _NUMERIC_INDEX:
+                recipe[column] = _decode_number(column, self._numbers[index, _NUMERIC_INDEX[column]])
+            else:
+                recipe[column] = bool(self._flags[index] >> FLAG_COLUMNS.index(column) & 1)
+        return recipe
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self[index]
+
+    def column(self, name):
+        """One column for every recipe, as a list."""
+        if name in self._text:
+            return self._text[name].values()
+        if name in self._categories:
+            return self._categories[name].values()
+        if name in _NUMERIC_INDEX:
+            return [_decode_number(name, value)
+                    for value in self._numbers[:self._size, _NUMERIC_INDEX[name]]]
+        if name in FLAG_COLUMNS:
+            return self._flag_array(name).tolist()
+        raise KeyError(name)
+
+    def _flag_array(self, name):
+        flags = np.frombuffer(bytes(self._flags), dtype=np.uint8)
+        return (flags >> FLAG_COLUMNS.index(name) & 1).astype(bool)
+
+    def to_dataframe(self, columns=RECIPE_COLUMNS):
+        """
+        Recipes as a DataFrame, built column by column from the arrays.
+
+        Category columns come back as pandas categoricals, integer columns
+        as nullable Int64, float columns rounded to their stored precision.
+        """
+        data = {}
+        for name in columns:
+            if name in self._text:
+                data[name] = self._text[name].values()
+            elif name in self._categories:
+                data[name] = self._categories[name].categorical()
+            elif name in _NUMERIC_INDEX:
+                values = self._numbers[:self._size, _NUMERIC_INDEX[name]].astype(np.float64)
+                if name in INTEGER_COLUMNS:
+                    data[name] = pd.array(np.round(values), dtype='Float64').astype('Int64')
+                else:
+                    data[name] = np.round(values, DECIMALS.get(name, 2))
+            else:
+                data[name] = self._flag_array(name)
+        return pd.DataFrame(data, columns=list(columns))
+
+    @property
+    def nbytes(self):
+        """Bytes held by the table's buffers (category lists not counted)."""
+        return (sum(text.nbytes for text in self._text.values())
+                + sum(categories.nbytes for categories in self._categories.values())
+                + self._numbers.nbytes + len(self._flags))
+
+
+def _decode_number(column, value):
+    if np.isnan(value):
+        return None
+    if column in INTEGER_COLUMNS:
+        return int(round(float(value)))
+    value = round(float(value), DECIMALS.get(column, 2))
+    return int(value) if value.is_integer() else value
@@ -0,0 +1,98 @@
+"""
+Request Coalescing
+
+Collapses repeated lookups of the same key into a single request:
+
+- concurrent callers asking for a key that is already being fetched wait
+  on that one in-flight request instead of issuing their own
+- finished results are kept in a memo table, so later callers get them
+  without any request at all
+
+Failures are not memoized; the next caller retries. A coalescer is meant
+to outlive one source run: RecipeAggregator owns one for TheMealDB
+lookups and RecipeSync keeps the same one across its cycles.
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class RequestCoalescer:
+    """Thread-safe single-flight + memo table keyed by request identity."""
+
+    def __init__(self, max_entries=10000):
+        """
+        Args:
+            max_entries (int): Memo table size; least recently used results
+                are dropped beyond it (None = unbounded)
+        """
+        self.max_entries = max_entries
+        self._memo = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+        self.fetched = 0   # Requests actually issued
+        self.joined = 0    # Callers that shared someone else's in-flight request
+        self.memo_hits = 0  # Callers answered from the memo table
+
+    def get(self, key, fetch):
+        """
+        Return the result for `key`, calling `fetch()` only if no other
+        caller has fetched or is fetching it.
+
+        Args:
+            key (hashable): Request identity (e.g. a meal ID)
+            fetch (callable): Zero-argument function performing the request
+
+        Returns:
+            object: Whatever `fetch()` returned for this key
+        """
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+                return self._memo[key]
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                self.fetched += 1
+            else:
+                self.joined += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            self._memo[key] = value
+            if self.max_entries is not None and len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        """Forget memoized results (requests in flight still complete)."""
+        with self._lock:
+            self._memo.clear()
+
+    @property
+    def saved(self):
+        """Requests avoided by sharing or memoization."""
+        return self.joined + self.memo_hits
+
+    def __len__(self):
+        return len(self._memo)
@@ -0,0 +1,240 @@
+"""
+Persistent HTTP Response Cache
+
+SQLite-backed cache for recipe API responses so re-runs only hit the
+network for new or stale items. Entries are keyed by a hash of the
+normalized URL + query parameters (credentials stripped), expire per
+source, revalidate with ETag/Last-Modified, and are evicted least-recently
+used once the cache grows past its size limit.
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+
+# How long a cached response is served without asking the API again
+DEFAULT_TTLS = {
+    'TheMealDB': 30 * DAY,    # Catalogue rarely changes
+    'Edamam': 7 * DAY,
+    'Spoonacular': 14 * DAY,  # Protect the 150/day quota
+}
+
+# Query parameters that identify the caller, not the resource
+CREDENTIAL_PARAMS = {'app_id', 'app_key', 'apikey', 'api_key', 'key'}
+
+
+def normalize_url(url, params=None):
+    """
+    Canonical form of a request: lowercase scheme/host, sorted query
+    parameters merged with `params`, credentials removed.
+
+    Args:
+        url (str): Request URL (may already contain a query string)
+        params (dict): Extra query parameters
+
+    Returns:
+        str: Normalized URL
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        for key, value in params.items():
+            if isinstance(value, bool):
+                value = str(value).lower()
+            query.append((key, str(value)))
+
+    query = sorted((k, v) for k, v in query if k.lower() not in CREDENTIAL_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path,
+                       urlencode(query), ''))
+
+
+def cache_key(url, params=None):
+    """SHA-256 of the normalized request."""
+    return hashlib.sha256(normalize_url(url, params).encode('utf-8')).hexdigest()
+
+
+class CacheEntry:
+    """One cached response as read back from the store."""
+
+    def __init__(self, key, body, etag, last_modified, expires_at):
+        self.key = key
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def is_fresh(self):
+        return time.time() < self.expires_at
+
+    def conditional_headers(self):
+        """Headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU response cache stored in a single SQLite file.
+
+    Safe to share between the aggregator's fetch threads.
+    """
+
+    def __init__(self, path='data/http_cache.sqlite', max_bytes=256 * 1024 * 1024, ttls=None):
+        """
+        Args:
+            path (str): SQLite file location (':memory:' for a throwaway cache)
+            max_bytes (int): Total body size to keep before evicting
+            ttls (dict): Source name -> freshness lifetime in seconds
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)'
+        )
+        self._conn.commit()
+
+        self._total_bytes = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses'
+        ).fetchone()[0]
+
+    def ttl_for(self, source):
+        return self.ttls.get(source, DAY)
+
+    def get(self, url, params=None):
+        """
+        Look up a cached response (fresh or stale).
+
+        Returns:
+            CacheEntry: Cached entry, or None if never stored
+        """
+        key = cache_key(url, params)
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, last_modified, expires_at FROM responses WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                'UPDATE responses SET last_access = ? WHERE key = ?', (time.time(), key)
+            )
+            self._conn.commit()
+        return CacheEntry(key, row[0], row[1], row[2], row[3])
+
+    def put(self, source, url, params, body, etag=None, last_modified=None):
+        """Store (or replace) a response body and its validators."""
+        key = cache_key(url, params)
+        now = time.time()
+        size = len(body)
+
+        with self._lock:
+            old = self._conn.execute(
+                'SELECT size FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            self._conn.execute(
+                """INSERT OR REPLACE INTO responses
+                   (key, source, url, body, size, etag, last_modified,
+                    fetched_at, expires_at, last_access)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (key, source, normalize_url(url, params), sqlite3.Binary(body), size,
+                 etag, last_modified, now, now + self.ttl_for(source), now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, source, entry):
+        """Extend a stale entry's lifetime after a 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?',
+                (now + self.ttl_for(source), now, entry.key)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least-recently-used entries until under max_bytes (lock held)."""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                'SELECT key, size FROM responses ORDER BY last_access LIMIT 64'
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for key, size in rows:
+                self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    return
+
+    def record(self, outcome):
+        """Count a lookup outcome: 'hit', 'revalidated' or 'miss'."""
+        with self._lock:
+            if outcome == 'hit':
+                self.hits += 1
+            elif outcome == 'revalidated':
+                self.revalidated += 1
+            else:
+                self.misses += 1
+
+    @property
+    def lookups(self):
+        return self.hits + self.revalidated + self.misses
+
+    @property
+    def hit_ratio(self):
+        """Share of lookups answered without downloading a body."""
+        if not self.lookups:
+            return 0.0
+        return (self.hits + self.revalidated) / self.lookups
+
+    @property
+    def size_bytes(self):
+        return self._total_bytes
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,477 @@
+"""
+Salesforce Bulk Loader
+
+Streams recipes into the Meal__c object with Bulk API 2.0 upserts on the
+Recipe_Key__c external ID (the store's recipe_key), instead of a Data
+Loader import or one REST call per record:
+
+- records are buffered into ingest jobs sized by record count and CSV
+  bytes (Bulk API 2.0 accepts up to 150 MB per upload)
+- up to `parallel_jobs` jobs upload and process at the same time; the
+  writer blocks while all of them are busy, so memory stays bounded
+- job size adapts: a job with many lock errors halves the next ones,
+  clean jobs grow them back
+- only failed rows are retried: transient errors (UNABLE_TO_LOCK_ROW,
+  unprocessed records, a job that failed outright) go into retry jobs,
+  permanent ones (validation, bad picklist values) are reported
+
+Credentials come from SF_INSTANCE_URL + SF_ACCESS_TOKEN, or from
+SF_USERNAME / SF_PASSWORD / SF_SECURITY_TOKEN through simple-salesforce.
+
+Usage:
+    python scripts/salesforce_loader.py data/recipes.sqlite
+    python scripts/salesforce_loader.py recipe_database.csv --parallel-jobs 4
+    python scripts/salesforce_loader.py data/recipes.sqlite --mock   # local mock org
+
+    with SalesforceBulkSink(BulkApiClient.from_env()) as sink:
+        for recipe in recipes:
+            sink.write(recipe)
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import csv
+import io
+import json
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from dotenv import load_dotenv
+
+from http_session import create_session
+from recipe_sink import RECIPE_COLUMNS, RecipeSink
+from recipe_store import recipe_key
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SF_API_VERSION = '65.0'  # Matches sfdx-project.json
+MEAL_OBJECT = 'Meal__c'
+EXTERNAL_ID_FIELD = 'Recipe_Key__c'
+
+# Recipe column -> (Meal__c field, decimal places for numbers; None = not a number)
+MEAL_FIELDS = {
+    'name': ('Name', None),
+    'ingredients': ('Ingredients__c', None),
+    'instructions': ('Instructions__c', None),
+    'meal_type': ('Meal_Type__c', None),
+    'servings': ('Servings__c', 0),
+    'prep_time_minutes': ('Prep_Time_Minutes__c', 0),
+    'cook_time_minutes': ('Cook_Time_Minutes__c', 0),
+    'calories': ('Calories__c', 0),
+    'protein_g': ('Protein_g__c', 1),
+    'carbs_g': ('Carbs_g__c', 1),
+    'fat_g': ('Fat_g__c', 1),
+    'fiber_g': ('Fiber_g__c', 1),
+    'sugar_g': ('Sugar_g__c', 1),
+    'sodium_mg': ('Sodium_mg__c', 0),
+    'is_heart_healthy': ('Is_Heart_Healthy__c', None),
+    'is_diabetic_friendly': ('Is_Diabetic_Friendly__c', None),
+    'is_weeknight_friendly': ('Is_Weeknight_Friendly__c', None),
+}
+# Total_Time_Minutes__c is a formula field in the org, so it is not loaded
+
+MEAL_FIELD_NAMES = [EXTERNAL_ID_FIELD] + [field for field, _ in MEAL_FIELDS.values()]
+
+# Meal_Type__c is a restricted picklist: Breakfast, Lunch, Dinner, Snack
+MEAL_TYPE_PICKLIST = {'breakfast': 'Breakfast', 'brunch': 'Breakfast', 'lunch': 'Lunch',
+                      'dinner': 'Dinner', 'lunch/dinner': 'Dinner', 'snack': 'Snack',
+                      'dessert': 'Snack', 'teatime': 'Snack'}
+
+_BOOLEAN_FIELDS = {'Is_Heart_Healthy__c', 'Is_Diabetic_Friendly__c', 'Is_Weeknight_Friendly__c'}
+NAME_MAX_LENGTH = 80
+
+# Row errors worth another attempt; anything else is reported as failed
+RETRYABLE_ERRORS = ('UNABLE_TO_LOCK_ROW', 'SERVER_UNAVAILABLE', 'QUERY_TIMEOUT',
+                    'REQUEST_RUNNING_TOO_LONG', 'UNPROCESSED', 'JOB_FAILED')
+
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024  # Under the 150 MB per-upload limit, base64 overhead included
+DEFAULT_JOB_RECORDS = 10000  # Salesforce processes ingest data in 10,000-record chunks
+MIN_JOB_RECORDS = 500
+
+
+class BulkApiError(Exception):
+    """A Bulk API 2.0 call was rejected."""
+
+
+def meal_record(recipe):
+    """
+    Map a normalized recipe to a Meal__c record.
+
+    Args:
+        recipe (dict): Recipe with RECIPE_COLUMNS keys (values may be CSV strings)
+
+    Returns:
+        dict: Salesforce field -> value, keyed on Recipe_Key__c
+    """
+    record = {EXTERNAL_ID_FIELD: recipe_key(recipe)}
+    for column, (field, decimals) in MEAL_FIELDS.items():
+        value = recipe.get(column)
+        if field in _BOOLEAN_FIELDS:
+            value = value if isinstance(value, bool) else str(value).lower() in ('true', '1', '1.0')
+        elif decimals is not None:
+            value = _number(value, decimals)
+        elif field == 'Meal_Type__c':
+            value = MEAL_TYPE_PICKLIST.get(str(value or '').lower())
+        elif field == 'Name':
+            value = (value or '')[:NAME_MAX_LENGTH]
+        record[field] = value
+    return record
+
+
+def _number(value, decimals):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(number):
+        return None
+    return int(round(number)) if decimals == 0 else round(number, decimals)
+
+
+def encode_csv(records, fields=MEAL_FIELD_NAMES):
+    """Bulk API 2.0 CSV body (LF line endings, lowercase booleans, blanks for None)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(fields)
+    for record in records:
+        row = []
+        for field in fields:
+            value = record.get(field)
+            if isinstance(value, bool):
+                value = 'true' if value else 'false'
+            row.append('' if value is None else value)
+        writer.writerow(row)
+    return buffer.getvalue().encode('utf-8')
+
+
+def decode_csv(body):
+    """Rows of a Bulk API results CSV as dicts."""
+    return list(csv.DictReader(io.StringIO(body.decode('utf-8'))))
+
+
+class BulkApiClient:
+    """Minimal Bulk API 2.0 ingest client over a pooled requests session."""
+
+    def __init__(self, instance_url, access_token, api_version=SF_API_VERSION, session=None,
+                 poll_interval=1.0, max_poll_interval=10.0):
+        """
+        Args:
+            instance_url (str): e.g. https://yourorg.my.salesforce.com
+            access_token (str): OAuth access token or session ID
+            api_version (str): REST API version
+            session (requests.Session): Shared session (default: a pooled one)
+            poll_interval (float): First wait between job status checks (seconds)
+            max_poll_interval (float): Cap for the growing poll interval
+        """
+        self.base_url = f"{instance_url.rstrip('/')}/services/data/v{api_version}"
+        self.session = session or create_session()
+        self.session.headers['Authorization'] = f'Bearer {access_token}'
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **options):
+        """
+        Client for the org in the environment: SF_INSTANCE_URL +
+        SF_ACCESS_TOKEN, or a simple-salesforce login with SF_USERNAME,
+        SF_PASSWORD, SF_SECURITY_TOKEN (and SF_DOMAIN, 'test' for sandboxes).
+        """
+        if os.getenv('SF_INSTANCE_URL') and os.getenv('SF_ACCESS_TOKEN'):
+            return cls(os.environ['SF_INSTANCE_URL'], os.environ['SF_ACCESS_TOKEN'], **options)
+        try:
+            from simple_salesforce import Salesforce
+        except ImportError:
+            raise ImportError("Salesforce login requires simple-salesforce: "
+                              "pip install simple-salesforce (or set SF_INSTANCE_URL "
+                              "and SF_ACCESS_TOKEN)")
+        sf = Salesforce(username=os.getenv('SF_USERNAME'), password=os.getenv('SF_PASSWORD'),
+                        security_token=os.getenv('SF_SECURITY_TOKEN'),
+                        domain=os.getenv('SF_DOMAIN', 'login'))
+        return cls(f'https://{sf.sf_instance}', sf.session_id, **options)
+
+    def _request(self, method, path, **kwargs):
+        with self._lock:
+            self.calls += 1
+        response = self.session.request(method, f'{self.base_url}{path}', **kwargs)
+        if response.status_code >= 400:
+            try:
+                errors = response.json()
+                message = '; '.join(f"{e.get('errorCode')}: {e.get('message')}" for e in errors)
+            except ValueError:
+                message = response.text[:200]
+            raise BulkApiError(f"{method} {path} -> {response.status_code} {message}")
+        return response
+
+    def create_job(self, object_name=MEAL_OBJECT, external_id_field=EXTERNAL_ID_FIELD,
+                   operation='upsert'):
+        """Open an ingest job; returns its ID."""
+        body = {'object': object_name, 'externalIdFieldName': external_id_field,
+                'contentType': 'CSV', 'operation': operation, 'lineEnding': 'LF'}
+        return self._request('POST', '/jobs/ingest/', json=body).json()['id']
+
+    def upload(self, job_id, data):
+        self._request('PUT', f'/jobs/ingest/{job_id}/batches/', data=data,
+                      headers={'Content-Type': 'text/csv'})
+
+    def set_state(self, job_id, state):
+        """'UploadComplete' to start processing, 'Aborted' to give up."""
+        return self._request('PATCH', f'/jobs/ingest/{job_id}/', json={'state': state}).json()
+
+    def status(self, job_id):
+        return self._request('GET', f'/jobs/ingest/{job_id}/').json()
+
+    def wait(self, job_id, timeout=3600):
+        """Poll until the job completes, fails or is aborted; returns its final info."""
+        interval = self.poll_interval
+        deadline = time.monotonic() + timeout
+        while True:
+            info = self.status(job_id)
+            if info['state'] in ('JobComplete', 'Failed', 'Aborted'):
+                return info
+            if time.monotonic() > deadline:
+                raise BulkApiError(f"Job {job_id} still {info['state']} after {timeout}s")
+            time.sleep(interval)
+            interval = min(interval * 1.5, self.max_poll_interval)
+
+    def failed_results(self, job_id):
+        """Rejected rows: original fields plus sf__Id and sf__Error."""
+        return decode_csv(self._request('GET', f'/jobs/ingest/{job_id}/failedResults/').content)
+
+    def unprocessed_records(self, job_id):
+        """Rows never processed (job failed or aborted part way)."""
+        return decode_csv(self._request('GET', f'/jobs/ingest/{job_id}/unprocessedrecords/').content)
+
+    def run_job(self, data, object_name=MEAL_OBJECT, external_id_field=EXTERNAL_ID_FIELD):
+        """
+        One complete upsert job: create, upload, close, wait, collect rejects.
+
+        Returns:
+            tuple: (final job info, failed rows, unprocessed rows)
+        """
+        job_id = self.create_job(object_name, external_id_field)
+        try:
+            self.upload(job_id, data)
+            self.set_state(job_id, 'UploadComplete')
+        except BulkApiError:
+            self.set_state(job_id, 'Aborted')
+            raise
+        info = self.wait(job_id)
+        failed = self.failed_results(job_id) if info.get('numberRecordsFailed') else []
+        unprocessed = self.unprocessed_records(job_id) if info['state'] != 'JobComplete' else []
+        return info, failed, unprocessed
+
+
+class SalesforceBulkSink(RecipeSink):
+    """
+    RecipeSink that upserts into Meal__c through parallel Bulk API 2.0
+    jobs, retrying failed rows only (see module docstring).
+    """
+
+    def __init__(self, client, parallel_jobs=4, job_records=DEFAULT_JOB_RECORDS,
+                 max_upload_bytes=MAX_UPLOAD_BYTES, max_retries=3, failures_path=None):
+        """
+        Args:
+            client (BulkApiClient): Connected client
+            parallel_jobs (int): Jobs in flight at once
+            job_records (int): Largest job, in records (smaller under lock contention)
+            max_upload_bytes (int): Largest job, in CSV bytes
+            max_retries (int): Retry rounds for transiently failed rows
+            failures_path (str): CSV of rows that still failed (None = log only)
+        """
+        # Not a file: skip RecipeSink's directory handling
+        self.path = f"{client.base_url} ({MEAL_OBJECT})"
+        self.count = 0
+        self.client = client
+        self.parallel_jobs = parallel_jobs
+        self.max_job_records = job_records
+        self.job_records = job_records
+        self.max_upload_bytes = max_upload_bytes
+        self.max_retries = max_retries
+        self.failures_path = failures_path
+
+        self.jobs = 0
+        self.loaded = 0
+        self.retried = 0
+        self.failures = []  # (record, error)
+
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._retry = []    # (record, error)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(parallel_jobs)
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=parallel_jobs)
+        self._closed = False
+
+    def _write(self, row):
+        record = meal_record(row)
+        self._buffer.append(record)
+        # Rough CSV size: good enough to stay well under the upload limit
+        self._buffer_bytes += sum(len(str(value)) + 3 for value in record.values() if value is not None)
+        if len(self._buffer) >= self.job_records or self._buffer_bytes >= self.max_upload_bytes:
+            self._submit(self._buffer)
+            self._buffer, self._buffer_bytes = [], 0
+
+    def _submit(self, records):
+        self._slots.acquire()  # Backpressure: wait for a free job slot
+        self._futures.append(self._executor.submit(self._run, records))
+
+    def _run(self, records):
+        try:
+            try:
+                info, failed, unprocessed = self.client.run_job(encode_csv(records))
+            except Exception as e:
+                logger.warning(f"⚠️  Bulk job of {len(records)} records failed: {e}")
+                self._done(len(records), 0, [(record, f'JOB_FAILED: {e}') for record in records])
+                return
+            rejects = [({field: row.get(field) for field in MEAL_FIELD_NAMES}, row.get('sf__Error', ''))
+                       for row in failed]
+            rejects += [({field: row.get(field) for field in MEAL_FIELD_NAMES}, 'UNPROCESSED')
+                        for row in unprocessed]
+            if info['state'] == 'Failed' and not rejects:
+                # Nothing processed and nothing itemized: retry the whole job
+                rejects = [(record, f"JOB_FAILED: {info.get('errorMessage')}") for record in records]
+            self._done(len(records), len(records) - len(rejects), rejects)
+        finally:
+            self._slots.release()
+
+    def _done(self, submitted, loaded, rejects):
+        transient = [(record, error) for record, error in rejects
+                     if error.split(':')[0].strip() in RETRYABLE_ERRORS]
+        permanent = [(record, error) for record, error in rejects
+                     if error.split(':')[0].strip() not in RETRYABLE_ERRORS]
+        with self._lock:
+            self.jobs += 1
+            self.loaded += loaded
+            self._retry.extend(transient)
+            self.failures.extend(permanent)
+            # Lock contention means jobs are fighting over rows: make them smaller
+            if len(transient) > submitted * 0.05:
+                self.job_records = max(MIN_JOB_RECORDS, self.job_records // 2)
+            elif not transient:
+                self.job_records = min(self.max_job_records, self.job_records * 2)
+
+    def _drain(self):
+        if self._buffer:
+            self._submit(self._buffer)
+            self._buffer, self._buffer_bytes = [], 0
+        wait(self._futures)
+        self._futures = []
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._drain()
+
+        for attempt in range(1, self.max_retries + 1):
+            with self._lock:
+                retry, self._retry = self._retry, []
+            if not retry:
+                break
+            logger.info(f"🔁 Retrying {len(retry)} failed rows (attempt {attempt})")
+            self.retried += len(retry)
+            # Several smaller jobs: the rows failed on contention
+            size = max(MIN_JOB_RECORDS, math.ceil(len(retry) / self.parallel_jobs))
+            for start in range(0, len(retry), size):
+                self._submit([record for record, _ in retry[start:start + size]])
+            self._drain()
+            if attempt < self.max_retries:
+                time.sleep(min(self.client.poll_interval * 2 ** attempt, 30))
+
+        self.failures.extend(self._retry)
+        self._retry = []
+        self._executor.shutdown()
+
+        if self.failures:
+            logger.warning(f"⚠️  {len(self.failures)} recipes failed to load into {MEAL_OBJECT}")
+            if self.failures_path:
+                self._write_failures()
+        logger.info(f"☁️  Salesforce: {self.loaded} of {self.count} recipes upserted into "
+                    f"{MEAL_OBJECT} in {self.jobs} bulk jobs ({self.client.calls} API calls, "
+                    f"{self.retried} rows retried)")
+
+    def _write_failures(self):
+        os.makedirs(os.path.dirname(self.failures_path) or '.', exist_ok=True)
+        with open(self.failures_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow([EXTERNAL_ID_FIELD, 'Name', 'Error'])
+            for record, error in self.failures:
+                writer.writerow([record.get(EXTERNAL_ID_FIELD), record.get('Name'), error])
+        logger.info(f"📝 Failed rows written to {self.failures_path}")
+
+
+def iter_recipes(path):
+    """Stream recipes from a .sqlite/.db store, .csv, .jsonl or .parquet file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.sqlite', '.db'):
+        from recipe_store import RecipeStore
+        store = RecipeStore(path)
+        cursor = store.connection.execute(f'SELECT {", ".join(RECIPE_COLUMNS)} FROM recipes ORDER BY id')
+        for row in cursor:
+            yield dict(row)
+        store.close()
+    elif extension == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+    elif extension == '.jsonl':
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    elif extension == '.parquet':
+        from recipe_parquet import read_recipes
+        yield from read_recipes(path).to_dict('records')
+    else:
+        raise ValueError(f"Unsupported input format '{extension}' "
+                         f"(use .sqlite, .db, .csv, .jsonl or .parquet)")
+
+
+# ===== MAIN EXECUTION =====
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Bulk upsert recipes into Salesforce Meal__c')
+    parser.add_argument('input', help='Recipe store (.sqlite) or export (.csv, .jsonl, .parquet)')
+    parser.add_argument('--parallel-jobs', type=int, default=4, help='Bulk jobs in flight at once')
+    parser.add_argument('--job-records', type=int, default=DEFAULT_JOB_RECORDS,
+                        help='Largest job, in records')
+    parser.add_argument('--max-retries', type=int, default=3, help='Retry rounds for failed rows')
+    parser.add_argument('--failures',
+                        default=os.path.join(os.getenv('DATA_DIR', 'data'), 'salesforce_failures.csv'),
+                        help='CSV of rows that could not be loaded')
+    parser.add_argument('--mock', action='store_true',
+                        help='Load into the local mock org (benchmarks/mock_bulk_api.py)')
+    args = parser.parse_args()
+
+    mock = None
+    if args.mock:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks'))
+        from mock_bulk_api import MockBulkApiServer
+        mock = MockBulkApiServer().start()
+        client = BulkApiClient(mock.instance_url, mock.access_token, poll_interval=0.1)
+    else:
+        client = BulkApiClient.from_env()
+
+    start = time.perf_counter()
+    with SalesforceBulkSink(client, parallel_jobs=args.parallel_jobs, job_records=args.job_records,
+                            max_retries=args.max_retries, failures_path=args.failures) as sink:
+        for recipe in iter_recipes(args.input):
+            sink.write(recipe)
+    print(f"\n✅ {sink.loaded} of {sink.count} recipes loaded in "
+          f"{time.perf_counter() - start:.1f}s ({sink.jobs} jobs, {client.calls} API calls)")
+    if mock is not None:
+        print(f"   Mock org now holds {len(mock.records)} Meal__c records")
+        mock.stop()
@@ -0,0 +1,289 @@
+"""
+Spoonacular Fetch Planner
+
+Spends Spoonacular's daily point budget where it buys the most complete
+recipes (ingredients, nutrition *and* instructions):
+
+1. Discovery - complexSearch with number=100 and no extras returns IDs
+   only, for about 2 points per 100 IDs
+2. Hydration - recipes/informationBulk fetches up to 100 IDs per call,
+   instructions included, for 1 point plus 0.5 per additional recipe
+
+The plan (search cursor, IDs waiting to be fetched, IDs already fetched,
+points spent today) is a JSON file, so whatever today's budget cannot
+cover is picked up by tomorrow's run, and no recipe is paid for twice.
+A failed bulk call puts its IDs back in the queue (up to `max_attempts`
+tries per ID) instead of ending the day.
+
+take() reserves a bulk call's points up front; record_success() and
+record_failure() then settle them against the calls Spoonacular actually
+billed, so an answer from the response cache costs nothing, a failure
+that never reached the API is refunded, and a retried call billed twice
+is charged twice.
+
+Point costs follow Spoonacular's published pricing; they are estimates,
+so `reserve_points` can keep a safety margin.
+
+Author: Abby (Portfolio Project)
+Date: December 2025
+"""
+
+import datetime
+import json
+import logging
+import math
+import os
+
+logger = logging.getLogger(__name__)
+
+# Spoonacular point pricing
+SEARCH_BASE_POINTS = 1.0
+SEARCH_POINTS_PER_RESULT = 0.01
+BULK_BASE_POINTS = 1.0
+BULK_POINTS_PER_EXTRA = 0.5
+
+MAX_SEARCH_OFFSET = 900  # complexSearch refuses offsets past this
+
+# Dish types searched in turn; each gives up to MAX_SEARCH_OFFSET + 100 IDs
+SEARCH_TYPES = ['main course', 'side dish', 'salad', 'soup', 'breakfast', 'appetizer',
+                'bread', 'sauce', 'snack', 'dessert']
+
+
+def search_cost(results):
+    """Points for a complexSearch call returning `results` IDs (no extras)."""
+    return SEARCH_BASE_POINTS + SEARCH_POINTS_PER_RESULT * results
+
+
+def bulk_cost(recipes):
+    """Points for one informationBulk call covering `recipes` IDs."""
+    if recipes <= 0:
+        return 0.0
+    return BULK_BASE_POINTS + BULK_POINTS_PER_EXTRA * (recipes - 1)
+
+
+class SpoonacularPlanner:
+    """Daily point budget plus the persistent queue of Spoonacular IDs to fetch."""
+
+    def __init__(self, path=None, daily_points=150, reserve_points=0, bulk_size=100,
+                 search_size=100, max_attempts=3, today=None):
+        """
+        Args:
+            path (str): JSON file holding the plan between runs (None = in-memory)
+            daily_points (float): Spoonacular points available per day
+            reserve_points (float): Points left unspent as a safety margin
+            bulk_size (int): Most IDs per informationBulk call
+            search_size (int): IDs per complexSearch call (API maximum is 100)
+            max_attempts (int): Failed bulk calls an ID survives before it is dropped
+            today (callable): Returns the current date (default: date.today)
+        """
+        self.path = path
+        self.daily_points = daily_points
+        self.reserve_points = reserve_points
+        self.bulk_size = bulk_size
+        self.search_size = search_size
+        self.max_attempts = max_attempts
+        self._today = today or datetime.date.today
+
+        self._state = {
+            'day': self._today().isoformat(),
+            'points_used': 0.0,
+            'search': {'type': 0, 'offset': 0},
+            'queue': [],
+            'attempts': {},
+            'done': [],
+            'failed': [],
+        }
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._state.update(json.load(f))
+        self._queued = set(self._state['queue'])
+        self._done = set(self._state['done'])
+        self._roll_day()
+
+    # ===== BUDGET =====
+    def _roll_day(self):
+        today = self._today().isoformat()
+        if self._state['day'] != today:
+            self._state['day'] = today
+            self._state['points_used'] = 0.0
+
+    @property
+    def points_used(self):
+        self._roll_day()
+        return self._state['points_used']
+
+    @property
+    def points_left(self):
+        """Points still spendable today (after the reserve)."""
+        return max(0.0, self.daily_points - self.reserve_points - self.points_used)
+
+    def spend(self, points):
+        self._roll_day()
+        self._state['points_used'] = round(self._state['points_used'] + points, 3)
+
+    def exhaust(self):
+        """The API says today's quota is gone (HTTP 402); stop planning until tomorrow."""
+        self._roll_day()
+        self._state['points_used'] = max(self._state['points_used'], float(self.daily_points))
+
+    def affordable_bulk(self):
+        """Largest informationBulk call today's remaining points cover."""
+        left = self.points_left
+        if left < BULK_BASE_POINTS:
+            return 0
+        return min(self.bulk_size, 1 + math.floor((left - BULK_BASE_POINTS) / BULK_POINTS_PER_EXTRA + 1e-9))
+
+    def estimated_recipes(self):
+        """Recipes today's budget should hydrate, counting the searches needed to find them."""
+        left = self.points_left
+        queued = len(self._queued)
+        recipes = 0
+        while left >= BULK_BASE_POINTS:
+            if not queued:
+                if self.search_exhausted or left < search_cost(self.search_size) + BULK_BASE_POINTS:
+                    break
+                left -= search_cost(self.search_size)
+                queued = self.search_size
+            n = min(self.bulk_size, queued,
+                    1 + math.floor((left - BULK_BASE_POINTS) / BULK_POINTS_PER_EXTRA + 1e-9))
+            left -= bulk_cost(n)
+            queued -= n
+            recipes += n
+        return recipes
+
+    # ===== DISCOVERY =====
+    @property
+    def queued(self):
+        return len(self._queued)
+
+    @property
+    def fetched(self):
+        return len(self._done)
+
+    @property
+    def search_exhausted(self):
+        return self._state['search']['type'] >= len(SEARCH_TYPES)
+
+    def next_search(self):
+        """
+        Parameters for the next complexSearch call, or None when every dish
+        type has been paged through or the budget can't cover a search and
+        a bulk call after it.
+        """
+        if self.search_exhausted:
+            return None
+        if self.points_left < search_cost(self.search_size) + BULK_BASE_POINTS:
+            return None
+        search = self._state['search']
+        return {'type': SEARCH_TYPES[search['type']], 'offset': search['offset'],
+                'number': self.search_size}
+
+    def record_search(self, ids, billed=1):
+        """
+        Queue the IDs a search returned and advance the search cursor.
+
+        Args:
+            ids (list): Recipe IDs the search returned
+            billed (int): complexSearch calls Spoonacular billed for it
+                (0 when answered from the response cache)
+
+        Returns:
+            int: IDs newly queued (not already queued or fetched)
+        """
+        self.spend(search_cost(len(ids)) * billed)
+        added = 0
+        for recipe_id in ids:
+            if recipe_id not in self._queued and recipe_id not in self._done:
+                self._state['queue'].append(recipe_id)
+                self._queued.add(recipe_id)
+                added += 1
+
+        search = self._state['search']
+        search['offset'] += self.search_size
+        if len(ids) < self.search_size or search['offset'] > MAX_SEARCH_OFFSET:
+            search['type'] += 1
+            search['offset'] = 0
+        return added
+
+    def record_failed_search(self, billed):
+        """Charge a search that failed after `billed` calls reached Spoonacular."""
+        self.spend(search_cost(0) * billed)
+
+    # ===== HYDRATION =====
+    def take(self, count):
+        """
+        Next IDs to hydrate, at most `count` and no more than the budget covers.
+
+        They stay reserved (out of the queue) until record_success or
+        record_failure is called for them.
+        """
+        count = min(count, self.affordable_bulk(), len(self._state['queue']))
+        if count <= 0:
+            return []
+        ids, self._state['queue'] = self._state['queue'][:count], self._state['queue'][count:]
+        self._queued.difference_update(ids)
+        # Reserve the points now so a concurrent caller can't plan with them
+        self.spend(bulk_cost(len(ids)))
+        return ids
+
+    def _settle(self, ids, billed):
+        """Turn take()'s one-call reservation into `billed` calls' worth of points."""
+        self.spend(bulk_cost(len(ids)) * (billed - 1))
+
+    def record_success(self, ids, billed=1):
+        """
+        Mark hydrated IDs done.
+
+        Args:
+            ids (list): IDs from the successful call
+            billed (int): informationBulk calls Spoonacular billed for them
+                (0 when answered from the response cache)
+        """
+        self._settle(ids, billed)
+        for recipe_id in ids:
+            self._done.add(recipe_id)
+            self._state['done'].append(recipe_id)
+            self._state['attempts'].pop(str(recipe_id), None)
+
+    def release(self, ids):
+        """Return untried IDs to the front of the queue and refund their points."""
+        self.spend(-bulk_cost(len(ids)))
+        self._state['queue'][:0] = ids
+        self._queued.update(ids)
+
+    def record_failure(self, ids, billed=0):
+        """
+        Put IDs from a failed bulk call back at the end of the queue.
+
+        Args:
+            ids (list): IDs from the failed call
+            billed (int): Attempts Spoonacular billed before the call failed
+                (0 = it never answered, so the reserved points are refunded)
+        """
+        self._settle(ids, billed)
+        for recipe_id in ids:
+            attempts = self._state['attempts'].get(str(recipe_id), 0) + 1
+            if attempts >= self.max_attempts:
+                self._state['attempts'].pop(str(recipe_id), None)
+                self._state['failed'].append(recipe_id)
+                logger.warning(f"Spoonacular recipe {recipe_id} failed {attempts} times; dropped")
+            else:
+                self._state['attempts'][str(recipe_id)] = attempts
+                self._state['queue'].append(recipe_id)
+                self._queued.add(recipe_id)
+
+    # ===== PERSISTENCE =====
+    def save(self):
+        """Atomically write the plan (no-op for an in-memory planner)."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f)
+        os.replace(tmp_path, self.path)
+
+    def summary(self):
+        return (f"{self.points_used:.1f}/{self.daily_points} points used today, "
+                f"{len(self._done)} fetched, {len(self._queued)} queued, "
+                f"{len(self._state['failed'])} dropped")